@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Набор бенчмарков производительности etpgrf (см. `benchmarks/run.py`).
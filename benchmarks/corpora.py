@@ -0,0 +1,169 @@
+# benchmarks/corpora.py
+# Детерминированные синтетические корпуса для бенчмарков: русский и английский текст, смешанный текст, HTML-статьи
+# со строчной разметкой, короткие заголовки и огромные одиночные документы. Генерируются без сети и без файлов
+# данных, по фиксированному зерну, поэтому при одинаковых параметрах корпус каждый раз один и тот же, а замеры
+# разных запусков сравнимы.
+
+import random
+
+# --- Словари ---
+RU_WORDS = (
+    'время', 'человек', 'жизнь', 'день', 'рука', 'работа', 'слово', 'место', 'вопрос', 'сторона', 'страна', 'мир',
+    'случай', 'голова', 'ребенок', 'сила', 'конец', 'вид', 'система', 'часть', 'город', 'отношение', 'женщина',
+    'деньги', 'земля', 'машина', 'вода', 'отец', 'проблема', 'час', 'право', 'нога', 'решение', 'дверь', 'образ',
+    'история', 'власть', 'закон', 'война', 'возможность', 'результат', 'помощь', 'развитие', 'общество', 'положение',
+    'производство', 'исследование', 'электрофоретический', 'достопримечательность', 'переосмысление',
+    'сосредоточенность', 'высокопревосходительство', 'делопроизводство', 'интернационализация', 'бармалейщина',
+    'большой', 'новый', 'последний', 'русский', 'хороший', 'главный', 'старый', 'общий', 'высокий', 'маленький',
+    'говорить', 'знать', 'стать', 'видеть', 'хотеть', 'думать', 'спросить', 'понимать', 'работать', 'сказать',
+    'очень', 'теперь', 'сегодня', 'всегда', 'вдруг', 'почти', 'снова', 'конечно', 'действительно', 'впрочем',
+)
+RU_SHORT = ('в', 'и', 'на', 'с', 'к', 'по', 'о', 'за', 'из', 'у', 'от', 'до', 'не', 'но', 'а', 'же', 'бы', 'ли')
+RU_EXTRAS = (
+    '"{w}"', '«{w}»', '{n} кг', '{n} км', '{n} м', '{n} ч', '{n} руб.', '№ {n}', '{n}-{m} гг.', 'т. е.', 'т. д.',
+    'и т. п.', 'А. С. Пушкин', 'Л.Н. Толстой', '--', '-', '(c)', '...', '{n} %', 'см. стр. {n}', '{n} кв. м',
+)
+EN_WORDS = (
+    'time', 'person', 'year', 'way', 'thing', 'world', 'life', 'hand', 'part', 'child', 'woman', 'place', 'work',
+    'week', 'case', 'point', 'government', 'company', 'number', 'group', 'problem', 'fact', 'information',
+    'development', 'environment', 'responsibility', 'internationalization', 'characteristic', 'extraordinary',
+    'floccinaucinihilipilification', 'understanding', 'communication', 'relationship', 'organization',
+    'good', 'new', 'first', 'last', 'long', 'great', 'little', 'important', 'different', 'possible',
+    'know', 'take', 'think', 'come', 'look', 'want', 'give', 'find', 'tell', 'become', 'remember', 'consider',
+    'never', 'always', 'often', 'really', 'quite', 'perhaps', 'however', 'nevertheless',
+)
+EN_SHORT = ('a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'by', 'for', 'and', 'or', 'but', 'if', 'as', 'I')
+EN_EXTRAS = (
+    '"{w}"', "don't", "it's", '{n} kg', '{n} km', '{n} ft', '${n}', '{n}%', 'e.g.', 'i.e.', 'Mr. Smith',
+    'J. R. R. Tolkien', '--', '-', '(tm)', '(r)', '...', 'p. {n}', '{n}-{m}',
+)
+_INLINE_TAGS = ('b', 'i', 'em', 'strong', 'span', 'a')
+
+
+def _sentence(rnd: random.Random, words, short, extras, min_len: int = 6, max_len: int = 22) -> str:
+    parts = []
+    for _ in range(rnd.randint(min_len, max_len)):
+        roll = rnd.random()
+        if roll < 0.25:
+            parts.append(rnd.choice(short))
+        elif roll < 0.35:
+            parts.append(rnd.choice(extras).format(w=rnd.choice(words), n=rnd.randint(1, 2000),
+                                                   m=rnd.randint(1, 99)))
+        else:
+            parts.append(rnd.choice(words))
+        if rnd.random() < 0.08:
+            parts[-1] += ','
+    sentence = ' '.join(parts)
+    return sentence[0].upper() + sentence[1:] + rnd.choice('..........!?:')
+
+
+def _paragraph(rnd: random.Random, lang: str, sentences: int) -> str:
+    result = []
+    for _ in range(sentences):
+        if lang == 'ru' or (lang == 'mixed' and rnd.random() < 0.6):
+            result.append(_sentence(rnd, RU_WORDS, RU_SHORT, RU_EXTRAS))
+        else:
+            result.append(_sentence(rnd, EN_WORDS, EN_SHORT, EN_EXTRAS))
+    return ' '.join(result)
+
+
+def prose(lang: str, docs: int, seed: int = 1) -> list[str]:
+    """
+    Статьи простым текстом: 3-8 абзацев по 2-6 предложений, абзацы разделены пустой строкой.
+
+    :param lang: 'ru', 'en' или 'mixed' (русские и английские предложения вперемешку).
+    :param docs: Число документов.
+    :param seed: Зерно генератора.
+    """
+    rnd = random.Random(f'prose-{lang}-{seed}')
+    return ['\n\n'.join(_paragraph(rnd, lang, rnd.randint(2, 6)) for _ in range(rnd.randint(3, 8)))
+            for _ in range(docs)]
+
+
+def _inline_markup(rnd: random.Random, text: str) -> str:
+    words = text.split(' ')
+    index = 0
+    result = []
+    while index < len(words):
+        if rnd.random() < 0.12:
+            tag = rnd.choice(_INLINE_TAGS)
+            span = rnd.randint(1, 4)
+            attrs = f' href="/page?id={rnd.randint(1, 999)}&amp;ref=bench"' if tag == 'a' else ''
+            result.append(f'<{tag}{attrs}>' + ' '.join(words[index:index + span]) + f'</{tag}>')
+            index += span
+        else:
+            result.append(words[index])
+            index += 1
+    return ' '.join(result)
+
+
+def html_articles(lang: str, docs: int, seed: int = 1) -> list[str]:
+    """
+    HTML-статьи: заголовки, абзацы со строчной разметкой (`b`, `i`, `a` и т.д.), списки и блоки кода.
+
+    :param lang: 'ru', 'en' или 'mixed'.
+    :param docs: Число документов.
+    :param seed: Зерно генератора.
+    """
+    rnd = random.Random(f'html-{lang}-{seed}')
+    result = []
+    for _ in range(docs):
+        blocks = [f'<h1>{_sentence(rnd, RU_WORDS, RU_SHORT, RU_EXTRAS, 3, 8)}</h1>']
+        for _ in range(rnd.randint(3, 10)):
+            roll = rnd.random()
+            if roll < 0.1:
+                items = ''.join(f'<li>{_inline_markup(rnd, _paragraph(rnd, lang, 1))}</li>'
+                                for _ in range(rnd.randint(2, 5)))
+                blocks.append(f'<ul>{items}</ul>')
+            elif roll < 0.15:
+                blocks.append('<pre><code>if (a &lt; b &amp;&amp; "x") { return "--"; }</code></pre>')
+            elif roll < 0.25:
+                blocks.append(f'<h2>{_inline_markup(rnd, _paragraph(rnd, lang, 1))}</h2>')
+            else:
+                blocks.append(f'<p>{_inline_markup(rnd, _paragraph(rnd, lang, rnd.randint(2, 6)))}</p>')
+        result.append('<article>' + '\n'.join(blocks) + '</article>')
+    return result
+
+
+def titles(docs: int, seed: int = 1) -> list[str]:
+    """
+    Короткие заголовки и пункты меню (2-9 слов, русские и английские).
+    """
+    rnd = random.Random(f'titles-{seed}')
+    return [_sentence(rnd, RU_WORDS, RU_SHORT, RU_EXTRAS, 2, 9)[:-1] if rnd.random() < 0.6
+            else _sentence(rnd, EN_WORDS, EN_SHORT, EN_EXTRAS, 2, 9)[:-1]
+            for _ in range(docs)]
+
+
+def huge_document(lang: str, size: int, seed: int = 1, html: bool = False) -> str:
+    """
+    Один огромный документ заданного размера (в символах, с точностью до абзаца).
+
+    :param lang: 'ru', 'en' или 'mixed'.
+    :param size: Желаемый размер в символах.
+    :param seed: Зерно генератора.
+    :param html: True -- абзацы со строчной разметкой в тегах `p`, False -- простой текст.
+    """
+    rnd = random.Random(f'huge-{lang}-{html}-{seed}')
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = _paragraph(rnd, lang, rnd.randint(2, 6))
+        if html:
+            paragraph = f'<p>{_inline_markup(rnd, paragraph)}</p>'
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
+
+
+def word_list(texts: list[str]) -> list[str]:
+    """
+    Слова текстов (только буквы) -- корпус для `Hyphenator.hyp_in_word`.
+    """
+    result = []
+    for text in texts:
+        for token in text.split():
+            word = ''.join(char for char in token if char.isalpha())
+            if word:
+                result.append(word)
+    return result
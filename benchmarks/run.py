@@ -0,0 +1,267 @@
+# benchmarks/run.py
+# Бенчмарки производительности etpgrf: пропускная способность (символов и документов в секунду) типографа целиком
+# (простой текст и HTML) и отдельных модулей правил на синтетических корпусах (см. `benchmarks/corpora.py`).
+# Результаты сохраняются в JSON, чтобы сравнивать запуски между собой.
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.run -o before.json
+#     python -m benchmarks.run -o after.json --compare before.json
+#     python -m benchmarks.run --scale 0.1 --filter 'typographer.*'
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from benchmarks import corpora
+
+# Формат файла результатов (увеличивается при несовместимых изменениях)
+RESULTS_FORMAT = 1
+
+
+class Benchmark:
+    """
+    Один бенчмарк: функция, которая обрабатывает один документ, и корпус документов.
+    """
+    __slots__ = ('name', 'corpus', 'setup')
+
+    def __init__(self, name: str, corpus: str, setup: Callable[[list[str]], tuple[Callable[[str], object], list]]):
+        """
+        :param name: Имя бенчмарка (`модуль.функция.корпус`).
+        :param corpus: Имя корпуса (см. `Corpora`).
+        :param setup: Функция от документов корпуса, которая возвращает (функция обработки документа, документы).
+                      Создание объектов и подготовка данных в замер не входят.
+        """
+        self.name = name
+        self.corpus = corpus
+        self.setup = setup
+
+
+class Corpora:
+    """
+    Корпуса бенчмарков. Генерируются при первом обращении (нужны не всем запускам) и переиспользуются.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        """
+        :param scale: Множитель размера корпусов (например, 0.1 для быстрой проверки).
+        """
+        def count(base: int) -> int:
+            return max(1, int(base * scale))
+
+        self._factories = {
+            'ru': lambda: corpora.prose('ru', count(200)),
+            'en': lambda: corpora.prose('en', count(200)),
+            'mixed': lambda: corpora.prose('mixed', count(200)),
+            'titles': lambda: corpora.titles(count(5000)),
+            'huge': lambda: [corpora.huge_document('mixed', count(1_000_000))],
+            'html_ru': lambda: corpora.html_articles('ru', count(100)),
+            'html_mixed': lambda: corpora.html_articles('mixed', count(100)),
+            'huge_html': lambda: [corpora.huge_document('mixed', count(1_000_000), html=True)],
+        }
+        self._cache: dict[str, list[str]] = {}
+
+    def __getitem__(self, name: str) -> list[str]:
+        if name not in self._cache:
+            self._cache[name] = self._factories[name]()
+        return self._cache[name]
+
+
+def _typographer(**kwargs):
+    def setup(docs):
+        from etpgrf import Typographer
+        return Typographer(**kwargs).process, docs
+    return setup
+
+
+def _module(factory: Callable[[], object], method: str):
+    def setup(docs):
+        return getattr(factory(), method), docs
+    return setup
+
+
+def _hyphenator_words(langs: str):
+    def setup(docs):
+        from etpgrf import Hyphenator
+        return Hyphenator(langs=langs).hyp_in_word, corpora.word_list(docs)
+    return setup
+
+
+def _encoder(mode: str):
+    def setup(docs):
+        # Кодируется то, что реально приходит в кодек: результат типографа в режиме 'unicode'
+        from etpgrf import Typographer
+        from etpgrf.codec import encode_from_unicode
+        typographer = Typographer(mode='unicode')
+        return (lambda text: encode_from_unicode(text, mode)), [typographer.process(doc) for doc in docs]
+    return setup
+
+
+def _layout(langs: str):
+    from etpgrf import LayoutProcessor
+    return lambda: LayoutProcessor(langs=langs)
+
+
+def _unbreakables(langs: str):
+    from etpgrf import Unbreakables
+    return lambda: Unbreakables(langs=langs)
+
+
+def build_suite() -> list[Benchmark]:
+    """
+    Список всех бенчмарков.
+    """
+    suite = []
+    for corpus in ('ru', 'en', 'mixed', 'titles', 'huge'):
+        suite.append(Benchmark(f'typographer.plain.{corpus}', corpus, _typographer(process_html=False)))
+    for corpus in ('html_ru', 'html_mixed', 'huge_html'):
+        suite.append(Benchmark(f'typographer.html.{corpus}', corpus, _typographer(process_html=True)))
+        suite.append(Benchmark(f'typographer.html_stream.{corpus}', corpus,
+                               _typographer(process_html=True, html_backend='stream')))
+    for langs in ('ru', 'en'):
+        suite.append(Benchmark(f'hyphenator.hyp_in_word.{langs}', langs, _hyphenator_words(langs)))
+        suite.append(Benchmark(f'layout.process.{langs}', langs, _module(_layout(langs), 'process')))
+        suite.append(Benchmark(f'unbreakables.process.{langs}', langs, _module(_unbreakables(langs), 'process')))
+    for mode in ('unicode', 'mnemonic', 'mixed'):
+        suite.append(Benchmark(f'codec.encode_from_unicode.{mode}', 'mixed', _encoder(mode)))
+    return suite
+
+
+def measure(func: Callable[[str], object], docs: list, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Замеряет обработку всех документов: лучший из `repeat` замеров, в каждом корпус обрабатывается столько раз,
+    чтобы замер длился не меньше `min_time` секунд.
+
+    :return: Словарь с числом документов и символов, временем одного прохода по корпусу и пропускной способностью.
+    """
+    chars = sum(len(doc) for doc in docs)
+    for doc in docs[:10]:
+        func(doc)      # Прогрев: ленивые импорты, компиляция паттернов и т.п. в замер не входят
+    best = float('inf')
+    for _ in range(repeat):
+        loops = 0
+        start = time.perf_counter()
+        while True:
+            for doc in docs:
+                func(doc)
+            loops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / loops)
+    return {
+        'docs': len(docs),
+        'chars': chars,
+        'seconds': best,
+        'docs_per_sec': len(docs) / best,
+        'chars_per_sec': chars / best,
+    }
+
+
+def run_suite(patterns: list[str] | None = None,
+              scale: float = 1.0,
+              repeat: int = 5,
+              min_time: float = 0.2,
+              report: Callable[[str, dict], None] | None = None) -> dict:
+    """
+    Запускает бенчмарки.
+
+    :param patterns: Шаблоны имен бенчмарков (fnmatch), None -- все.
+    :param scale: Множитель размера корпусов.
+    :param repeat: Число замеров каждого бенчмарка (берется лучший).
+    :param min_time: Минимальная длительность одного замера в секундах.
+    :param report: Функция, которая вызывается после каждого бенчмарка с его именем и результатом.
+    :return: Результаты в формате файла JSON (метаданные запуска и результаты по именам бенчмарков).
+    """
+    texts = Corpora(scale)
+    results = {}
+    for benchmark in build_suite():
+        if patterns and not any(fnmatch.fnmatchcase(benchmark.name, pattern) for pattern in patterns):
+            continue
+        func, docs = benchmark.setup(texts[benchmark.corpus])
+        results[benchmark.name] = measure(func, docs, repeat=repeat, min_time=min_time)
+        if report is not None:
+            report(benchmark.name, results[benchmark.name])
+    return {
+        'format': RESULTS_FORMAT,
+        'meta': run_meta(scale=scale, repeat=repeat, min_time=min_time),
+        'results': results,
+    }
+
+
+def run_meta(**params) -> dict:
+    """
+    Метаданные запуска: версии etpgrf и Python, платформа, время запуска и параметры запуска.
+    """
+    import etpgrf
+    from etpgrf.batch import gil_enabled
+    return {
+        'etpgrf_version': etpgrf.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'gil_enabled': gil_enabled(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        **params,
+    }
+
+
+def compare(old: dict, new: dict) -> list[tuple[str, float, float, float]]:
+    """
+    Сравнивает два запуска по пропускной способности (символов в секунду) общих бенчмарков.
+
+    :return: Список (имя, было, стало, ускорение во сколько раз).
+    """
+    rows = []
+    for name, result in new['results'].items():
+        if name in old['results']:
+            before = old['results'][name]['chars_per_sec']
+            after = result['chars_per_sec']
+            rows.append((name, before, after, after / before))
+    return rows
+
+
+def _print_result(name: str, result: dict) -> None:
+    print(f"{name:<42} {result['chars_per_sec'] / 1e6:9.3f} Мсимв/с {result['docs_per_sec']:12.1f} док/с",
+          flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки производительности etpgrf")
+    parser.add_argument('-o', '--output', help="Файл для результатов в формате JSON")
+    parser.add_argument('--compare', help="Файл результатов предыдущего запуска для сравнения")
+    parser.add_argument('--filter', action='append', dest='patterns', metavar='PATTERN',
+                        help="Шаблон имен бенчмарков (fnmatch), можно несколько")
+    parser.add_argument('--scale', type=float, default=1.0, help="Множитель размера корпусов (по умолчанию 1)")
+    parser.add_argument('--repeat', type=int, default=5, help="Число замеров, берется лучший (по умолчанию 5)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Минимальная длительность замера, с")
+    parser.add_argument('--list', action='store_true', help="Только вывести имена бенчмарков")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for benchmark in build_suite():
+            print(benchmark.name)
+        return 0
+    data = run_suite(args.patterns, scale=args.scale, repeat=args.repeat, min_time=args.min_time,
+                     report=_print_result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            old = json.load(file)
+        print()
+        for name, before, after, ratio in compare(old, data):
+            print(f"{name:<42} {before / 1e6:9.3f} -> {after / 1e6:9.3f} Мсимв/с  x{ratio:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
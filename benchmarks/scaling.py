@@ -0,0 +1,299 @@
+# benchmarks/scaling.py
+# Проверка алгоритмической сложности: каждый обработчик получает входы растущего размера (от 1 КБ до 10 МБ)
+# обычной и "враждебной" формы (очень длинные слова, тысячи цепочек единиц измерения, глубокий и широкий DOM,
+# множество кавычек). По замерам подбирается показатель роста k (время ~ n^k, наклон прямой в логарифмическом
+# масштабе), а случаи, которые растут быстрее ~O(n log n), отмечаются. Выход с кодом 1, если такие есть.
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.scaling
+#     python -m benchmarks.scaling --max-size 1M --filter 'typographer.html.*' -o scaling.json
+
+import argparse
+import fnmatch
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from benchmarks import corpora
+from benchmarks.run import run_meta
+
+# Порог показателя роста: n log n на диапазоне 1 КБ -- 10 МБ дает k около 1.1, запас -- на шум замеров
+DEFAULT_MAX_EXPONENT = 1.3
+DEFAULT_MAX_SIZE = 10_000_000
+# Размеры входа: полдекады от 1 КБ
+SIZES = (1_000, 3_000, 10_000, 30_000, 100_000, 300_000, 1_000_000, 3_000_000, 10_000_000)
+_SIZE_SUFFIXES = {'K': 1_000, 'M': 1_000_000}
+
+
+# --- Формы входа: функция от размера в символах (с точностью до фрагмента), генерация детерминирована ---
+
+def _repeat_to_size(size: int, fragment: Callable[[random.Random], str], seed: str, separator: str = ' ') -> str:
+    rnd = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        part = fragment(rnd)
+        parts.append(part)
+        length += len(part) + len(separator)
+    return separator.join(parts)
+
+
+def prose(size: int) -> str:
+    """Обычный смешанный русско-английский текст."""
+    return corpora.huge_document('mixed', size)
+
+
+def prose_html(size: int) -> str:
+    """Обычные HTML-статьи: абзацы со строчной разметкой."""
+    return corpora.huge_document('mixed', size, html=True)
+
+
+def long_word_ru(size: int) -> str:
+    """Одно русское "слово" без пробелов на весь размер."""
+    syllables = ('элек', 'тро', 'фо', 'ре', 'ти', 'чес', 'кий', 'пре', 'вос', 'хо', 'ди', 'тель', 'ство', 'нн')
+    return _repeat_to_size(size, lambda rnd: rnd.choice(syllables), 'long-word-ru', separator='')
+
+
+def long_word_en(size: int) -> str:
+    """Одно английское "слово" без пробелов на весь размер (с диграфами, которые нельзя разрывать)."""
+    syllables = ('in', 'ter', 'na', 'tion', 'al', 'ch', 'sh', 'th', 'ph', 'ea', 'ou', 'ing', 'ment', 'ous')
+    return _repeat_to_size(size, lambda rnd: rnd.choice(syllables), 'long-word-en', separator='')
+
+
+def unit_chains(size: int) -> str:
+    """Тысячи цепочек единиц измерения ("5 кв. м. кг. ч."), в том числе очень длинных."""
+    units = ('кв', 'м', 'кг', 'см', 'ч', 'км', 'мин', 'сек', 'руб', 'тыс', 'стр', 'ft', 'mph')
+
+    def chain(rnd: random.Random) -> str:
+        length = rnd.choice((2, 3, 5, 20, 200))
+        return f"{rnd.randint(1, 999)} " + ' '.join(f"{rnd.choice(units)}." for _ in range(length)) + ' и'
+    return _repeat_to_size(size, chain, 'unit-chains')
+
+
+def many_quotes(size: int) -> str:
+    """Множество кавычек: вложенные, соседние и непарные."""
+    fragments = ('"слово"', '"внешние "внутренние" кавычки"', '«уже "готовые"»', '"', '""', '"a "b "c" d" e"',
+                 "'single'", 'слово')
+    return _repeat_to_size(size, lambda rnd: rnd.choice(fragments), 'many-quotes')
+
+
+def dom_deep(size: int) -> str:
+    """Глубокий DOM: вложенность тегов растет с размером (глубина ~ размер / 20)."""
+    depth = max(1, size // 20)
+    tags = ('div', 'span', 'b', 'i', 'em')
+    opening = ''.join(f'<{tags[level % len(tags)]}>"т" -- ' for level in range(depth))
+    closing = ''.join(f'</{tags[level % len(tags)]}>' for level in reversed(range(depth)))
+    return opening + 'конец' + closing
+
+
+def dom_wide(size: int) -> str:
+    """Широкий DOM: один абзац с огромным числом соседних строчных элементов."""
+    words = corpora.RU_WORDS
+    return '<p>' + _repeat_to_size(size, lambda rnd: f'<span>{rnd.choice(words)}</span>', 'dom-wide') + '</p>'
+
+
+# --- Обработчики ---
+
+def _typographer(**kwargs) -> Callable[[], Callable[[str], object]]:
+    def setup():
+        from etpgrf import Typographer
+        return Typographer(langs='ru+en', **kwargs).process
+    return setup
+
+
+def _module(name: str, method: str, **kwargs) -> Callable[[], Callable[[str], object]]:
+    def setup():
+        import etpgrf
+        return getattr(getattr(etpgrf, name)(langs='ru+en', **kwargs), method)
+    return setup
+
+
+_PLAIN_SHAPES = (prose, long_word_ru, long_word_en, unit_chains, many_quotes)
+_HTML_SHAPES = (prose_html, dom_deep, dom_wide)
+
+
+def build_cases() -> dict[str, tuple[Callable[[int], str], Callable[[], Callable[[str], object]]]]:
+    """
+    Случаи проверки: имя (`обработчик.форма`) -> (генератор входа, функция создания обработчика).
+    """
+    cases = {}
+    for shape in _PLAIN_SHAPES:
+        cases[f'typographer.plain.{shape.__name__}'] = (shape, _typographer())
+    for shape in _HTML_SHAPES:
+        cases[f'typographer.html.{shape.__name__}'] = (shape, _typographer(process_html=True))
+        cases[f'typographer.html_stream.{shape.__name__}'] = (shape, _typographer(process_html=True,
+                                                                                  html_backend='stream'))
+    for shape in (long_word_ru, long_word_en):
+        cases[f'hyphenator.hyp_in_word.{shape.__name__}'] = (shape, _module('Hyphenator', 'hyp_in_word',
+                                                                            max_unhyphenated_len=8))
+    cases['layout.process.unit_chains'] = (unit_chains, _module('LayoutProcessor', 'process'))
+    cases['quotes.process.many_quotes'] = (many_quotes, _module('QuotesProcessor', 'process'))
+    cases['unbreakables.process.prose'] = (prose, _module('Unbreakables', 'process'))
+    return cases
+
+
+# --- Замеры и оценка ---
+
+def fit_exponent(sizes: list[int], seconds: list[float]) -> float:
+    """
+    Показатель роста k в модели время ~ n^k: наклон прямой, подобранной методом наименьших квадратов
+    в логарифмическом масштабе.
+    """
+    if len(sizes) < 2:
+        return float('nan')
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def _time_call(func: Callable[[str], object], text: str, repeat: int, min_time: float) -> float:
+    """Лучшее время обработки из `repeat` замеров; мелкие входы обрабатываются в замере несколько раз."""
+    best = float('inf')
+    for _ in range(repeat):
+        loops = 0
+        start = time.perf_counter()
+        while True:
+            func(text)
+            loops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / loops)
+        if elapsed > 1.0:
+            break       # Большой вход: один замер точен и так, повторы только удлиняют проверку
+    return best
+
+
+def run_case(shape: Callable[[int], str],
+             setup: Callable[[], Callable[[str], object]],
+             sizes: list[int],
+             repeat: int = 3,
+             min_time: float = 0.05,
+             time_limit: float = 60.0,
+             max_exponent: float = DEFAULT_MAX_EXPONENT) -> dict:
+    """
+    Замеряет один случай на входах растущего размера.
+
+    :param shape: Генератор входа заданного размера.
+    :param setup: Функция создания обработчика (в замер не входит).
+    :param sizes: Размеры входа по возрастанию.
+    :param repeat: Число замеров на каждом размере (берется лучший).
+    :param min_time: Минимальная длительность одного замера в секундах.
+    :param time_limit: Если обработка одного входа дольше, большие размеры не замеряются, а случай отмечается.
+    :param max_exponent: Порог показателя роста.
+    :return: Размеры (фактические), время, показатель роста по всем точкам и по двум последним, отметка.
+    """
+    func = setup()
+    func(shape(sizes[0]))   # Прогрев: ленивые импорты, компиляция паттернов и т.п. в замер не входят
+    measured_sizes, seconds = [], []
+    over_limit = False
+    for size in sizes:
+        text = shape(size)
+        measured_sizes.append(len(text))
+        seconds.append(_time_call(func, text, repeat, min_time))
+        if seconds[-1] > time_limit:
+            over_limit = True
+            break
+    exponent = fit_exponent(measured_sizes, seconds)
+    tail_exponent = fit_exponent(measured_sizes[-2:], seconds[-2:])
+    return {
+        'sizes': measured_sizes,
+        'seconds': seconds,
+        'exponent': exponent,
+        'tail_exponent': tail_exponent,
+        'over_limit': over_limit,
+        'flagged': over_limit or exponent > max_exponent,
+    }
+
+
+def run_scaling(patterns: list[str] | None = None,
+                sizes: list[int] | None = None,
+                repeat: int = 3,
+                min_time: float = 0.05,
+                time_limit: float = 60.0,
+                max_exponent: float = DEFAULT_MAX_EXPONENT,
+                report: Callable[[str, dict], None] | None = None) -> dict:
+    """
+    Запускает проверку сложности.
+
+    :param patterns: Шаблоны имен случаев (fnmatch), None -- все.
+    :param sizes: Размеры входа, None -- `SIZES`.
+    :param report: Функция, которая вызывается после каждого случая с его именем и результатом.
+    :return: Результаты в формате JSON: метаданные запуска и результаты по именам случаев.
+    """
+    sizes = sorted(sizes or SIZES)
+    results = {}
+    for name, (shape, setup) in build_cases().items():
+        if patterns and not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            continue
+        results[name] = run_case(shape, setup, sizes, repeat=repeat, min_time=min_time, time_limit=time_limit,
+                                 max_exponent=max_exponent)
+        if report is not None:
+            report(name, results[name])
+    return {
+        'meta': run_meta(sizes=sizes, repeat=repeat, min_time=min_time, time_limit=time_limit,
+                         max_exponent=max_exponent),
+        'results': results,
+    }
+
+
+def parse_size(value: str) -> int:
+    """Размер с необязательным суффиксом: '300', '10K', '1.5M'."""
+    value = value.strip().upper()
+    if value and value[-1] in _SIZE_SUFFIXES:
+        return int(float(value[:-1]) * _SIZE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+def _print_result(name: str, result: dict) -> None:
+    mark = '  <-- хуже O(n log n)' if result['flagged'] else ''
+    if result['over_limit']:
+        mark += f" (превышен лимит времени на {result['sizes'][-1]} симв.)"
+    print(f"{name:<44} k={result['exponent']:5.2f} (хвост {result['tail_exponent']:5.2f}) "
+          f"{result['sizes'][-1]:>10} симв. за {result['seconds'][-1]:8.3f} с{mark}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Проверка алгоритмической сложности etpgrf")
+    parser.add_argument('--filter', action='append', dest='patterns', metavar='PATTERN',
+                        help="Шаблон имен случаев (fnmatch), можно несколько")
+    parser.add_argument('--sizes', help="Размеры входа через запятую, например 1K,10K,100K")
+    parser.add_argument('--max-size', type=parse_size, default=DEFAULT_MAX_SIZE,
+                        help="Наибольший размер входа из стандартного ряда (по умолчанию 10M)")
+    parser.add_argument('--repeat', type=int, default=3, help="Число замеров, берется лучший (по умолчанию 3)")
+    parser.add_argument('--time-limit', type=float, default=60.0,
+                        help="Лимит времени на один вход, с (по умолчанию 60)")
+    parser.add_argument('--max-exponent', type=float, default=DEFAULT_MAX_EXPONENT,
+                        help=f"Порог показателя роста (по умолчанию {DEFAULT_MAX_EXPONENT})")
+    parser.add_argument('--list', action='store_true', help="Только вывести имена случаев")
+    parser.add_argument('-o', '--output', help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in build_cases():
+            print(name)
+        return 0
+    if args.sizes:
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+    else:
+        sizes = [size for size in SIZES if size <= args.max_size]
+    data = run_scaling(args.patterns, sizes, repeat=args.repeat, time_limit=args.time_limit,
+                       max_exponent=args.max_exponent, report=_print_result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+    flagged = [name for name, result in data['results'].items() if result['flagged']]
+    if flagged:
+        print(f"Растут быстрее O(n log n): {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
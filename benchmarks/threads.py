@@ -0,0 +1,96 @@
+# benchmarks/threads.py
+# Масштабирование по потокам: один общий Typographer обрабатывает корпус в пуле потоков
+# (`process_many(pool='thread')`) с разным числом потоков. На интерпретаторе с GIL ускорения нет (потоки
+# выполняют Python-код по очереди), на free-threaded CPython 3.13+ (`python3.13t`, GIL отключен) ускорение должно
+# быть близким к линейному, пока потоков не больше, чем ядер.
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.threads
+#     python -m benchmarks.threads --threads 1,2,4,8,16 --scale 0.5 -o threads.json
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.run import Corpora, run_meta
+
+
+def measure_threads(typographer, docs: list[str], threads: int, repeat: int = 3) -> dict:
+    """
+    Замеряет обработку корпуса в пуле из `threads` потоков (лучший из `repeat` замеров).
+
+    :return: Словарь с временем прохода по корпусу и пропускной способностью.
+    """
+    chars = sum(len(doc) for doc in docs)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in typographer.process_many(docs, workers=threads, pool='thread', chunksize=4):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return {'threads': threads, 'seconds': best, 'docs_per_sec': len(docs) / best, 'chars_per_sec': chars / best}
+
+
+def run_scaling(threads: list[int], scale: float = 1.0, repeat: int = 3, corpus: str = 'html_mixed',
+                report=None) -> dict:
+    """
+    Замеряет масштабирование по потокам.
+
+    :param threads: Числа потоков.
+    :param scale: Множитель размера корпуса.
+    :param repeat: Число замеров для каждого числа потоков (берется лучший).
+    :param corpus: Имя корпуса (см. `benchmarks.run.Corpora`).
+    :param report: Функция, которая вызывается с результатом каждого замера.
+    :return: Результаты в формате JSON: метаданные, замеры и ускорение относительно первого числа потоков.
+    """
+    from etpgrf import Typographer
+    docs = Corpora(scale)[corpus]
+    typographer = Typographer(langs='ru+en', process_html=corpus.startswith('html'))
+    for doc in docs[:10]:
+        typographer.process(doc)    # Прогрев: ленивые импорты и т.п. в замер не входят
+    results = []
+    for count in threads:
+        result = measure_threads(typographer, docs, count, repeat)
+        result['speedup'] = results[0]['seconds'] / result['seconds'] if results else 1.0
+        result['efficiency'] = result['speedup'] * threads[0] / count
+        results.append(result)
+        if report is not None:
+            report(result)
+    return {'meta': run_meta(scale=scale, repeat=repeat, corpus=corpus), 'results': results}
+
+
+def _print_result(result: dict) -> None:
+    print(f"{result['threads']:>3} потоков {result['chars_per_sec'] / 1e6:9.3f} Мсимв/с "
+          f"x{result['speedup']:5.2f}  эффективность {result['efficiency']:.0%}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Масштабирование etpgrf по потокам (общий типограф)")
+    parser.add_argument('--threads', default=None,
+                        help="Числа потоков через запятую (по умолчанию 1, 2, 4, ... до числа ядер)")
+    parser.add_argument('--corpus', default='html_mixed', help="Корпус (по умолчанию html_mixed)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Множитель размера корпуса (по умолчанию 1)")
+    parser.add_argument('--repeat', type=int, default=3, help="Число замеров, берется лучший (по умолчанию 3)")
+    parser.add_argument('-o', '--output', help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        threads = [int(count) for count in args.threads.split(',')]
+    else:
+        threads = [1]
+        while threads[-1] * 2 <= (os.cpu_count() or 1):
+            threads.append(threads[-1] * 2)
+    data = run_scaling(threads, scale=args.scale, repeat=args.repeat, corpus=args.corpus, report=_print_result)
+    if data['meta']['gil_enabled']:
+        print("GIL включен: потоки выполняют Python-код по очереди, ускорения не будет "
+              "(нужен free-threaded CPython 3.13+)")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,10 +13,36 @@ __version__ = "0.1.0"
 import etpgrf.defaults
 import etpgrf.logger
 
-from etpgrf.hyphenation import Hyphenator
-from etpgrf.layout import LayoutProcessor
-from etpgrf.quotes import QuotesProcessor
-from etpgrf.sanitizer import SanitizerProcessor
-from etpgrf.symbols import SymbolsProcessor
-from etpgrf.typograph import Typographer
-from etpgrf.unbreakables import Unbreakables
+# Публичные классы импортируются при первом обращении (`etpgrf.Typographer`, `from etpgrf import Typographer`),
+# а не при `import etpgrf`: модули правил тянут за собой `regex`, обработка HTML -- BeautifulSoup, а короткоживущим
+# процессам (CLI, serverless-функции) важно время холодного старта.
+_LAZY_EXPORTS = {
+    'ResultCache': 'etpgrf.cache',
+    'SQLiteResultCache': 'etpgrf.cache',
+    'Hyphenator': 'etpgrf.hyphenation',
+    'LayoutProcessor': 'etpgrf.layout',
+    'QuotesProcessor': 'etpgrf.quotes',
+    'SanitizerProcessor': 'etpgrf.sanitizer',
+    'SlowDocumentRecorder': 'etpgrf.slowlog',
+    'SymbolsProcessor': 'etpgrf.symbols',
+    'BudgetedResult': 'etpgrf.typograph',
+    'Typographer': 'etpgrf.typograph',
+    'TypographerStats': 'etpgrf.stats',
+    'Unbreakables': 'etpgrf.unbreakables',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'etpgrf' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value     # Следующие обращения -- без вызова __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
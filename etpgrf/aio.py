@@ -0,0 +1,87 @@
+# etpgrf/aio.py
+# Модуль асинхронного API (asyncio): вынос CPU-емкой обработки в пул потоков или процессов, чтобы не блокировать
+# цикл событий (например, в aiohttp-сервисе), с ограничением числа одновременно обрабатываемых документов.
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from etpgrf.defaults import etpgrf_settings
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+
+async def aprocess(typographer,
+                   text: str,
+                   executor: Executor | None = None,
+                   semaphore: asyncio.Semaphore | None = None) -> str:
+    """
+    Асинхронно обрабатывает текст.
+
+    Короткие тексты (короче `etpgrf_settings.aio.INLINE_MAX_LEN`) обрабатываются прямо в цикле событий:
+    переход в пул и обратно обходится дороже самой обработки. Остальные отправляются в `executor`.
+
+    :param typographer: Настроенный Typographer.
+    :param text: Текст для обработки.
+    :param executor: Пул потоков или процессов (None -- пул по умолчанию цикла событий).
+                     Для пула процессов типограф передается в процесс через pickle при каждом вызове.
+    :param semaphore: Семафор, ограничивающий число документов, одновременно находящихся в пуле.
+                      Его можно разделять между вызовами (например, один на весь сервис).
+    :return: Обработанный текст.
+    """
+    if not text or len(text) < etpgrf_settings.aio.INLINE_MAX_LEN:
+        return typographer.process(text)
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, typographer.process, text)
+    async with semaphore:
+        return await loop.run_in_executor(executor, typographer.process, text)
+
+
+async def _aiter_texts(texts: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    """Приводит обычный или асинхронный итерируемый набор документов к асинхронному итератору."""
+    if hasattr(texts, '__aiter__'):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+
+
+async def aprocess_many(typographer,
+                        texts: Iterable[str] | AsyncIterable[str],
+                        executor: Executor | None = None,
+                        concurrency: int | None = None,
+                        semaphore: asyncio.Semaphore | None = None) -> AsyncIterator[str]:
+    """
+    Асинхронно обрабатывает набор документов и отдает результаты в порядке входных документов.
+
+    Одновременно в обработке находится не более `concurrency` документов: следующий документ читается из `texts`
+    только после того, как освободится место (обратное давление). Если потребитель перестает читать результаты
+    (закрывает генератор) или задача отменяется, все еще не начатые обработки отменяются.
+
+    :param typographer: Настроенный Typographer.
+    :param texts: Обычный или асинхронный итерируемый набор документов.
+    :param executor: Пул потоков или процессов (None -- пул по умолчанию цикла событий).
+    :param concurrency: Максимальное число документов в обработке (None -- `etpgrf_settings.aio.MAX_IN_FLIGHT`).
+    :param semaphore: Общий семафор (см. `aprocess`).
+    :return: Асинхронный генератор результатов.
+    """
+    if concurrency is None:
+        concurrency = etpgrf_settings.aio.MAX_IN_FLIGHT
+    if concurrency < 1:
+        raise ValueError(f"etpgrf: число одновременно обрабатываемых документов (concurrency) должно быть >= 1, "
+                         f"а не {concurrency}")
+    tasks = deque()
+    try:
+        async for text in _aiter_texts(texts):
+            tasks.append(asyncio.ensure_future(aprocess(typographer, text, executor, semaphore)))
+            if len(tasks) >= concurrency:
+                yield await tasks.popleft()
+        while tasks:
+            yield await tasks.popleft()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,174 @@
+# etpgrf/batch.py
+# Модуль пакетной обработки: распределяет документы по пулу процессов или потоков.
+# Каждый процесс пула получает свою копию Typographer один раз (при старте), со всеми скомпилированными
+# регулярными выражениями, и затем переиспользует ее для всех документов. Потоки пула используют один и тот же
+# Typographer: обработка не меняет его состояния, поэтому это безопасно, а на интерпретаторе без GIL
+# (free-threaded CPython 3.13+) потоки обрабатывают документы параллельно без копирования типографа и результатов
+# между процессами.
+
+import os
+import sys
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from etpgrf.config import BATCH_POOL_PROCESS, BATCH_POOL_THREAD, BATCH_POOL_AUTO, SUPPORTED_BATCH_POOLS
+from etpgrf.defaults import etpgrf_settings
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Типограф рабочего процесса пула. Заполняется в `_init_worker` один раз при старте процесса.
+_worker_typographer = None
+
+
+def _init_worker(typographer) -> None:
+    """Инициализатор процесса пула: запоминает (уже распакованный из pickle) типограф."""
+    global _worker_typographer
+    _worker_typographer = typographer
+
+
+def _process_batch(batch: list[tuple[int, str]], typographer=None) -> list[tuple[int, str]]:
+    """
+    Обрабатывает пачку документов внутри процесса (типографом процесса) или потока пула (переданным типографом).
+    Возвращает пары (индекс, результат).
+    """
+    process = (typographer or _worker_typographer).process
+    return [(idx, process(text)) for idx, text in batch]
+
+
+def gil_enabled() -> bool:
+    """Работает ли интерпретатор с GIL (на free-threaded CPython 3.13+ GIL можно отключить)."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def resolve_pool(pool: str | None = None) -> str:
+    """
+    Валидирует вид пула и выбирает пул для 'auto'.
+
+    :param pool: 'process', 'thread', 'auto' или None (по `etpgrf_settings.batch.POOL`).
+    :return: 'process' или 'thread'.
+    :raises ValueError: Если вид пула не поддерживается.
+    """
+    pool = etpgrf_settings.batch.POOL if pool is None else str(pool).lower()
+    if pool not in SUPPORTED_BATCH_POOLS:
+        raise ValueError(f"etpgrf: пул '{pool}' не поддерживается. "
+                         f"Поддерживаемые пулы: {', '.join(sorted(SUPPORTED_BATCH_POOLS))}")
+    if pool == BATCH_POOL_AUTO:
+        return BATCH_POOL_PROCESS if gil_enabled() else BATCH_POOL_THREAD
+    return pool
+
+
+def iter_batches(texts: Iterable[str],
+                 chunksize: int,
+                 chunk_chars: int) -> Iterator[list[tuple[int, str]]]:
+    """
+    Группирует документы в пачки с учетом их размера.
+
+    Мелкие документы собираются в пачку, пока в ней не наберется `chunksize` документов или `chunk_chars`
+    символов. Документ размером `chunk_chars` и больше отправляется отдельной пачкой, чтобы один огромный
+    документ не задерживал сотни мелких.
+
+    :param texts: Итерируемый набор документов.
+    :param chunksize: Максимальное число документов в пачке.
+    :param chunk_chars: Максимальный суммарный размер пачки в символах.
+    :return: Генератор пачек -- списков пар (индекс документа во входных данных, документ).
+    """
+    batch = []
+    batch_chars = 0
+    for idx, text in enumerate(texts):
+        size = len(text) if text else 0
+        if size >= chunk_chars:
+            # Крупный документ -- отдельной пачкой
+            yield [(idx, text)]
+            continue
+        batch.append((idx, text))
+        batch_chars += size
+        if len(batch) >= chunksize or batch_chars >= chunk_chars:
+            yield batch
+            batch = []
+            batch_chars = 0
+    if batch:
+        yield batch
+
+
+def process_many(typographer,
+                 texts: Iterable[str],
+                 workers: int | None = None,
+                 chunksize: int | None = None,
+                 ordered: bool = True,
+                 pool: str | None = None) -> Iterator[str]:
+    """
+    Обрабатывает набор документов на пуле процессов или потоков.
+
+    :param typographer: Настроенный Typographer (передается в процессы пула через pickle один раз, потоки пула
+                        используют его самого).
+    :param texts: Итерируемый набор документов (читается лениво, по мере освобождения пула).
+    :param workers: Число процессов (потоков) пула. None -- по `etpgrf_settings.batch.WORKERS` или числу ядер.
+                    При `workers <= 1` обработка идет в текущем потоке, без пула.
+    :param chunksize: Максимальное число документов в одной пачке.
+    :param ordered: True -- результаты отдаются в порядке входных документов (готовые результаты документов после
+                    еще не обработанного копятся, но не больше `workers * 2 * chunksize`: пока буфер полон, новые
+                    документы не читаются), False -- по мере готовности пачек.
+    :param pool: 'process', 'thread' или 'auto' (потоки, если интерпретатор работает без GIL, иначе процессы).
+                 None -- по `etpgrf_settings.batch.POOL`.
+    :return: Генератор результатов обработки.
+    """
+    settings = etpgrf_settings.batch
+    pool = resolve_pool(pool)
+    if workers is None:
+        workers = settings.WORKERS if settings.WORKERS is not None else (os.cpu_count() or 1)
+    if chunksize is None:
+        chunksize = settings.CHUNKSIZE
+    if chunksize < 1:
+        raise ValueError(f"etpgrf: размер пачки (chunksize) должен быть >= 1, а не {chunksize}")
+
+    if workers <= 1:
+        # Пул не нужен: обрабатываем в текущем процессе (порядок при этом сохраняется всегда)
+        for text in texts:
+            yield typographer.process(text)
+        return
+
+    logger.debug(f"process_many: pool: {pool}, workers: {workers}, chunksize: {chunksize}, "
+                 f"chunk_chars: {settings.CHUNK_CHARS}, ordered: {ordered}")
+    batches = iter_batches(texts, chunksize, settings.CHUNK_CHARS)
+    # Ограничиваем число пачек "в полете", чтобы не вычитывать весь входной поток в память.
+    max_pending = workers * 2
+    # Ограничиваем и число готовых результатов, ожидающих медленный документ перед ними (только для ordered=True)
+    max_ready = max_pending * chunksize
+    executor: Executor
+    if pool == BATCH_POOL_THREAD:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='etpgrf')
+        shared_typographer = typographer
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(typographer,))
+        shared_typographer = None
+    try:
+        pending = set()
+        ready = {}          # Готовые, но еще не отданные результаты (только для ordered=True)
+        next_idx = 0        # Индекс следующего документа, который нужно отдать (только для ordered=True)
+        exhausted = False
+        while True:
+            # Догружаем пул пачками
+            while not exhausted and len(pending) < max_pending and len(ready) < max_ready:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(_process_batch, batch, shared_typographer))
+            if not pending:
+                # Если буфер готовых результатов полон, документ next_idx еще в пуле, т.е. pending не пуст
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if ordered:
+                    ready.update(future.result())
+                else:
+                    for _, result in future.result():
+                        yield result
+            if ordered:
+                while next_idx in ready:
+                    yield ready.pop(next_idx)
+                    next_idx += 1
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
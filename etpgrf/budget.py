@@ -0,0 +1,88 @@
+# etpgrf/budget.py
+# Бюджет времени на обработку документа (см. `Typographer.process_with_budget`). Крайний срок хранится
+# в контекстной переменной, поэтому его видят все замены правил (`textmap.tracked_sub`) без передачи параметров,
+# а одновременные вызовы в разных потоках и задачах asyncio не мешают друг другу. Регулярные выражения получают
+# остаток времени как `timeout` модуля `regex`, а время функций замены проверяется при каждом совпадении.
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections.abc import Iterator
+
+
+class Budget:
+    """
+    Бюджет текущего вызова: крайний срок и этапы, пропущенные из-за его нехватки.
+    """
+    __slots__ = ('deadline', 'skipped')
+
+    def __init__(self, deadline: float):
+        """
+        :param deadline: Крайний срок по часам `time.monotonic()`.
+        """
+        self.deadline = deadline
+        self.skipped: list[str] = []
+
+    def remaining(self) -> float:
+        """Сколько секунд осталось (отрицательное число -- срок прошел)."""
+        return self.deadline - time.monotonic()
+
+    def skip(self, stage: str) -> None:
+        """Отмечает этап как пропущенный."""
+        if stage not in self.skipped:
+            self.skipped.append(stage)
+
+
+_current_budget: ContextVar[Budget | None] = ContextVar('etpgrf_budget', default=None)
+
+
+def current_budget() -> Budget | None:
+    """Бюджет текущего вызова (None -- без ограничения времени)."""
+    return _current_budget.get()
+
+
+@contextmanager
+def budget_scope(deadline: float) -> Iterator[Budget]:
+    """
+    Устанавливает бюджет на время блока `with`.
+
+    :param deadline: Крайний срок по часам `time.monotonic()`.
+    """
+    budget = Budget(deadline)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def is_degraded() -> bool:
+    """Пропущены ли в текущем вызове этапы обработки из-за нехватки времени."""
+    budget = _current_budget.get()
+    return budget is not None and bool(budget.skipped)
+
+
+def regex_timeout() -> float | None:
+    """
+    Остаток времени для параметра `timeout` регулярных выражений.
+
+    :return: Секунды до крайнего срока или None, если бюджета нет.
+    :raises TimeoutError: Если срок уже прошел.
+    """
+    budget = _current_budget.get()
+    if budget is None:
+        return None
+    remaining = budget.deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("etpgrf: бюджет времени на обработку исчерпан")
+    return remaining
+
+
+def check_deadline(deadline: float) -> None:
+    """
+    Проверяет крайний срок (в функциях замены: их время `timeout` регулярных выражений не учитывает).
+
+    :raises TimeoutError: Если срок прошел.
+    """
+    if time.monotonic() >= deadline:
+        raise TimeoutError("etpgrf: бюджет времени на обработку исчерпан")
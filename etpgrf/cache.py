@@ -0,0 +1,350 @@
+# etpgrf/cache.py
+# Модуль кэширования результатов обработки. Одни и те же тексты (тела статей, заголовки, пункты меню)
+# типографируются снова и снова, поэтому результат можно запомнить.
+# Ключ кэша -- хэш входного текста плюс "отпечаток" полной конфигурации типографа (языки, режим, параметры всех
+# модулей правил и версия библиотеки), поэтому один кэш можно разделять между типографами с разными настройками.
+# Кэш бывает в памяти процесса (ResultCache) и на диске (SQLiteResultCache, общий для процессов и переживающий
+# перезапуски).
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import TYPE_CHECKING
+from etpgrf.defaults import etpgrf_settings
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(config: dict) -> str:
+    """
+    Вычисляет стабильный "отпечаток" конфигурации типографа.
+
+    :param config: Конфигурация (см. `Typographer.get_config()`), сериализуемая в JSON.
+    :return: Отпечаток -- hex-строка. Включает версию библиотеки, так что после обновления etpgrf
+             старые результаты в кэше не используются.
+    """
+    from etpgrf import __version__
+    payload = json.dumps({'version': __version__, 'config': config},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def make_cache_key(fingerprint: str, text: str) -> str:
+    """
+    Формирует ключ кэша: отпечаток конфигурации + хэш текста.
+
+    :param fingerprint: Отпечаток конфигурации (см. `config_fingerprint`).
+    :param text: Входной текст.
+    :return: Ключ кэша.
+    """
+    digest = blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    return f"{fingerprint}:{digest}"
+
+
+class ResultCache:
+    """
+    Потокобезопасный LRU-кэш результатов обработки, ограниченный числом записей и суммарным объемом.
+
+    При превышении любого из ограничений вытесняются давно не использованные записи.
+    При передаче в другой процесс (pickle, например, в пул процессов) передаются только ограничения,
+    а не содержимое: каждый процесс ведет свой кэш.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None):
+        """
+        :param max_entries: Максимальное число записей (None -- `etpgrf_settings.cache.MAX_ENTRIES`).
+        :param max_bytes: Максимальный суммарный объем результатов в байтах
+                          (None -- `etpgrf_settings.cache.MAX_BYTES`).
+        """
+        self.max_entries = etpgrf_settings.cache.MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = etpgrf_settings.cache.MAX_BYTES if max_bytes is None else max_bytes
+        if self.max_entries < 1:
+            raise ValueError(f"etpgrf: размер кэша (max_entries) должен быть >= 1, а не {self.max_entries}")
+        if self.max_bytes < 1:
+            raise ValueError(f"etpgrf: объем кэша (max_bytes) должен быть >= 1, а не {self.max_bytes}")
+        self._init_storage()
+        logger.debug(f"ResultCache `__init__`. Max entries: {self.max_entries}, max bytes: {self.max_bytes}")
+
+    def _init_storage(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()   # ключ -> (результат, размер)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> dict:
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.max_entries = state['max_entries']
+        self.max_bytes = state['max_bytes']
+        self._init_storage()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        """
+        Возвращает результат по ключу (и помечает запись как недавно использованную) или None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Запоминает результат. Результат, который сам по себе больше `max_bytes`, не кэшируется.
+        """
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Очищает кэш (счетчики попаданий, промахов и вытеснений сохраняются).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша: попадания, промахи, вытеснения, число записей и их суммарный объем.
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries),
+                    'bytes': self._bytes}
+
+
+class SQLiteResultCache:
+    """
+    Персистентный кэш результатов обработки на SQLite (только стандартная библиотека).
+
+    Файл базы можно разделять между процессами (например, воркерами gunicorn): база работает в режиме WAL, так что
+    читатели не блокируют друг друга и писателя. Кэш переживает перезапуски. При превышении `max_bytes` вытесняются
+    давно не использованные записи. Версия библиотеки и конфигурация типографа входят в отпечаток в ключе, так что
+    устаревшие результаты никогда не возвращаются. Записи от другой версии библиотеки база не удаляет при открытии
+    (при постепенном обновлении старые и новые процессы работают с одной базой), а вытесняет первыми.
+
+    Ошибки SQLite (например, база заблокирована дольше `timeout`) не прерывают обработку: они логируются,
+    а запрос считается промахом.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+        "size INTEGER NOT NULL, atime REAL NOT NULL, version TEXT NOT NULL DEFAULT '')",
+        "CREATE INDEX IF NOT EXISTS results_atime ON results (atime)",
+    )
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int | None = None, timeout: float | None = None):
+        """
+        :param path: Путь к файлу базы.
+        :param max_bytes: Максимальный суммарный объем результатов в байтах
+                          (None -- `etpgrf_settings.cache.SQLITE_MAX_BYTES`).
+        :param timeout: Сколько секунд ждать, если база заблокирована другим процессом
+                        (None -- `etpgrf_settings.cache.SQLITE_TIMEOUT`).
+        """
+        self.path = os.fspath(path)
+        self.max_bytes = etpgrf_settings.cache.SQLITE_MAX_BYTES if max_bytes is None else max_bytes
+        self.timeout = etpgrf_settings.cache.SQLITE_TIMEOUT if timeout is None else timeout
+        if self.max_bytes < 1:
+            raise ValueError(f"etpgrf: объем кэша (max_bytes) должен быть >= 1, а не {self.max_bytes}")
+        self._init_state()
+        self._prepare_database()
+        logger.debug(f"SQLiteResultCache `__init__`. Path: {self.path}, max bytes: {self.max_bytes}")
+
+    def _init_state(self) -> None:
+        from etpgrf import __version__
+        self._version = __version__         # Версия библиотеки, которой сделаны записи этого процесса
+        self._local = threading.local()     # Соединения SQLite нельзя разделять между потоками
+        self._lock = threading.Lock()       # Защищает счетчики
+        self._puts_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path, 'max_bytes': self.max_bytes, 'timeout': self.timeout}
+
+    def __setstate__(self, state: dict) -> None:
+        self.path = state['path']
+        self.max_bytes = state['max_bytes']
+        self.timeout = state['timeout']
+        self._init_state()
+
+    def _connection(self) -> 'sqlite3.Connection':
+        """
+        Возвращает соединение текущего потока. После fork соединение родителя не используется -- открывается новое.
+        """
+        # sqlite3 импортируется только в методах кэша на диске: импорт модуля кэша не должен замедлять старт
+        import sqlite3
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _prepare_database(self) -> None:
+        """
+        Создает схему. В базу, созданную до появления столбца `version`, столбец добавляется; ее записи
+        считаются записями другой версии и вытесняются первыми.
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+            if 'version' not in columns:
+                conn.execute("ALTER TABLE results ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+
+    def get(self, key: str) -> str | None:
+        """
+        Возвращает результат по ключу или None. Время последнего использования записи обновляется не чаще,
+        чем раз в `etpgrf_settings.cache.SQLITE_ATIME_RESOLUTION` секунд, чтобы чтения не превращались в записи.
+        """
+        import sqlite3
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT value, atime FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                now = time.time()
+                if now - row[1] > etpgrf_settings.cache.SQLITE_ATIME_RESOLUTION:
+                    conn.execute("UPDATE results SET atime = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"SQLiteResultCache: ошибка чтения из {self.path}: {e}")
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Запоминает результат. Проверка объема и вытеснение выполняются не после каждой записи, а раз в
+        `etpgrf_settings.cache.SQLITE_EVICT_EVERY` записей.
+        """
+        import sqlite3
+        size = len(value.encode('utf-8', 'surrogatepass'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._puts_since_evict += 1
+            need_evict = self._puts_since_evict >= etpgrf_settings.cache.SQLITE_EVICT_EVERY
+            if need_evict:
+                self._puts_since_evict = 0
+        try:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO results (key, value, size, atime, version) VALUES (?, ?, ?, ?, ?)",
+                         (key, value, size, time.time(), self._version))
+            if need_evict:
+                self.evict()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLiteResultCache: ошибка записи в {self.path}: {e}")
+
+    def evict(self) -> int:
+        """
+        Вытесняет записи, пока суммарный объем больше `max_bytes`: сначала записи других версий библиотеки,
+        затем давно не использованные записи текущей версии.
+
+        :return: Число удаленных записей (0 при ошибке SQLite).
+        """
+        import sqlite3
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+                excess = total - self.max_bytes
+                if excess <= 0:
+                    return 0
+                keys = []
+                for condition in ("version != ?", "version = ?"):
+                    rows = conn.execute(f"SELECT key, size FROM results WHERE {condition} ORDER BY atime",
+                                        (self._version,))
+                    for key, size in rows:
+                        keys.append((key,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM results WHERE key = ?", keys)
+        except sqlite3.Error as e:
+            logger.warning(f"SQLiteResultCache: ошибка вытеснения в {self.path}: {e}")
+            return 0
+        with self._lock:
+            self.evictions += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Очищает кэш (счетчики попаданий, промахов и вытеснений сохраняются).
+        """
+        import sqlite3
+        try:
+            self._connection().execute("DELETE FROM results")
+        except sqlite3.Error as e:
+            logger.warning(f"SQLiteResultCache: ошибка очистки {self.path}: {e}")
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша. Попадания, промахи и вытеснения считаются для этого объекта (процесса),
+        число записей и их объем -- для всей базы (None, если база недоступна).
+        """
+        import sqlite3
+        try:
+            entries, total = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLiteResultCache: ошибка чтения статистики {self.path}: {e}")
+            entries = total = None
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': entries,
+                    'bytes': total}
+
+    def close(self) -> None:
+        """
+        Закрывает соединение текущего потока.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
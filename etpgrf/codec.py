@@ -7,10 +7,25 @@ from . import config
 # from etpgrf.config import (ALL_ENTITIES, ALWAYS_MNEMONIC_IN_SAFE_MODE, MODE_MNEMONIC, MODE_MIXED)
 
 # --- Создаем словарь для кодирования Unicode -> Mnemonic ---
-# Получаем готовую карту для кодирования один раз при импорте
+# Готовая карта для кодирования (построена заранее, см. `encode_map.py`)
 _ENCODE_MAP = config.get_encode_map()
-# Создаем таблицу для быстрой замены через str.translate
-_TRANSLATE_TABLE = str.maketrans(_ENCODE_MAP)
+# То же для режима 'mixed' (только "безопасные" символы) -- один раз при импорте, а не при каждом вызове
+_MIXED_ENCODE_MAP = {
+    char: _ENCODE_MAP[char]
+    for char in config.SAFE_MODE_CHARS_TO_MNEMONIC
+    if char in _ENCODE_MAP
+}
+# Таблицы для быстрой замены через str.translate строятся при первом кодировании (в режиме 'unicode' не нужны)
+_TRANSLATE_TABLE: dict[int, str] | None = None
+_MIXED_TRANSLATE_TABLE: dict[int, str] | None = None
+
+
+def _translate_table(mixed: bool) -> dict[int, str]:
+    global _TRANSLATE_TABLE, _MIXED_TRANSLATE_TABLE
+    if _TRANSLATE_TABLE is None:
+        _MIXED_TRANSLATE_TABLE = str.maketrans(_MIXED_ENCODE_MAP)
+        _TRANSLATE_TABLE = str.maketrans(_ENCODE_MAP)
+    return _MIXED_TRANSLATE_TABLE if mixed else _TRANSLATE_TABLE
 
 #
 # for name, (uni_char, mnemonic) in ALL_ENTITIES.items():
@@ -28,9 +43,15 @@ def decode_to_unicode(text: str) -> str:
     return html.unescape(text)
 
 
-def encode_from_unicode(text: str, mode: str) -> str:
+def encode_from_unicode(text: str, mode: str, chars: set[str] | frozenset[str] | None = None) -> str:
     """
     Преобразует Unicode-символы в HTML-мнемоники в соответствии с режимом.
+
+    :param text: Текст для кодирования.
+    :param mode: Режим ('unicode', 'mnemonic' или 'mixed').
+    :param chars: Множество символов текста (необязательно). Если в нем нет ни одного кодируемого символа,
+                  текст возвращается как есть, без прохода по нему.
+    :return: Закодированный текст.
     """
     if not text:
         # Если текст пустой, просто возвращаем его
@@ -42,17 +63,31 @@ def encode_from_unicode(text: str, mode: str) -> str:
     if mode == config.MODE_MNEMONIC:
         # В режиме 'mnemonic' заменяем все известные символы, используя
         # заранее скомпилированную таблицу для максимальной производительности.
-        return text.translate(_TRANSLATE_TABLE)
+        if chars is not None and chars.isdisjoint(_ENCODE_MAP):
+            return text
+        return text.translate(_translate_table(mixed=False))
     if mode == config.MODE_MIXED:
-        # Создаем временную карту только для "безопасных" символов
-        safe_map = {
-            char: _ENCODE_MAP[char]
-            for char in config.SAFE_MODE_CHARS_TO_MNEMONIC
-            if char in _ENCODE_MAP
-        }
-        if not safe_map:
+        # Заменяем только "безопасные" символы
+        if not _MIXED_ENCODE_MAP or (chars is not None and chars.isdisjoint(_MIXED_ENCODE_MAP)):
             return text
-        return text.translate(str.maketrans(safe_map))
+        return text.translate(_translate_table(mixed=True))
 
     # Возвращаем исходный текст, если режим не распознан
     return text
+
+
+def escape_html_text(text: str, mode: str) -> str:
+    """
+    Готовит закодированный текст (результат `encode_from_unicode`) к выводу в HTML как есть, без повторного
+    экранирования. В режимах 'mnemonic' и 'mixed' спецсимволы HTML (`&`, `<`, `>`) уже заменены мнемониками,
+    а в режиме 'unicode' их нужно экранировать.
+
+    :param text: Закодированный текст.
+    :param mode: Режим ('unicode', 'mnemonic' или 'mixed').
+    :return: Текст, готовый к вставке в HTML.
+    """
+    if mode == config.MODE_MNEMONIC or mode == config.MODE_MIXED:
+        return text
+    if '&' not in text and '<' not in text and '>' not in text:
+        return text
+    return html.escape(text, quote=False)
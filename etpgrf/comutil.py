@@ -1,10 +1,13 @@
 # etpgrf/comutil.py
 # Общие функции для типографа etpgrf
-from etpgrf.config import MODE_UNICODE, MODE_MNEMONIC, MODE_MIXED, SUPPORTED_LANGS, DEFAULT_LANGS
+from etpgrf.config import (MODE_UNICODE, MODE_MNEMONIC, MODE_MIXED, SUPPORTED_LANGS, DEFAULT_LANGS,
+                           SUPPORTED_HTML_BACKENDS)
 from etpgrf.defaults import etpgrf_settings
+import functools
 import os
 import regex
 import logging
+import threading
 
 # --- Настройки логирования ---
 logger = logging.getLogger(__name__)
@@ -36,6 +39,31 @@ def parse_and_validate_mode(
     return _mode_input
 
 
+def parse_and_validate_html_backend(
+    backend_input: str | None = None,
+) -> str:
+    """
+    Обрабатывает и валидирует входной параметр html_backend (способ разбора HTML).
+    Если backend_input не предоставлен (None), используется бэкенд по умолчанию.
+
+    :param backend_input: Бэкенд обработки HTML. Может быть 'soup' или 'stream'.
+    :return: Валидированный бэкенд в нижнем регистре.
+    :raises ValueError: Если бэкенд не поддерживается.
+    """
+    if backend_input is None:
+        _backend_input = etpgrf_settings.HTML_BACKEND
+    else:
+        _backend_input = str(backend_input).lower()
+
+    if _backend_input not in SUPPORTED_HTML_BACKENDS:
+        raise ValueError(
+            f"etpgrf: бэкенд HTML '{_backend_input}' не поддерживается. "
+            f"Поддерживаемые бэкенды: {', '.join(sorted(SUPPORTED_HTML_BACKENDS))}"
+        )
+
+    return _backend_input
+
+
 def parse_and_validate_langs(
     langs: str | list[str] | tuple[str, ...] | frozenset[str] | None = None,
 ) -> list[str]:
@@ -114,27 +142,299 @@ def is_inside_unbreakable_segment(
     # Проверяем, что позиция разбиения не выходит за границы сегмента
     if not (0 < split_index < segment_len):
         return False
-    # Пер образуем все в верхний регистр, чтобы сравнения строк работали
-    word_segment_upper = word_segment.upper()
-    # unbreakable_set_upper = (unit.upper() for unit in unbreakable_set)        # <-- С помощью генератора
-
-    # Отсортируем unbreakable_set по длине лексем (чем короче, тем больше шансов на "ранний выход")
-    # и заодно превратим в list
-    sorted_units = sorted(unbreakable_set, key=len)
-    # sorted_units = sorted(unbreakable_set_upper, key=len)
-    for unbreakable in sorted_units:
-        unit_len = len(unbreakable)
-        if unit_len < 2:
-            continue
-        # Спорно, что преобразование в верхний регистр эффективнее делать тут, но благодаря возможному
-        # "раннему выходу" это может быть быстрее с помощью генератора (см. выше комментарии)
-        unbreakable_upper = unbreakable.upper()
+    # Неразрывный сегмент, содержащий позицию разбиения, целиком лежит в окне вокруг нее: в верхний регистр
+    # переводится только окно, а не весь сегмент (иначе проверка всех позиций длинного слова квадратична)
+    if isinstance(unbreakable_set, frozenset):
+        sorted_units, max_len = _sorted_unbreakable_units(unbreakable_set)
+    else:
+        sorted_units, max_len = _sort_unbreakable_units(unbreakable_set)
+    if not sorted_units:
+        return False
+    window_start = max(0, split_index - max_len + 1)
+    window = word_segment[window_start:split_index + max_len - 1].upper()
+    split_in_window = split_index - window_start
+    window_len = len(window)
+    for unbreakable_upper in sorted_units:
+        unit_len = len(unbreakable_upper)
         for offset in range(1, unit_len):
-            position_start_in_segment = split_index - offset
-            position_end_in_segment = position_start_in_segment + unit_len
+            position_start = split_in_window - offset
+            position_end = position_start + unit_len
             # Убедимся, что предполагаемое положение 'unit' не выходит за границы word_segment
-            if position_start_in_segment >= 0 and position_end_in_segment <= segment_len and \
-                    word_segment_upper[position_start_in_segment:position_end_in_segment] == unbreakable_upper:
+            if position_start >= 0 and position_end <= window_len and \
+                    window[position_start:position_end] == unbreakable_upper:
                 # Нашли 'unbreakable', и split_index находится внутри него.
                 return True
     return False
+
+
+def unbreakable_split_positions(
+    word: str,
+    unbreakable_set: frozenset[str] | list[str] | set[str],
+) -> bytearray:
+    """
+    Позиции разбиения внутри неразрывных сегментов для всего слова сразу (то же, что `is_inside_unbreakable_segment`
+    для каждой позиции, но одним поиском каждого сегмента по слову).
+
+    :param word: -- Слово.
+    :param unbreakable_set: -- Набор неразрывных сегментов (например: диграфы, триграфы, акронимы...).
+    :return: Для каждой позиции слова 1, если разбиение перед символом с этим индексом попадает внутрь
+             неразрывного сегмента, иначе 0.
+    """
+    word_len = len(word)
+    inside = bytearray(word_len)
+    word_upper = word.upper()
+    if len(word_upper) != word_len:
+        # Перевод в верхний регистр изменил длину (например, "ß" -> "SS"): проверяем каждую позицию
+        for split_index in range(1, word_len):
+            inside[split_index] = is_inside_unbreakable_segment(word, split_index, unbreakable_set)
+        return inside
+    if isinstance(unbreakable_set, frozenset):
+        sorted_units, _ = _sorted_unbreakable_units(unbreakable_set)
+    else:
+        sorted_units, _ = _sort_unbreakable_units(unbreakable_set)
+    for unbreakable_upper in sorted_units:
+        unit_len = len(unbreakable_upper)
+        start = word_upper.find(unbreakable_upper)
+        while start >= 0:
+            inside[start + 1:start + unit_len] = b'\1' * (unit_len - 1)
+            start = word_upper.find(unbreakable_upper, start + 1)
+    return inside
+
+
+def _sort_unbreakable_units(units) -> tuple[tuple[str, ...], int]:
+    """
+    Неразрывные сегменты (не короче 2 символов) в верхнем регистре, отсортированные по длине (чем короче, тем
+    больше шансов на "ранний выход"), и длина самого длинного.
+    """
+    sorted_units = tuple(sorted((unit.upper() for unit in units if len(unit) >= 2), key=len))
+    return sorted_units, len(sorted_units[-1]) if sorted_units else 0
+
+
+@functools.lru_cache(maxsize=32)
+def _sorted_unbreakable_units(units: frozenset[str]) -> tuple[tuple[str, ...], int]:
+    # Наборы-константы (frozenset) сортируются один раз, а не при проверке каждой позиции разбиения
+    return _sort_unbreakable_units(units)
+
+
+
+# --- Условия применимости правил (быстрый пропуск текстов, которые правило не может изменить) ---
+
+# Все пробельные символы (то, что находит `\s` в регулярных выражениях, с небольшим запасом)
+WHITESPACE_CHARS = frozenset(c for c in map(chr, range(0x3001)) if c.isspace())
+
+
+def both_cases(chars) -> frozenset[str]:
+    """
+    Возвращает набор символов вместе с их вариантами в верхнем и нижнем регистре.
+    """
+    result = set()
+    for char in chars:
+        result.update((char, char.lower(), char.upper()))
+    return frozenset(c for c in result if len(c) == 1)
+
+
+class RuleTrigger:
+    """
+    Условие, при котором правило МОЖЕТ сработать: текст не короче `min_len`, и в нем есть хотя бы один символ
+    из каждого набора `required`. Условие -- необходимое, но не достаточное: если `may_apply()` вернул False,
+    правило точно ничего не изменит, и его можно пропустить, не сканируя текст.
+
+    Вместо набора символов можно передать RuleTrigger.DIGITS -- "любая десятичная цифра" (`\\d`).
+    С `ignore_case=True` символы текста сравниваются без учета регистра (как в правилах с IGNORECASE
+    или с проверкой `char.upper() in ...`), включая "экзотические" формы вроде `ſ` или `ᲄ`.
+    """
+    DIGITS = 'digits'
+
+    __slots__ = ('required', 'min_len', 'ignore_case', '_needs_digit')
+
+    def __init__(self, *required, min_len: int = 1, ignore_case: bool = False):
+        """
+        :param required: Наборы символов (строки или множества). В тексте должен быть символ из каждого набора.
+        :param min_len: Минимальная длина текста, на котором правило может сработать.
+        :param ignore_case: Сравнивать символы без учета регистра.
+        """
+        self._needs_digit = any(r is RuleTrigger.DIGITS for r in required)
+        sets = [r for r in required if r is not RuleTrigger.DIGITS]
+        self.required = tuple(both_cases(r) if ignore_case else frozenset(r) for r in sets)
+        self.min_len = min_len
+        self.ignore_case = ignore_case
+
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет, может ли правило сработать на тексте.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если правило точно ничего не изменит.
+        """
+        if length < self.min_len:
+            return False
+        for required in self.required:
+            if chars.isdisjoint(required):
+                if not self.ignore_case:
+                    return False
+                # Символ может совпасть с правилом только через смену регистра (`ſ` -> `S`, `K` -> `k`)
+                if not any(c.upper()[:1] in required or c.lower()[:1] in required for c in chars):
+                    return False
+        if self._needs_digit and not any(char.isdecimal() for char in chars):
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return (f"RuleTrigger(required={[''.join(sorted(r)) for r in self.required]}, "
+                f"min_len={self.min_len}, ignore_case={self.ignore_case})")
+
+
+def trigger_key_chars(triggers) -> frozenset[str] | None:
+    """
+    Собирает "ключевые" символы набора условий: если в тексте нет ни одного из них, не выполнится ни одно
+    условие (для каждого условия берется его самый маленький набор символов). Это позволяет отсеять текст
+    одной проверкой вместо проверки каждого условия по отдельности.
+
+    :param triggers: Условия применимости (RuleTrigger).
+    :return: Множество ключевых символов или None, если его нельзя собрать (есть условие без наборов символов
+             или условие без учета регистра).
+    """
+    key_chars = set()
+    for trigger in triggers:
+        if not trigger.required or trigger.ignore_case:
+            return None
+        key_chars |= min(trigger.required, key=len)
+    return frozenset(key_chars)
+
+
+def _make_encoded_string_class():
+    from bs4.element import NavigableString
+
+    class EncodedString(NavigableString):
+        """
+        Текстовый узел, текст которого уже готов к выводу в HTML (мнемоники расставлены, спецсимволы экранированы,
+        см. `codec.escape_html_text`). При сериализации дерева выводится как есть, без повторного экранирования.
+        """
+
+        def output_ready(self, formatter=None) -> str:
+            return self.PREFIX + self + self.SUFFIX
+
+    return EncodedString
+
+
+_lazy_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    # `EncodedString` -- наследник класса BeautifulSoup, поэтому создается при первом обращении: импорт модуля
+    # не должен импортировать bs4 (он нужен, только если обрабатывается HTML). Блокировка -- чтобы потоки,
+    # одновременно обратившиеся к нему впервые, получили один и тот же класс.
+    if name == 'EncodedString':
+        with _lazy_lock:
+            if name in globals():
+                return globals()[name]
+            try:
+                encoded_string = _make_encoded_string_class()
+            except ImportError:
+                encoded_string = None
+            globals()[name] = encoded_string
+            return encoded_string
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def collect_text_nodes(
+    root,
+    skip_tags=(),
+    target_tags=None,
+    block_tags=(),
+) -> list[tuple]:
+    """
+    Собирает текстовые узлы HTML-дерева (BeautifulSoup) в порядке документа одним итеративным обходом
+    (без рекурсии, поэтому глубокая вложенность тегов не приводит к RecursionError).
+
+    Поддеревья тегов из `skip_tags` пропускаются целиком, на любой глубине. Комментарии, CDATA, doctype
+    и прочие служебные строки (`PreformattedString`) текстом не считаются.
+
+    :param root: Корень обхода (BeautifulSoup или Tag).
+    :param skip_tags: Имена тегов, содержимое которых не обрабатывается.
+    :param target_tags: Имена тегов, для содержимого которых нужен признак `in_target` (None -- признак
+                        у всех узлов True).
+    :param block_tags: Имена блочных тегов: номер блока узла растет на каждой границе (начале или конце) такого тега.
+    :return: Список кортежей (узел, родитель, индекс узла в `родитель.contents`, in_target, номер блока).
+    """
+    from bs4.element import NavigableString, PreformattedString, Tag
+    result = []
+    block = 0
+    stack = [(root, iter(enumerate(root.contents)), target_tags is None)]
+    while stack:
+        parent, children, in_target = stack[-1]
+        for index, child in children:
+            if isinstance(child, Tag):
+                if child.name in block_tags:
+                    block += 1
+                if child.name not in skip_tags:
+                    child_in_target = in_target or child.name in target_tags
+                    stack.append((child, iter(enumerate(child.contents)), child_in_target))
+                    break
+                if child.name in block_tags:
+                    block += 1
+            elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                result.append((child, parent, index, in_target, block))
+        else:
+            stack.pop()
+            if parent.name in block_tags:
+                block += 1
+    return result
+
+
+# Сколько замен в одном родителе выгоднее делать пересборкой его списка детей, а не вставками по месту
+# (каждая вставка сдвигает хвост списка `contents`, на "плоских" документах это квадратичная сложность).
+_REBUILD_MIN_REPLACEMENTS = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _extract_accepts_index() -> bool:
+    """
+    Принимает ли `PageElement.extract` позицию узла (`_self_index`, есть в BeautifulSoup 4.12.1 -- 4.15). Без нее
+    каждое извлечение ищет узел среди соседей, и извлечение всех детей "широкого" родителя квадратично.
+    """
+    import inspect
+    from bs4.element import PageElement
+    return '_self_index' in inspect.signature(PageElement.extract).parameters
+
+
+def _remove_all_children(parent) -> None:
+    """Извлекает всех детей узла (с конца, чтобы список детей не сдвигался)."""
+    if not _extract_accepts_index():
+        parent.clear()
+        return
+    contents = parent.contents
+    for index in range(len(contents) - 1, -1, -1):
+        contents[index].extract(_self_index=index)
+
+
+def replace_text_nodes(replacements: list[tuple]) -> None:
+    """
+    Заменяет текстовые узлы новыми узлами (строки превращаются в текстовые узлы). Позиции узлов уже известны
+    (см. `collect_text_nodes`), поэтому узлы не ищутся среди соседей, как в `replace_with`. Замены группируются
+    по родителю: у родителя с небольшим числом замен узлы заменяются по месту (с конца, чтобы индексы
+    не сдвигались), а список детей родителя с большим числом замен пересобирается за один проход.
+
+    :param replacements: Список кортежей (узел, родитель, индекс узла в `родитель.contents`, новые узлы)
+                         в порядке документа.
+    """
+    by_parent = {}
+    for replacement in replacements:
+        by_parent.setdefault(id(replacement[1]), []).append(replacement)
+    for items in by_parent.values():
+        parent = items[0][1]
+        if len(items) < _REBUILD_MIN_REPLACEMENTS:
+            for node, _, index, new_nodes in reversed(items):
+                node.extract()
+                for offset, new_node in enumerate(new_nodes):
+                    parent.insert(index + offset, new_node)
+            continue
+        # Собираем новый список детей, затем извлекаем старых (с конца -- без сдвига списка) и добавляем новых
+        new_children_at = {index: new_nodes for _, _, index, new_nodes in items}
+        new_children = []
+        for index, child in enumerate(parent.contents):
+            new_children.extend(new_children_at.get(index, (child,)))
+        _remove_all_children(parent)
+        for child in new_children:
+            parent.append(child)
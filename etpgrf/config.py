@@ -1,6 +1,6 @@
 # etpgrf/conf.py
 # Настройки по умолчанию и "источник правды" для типографа etpgrf
-from html import entities
+from etpgrf.encode_map import ENCODE_MAP
 
 # === КОНФИГУРАЦИИ ===
 # Режимы "отдачи" результатов обработки
@@ -21,6 +21,27 @@ SANITIZE_ETPGRF = "etp"           # Очистка от "span-оберток" с
                                   # при предыдущих проходах типографа)
 SANITIZE_NONE = None              # Без очистки (режим по умолчанию). False тоже можно использовать.
 
+# Способы разбора HTML (бэкенды обработки HTML)
+HTML_BACKEND_SOUP = "soup"        # Дерево BeautifulSoup (по умолчанию): полная поддержка санитайзера
+HTML_BACKEND_STREAM = "stream"    # Потоковый токенизатор без построения дерева: теги выводятся как есть
+SUPPORTED_HTML_BACKENDS = frozenset([HTML_BACKEND_SOUP, HTML_BACKEND_STREAM])
+
+# Пулы пакетной обработки (Typographer.process_many)
+BATCH_POOL_PROCESS = "process"      # Пул процессов: каждый процесс получает копию типографа
+BATCH_POOL_THREAD = "thread"        # Пул потоков: один типограф на все потоки (параллельно -- только без GIL)
+BATCH_POOL_AUTO = "auto"            # Пул потоков, если интерпретатор работает без GIL, иначе пул процессов
+SUPPORTED_BATCH_POOLS = frozenset([BATCH_POOL_PROCESS, BATCH_POOL_THREAD, BATCH_POOL_AUTO])
+
+# Способы расстановки переносов (Hyphenator)
+HYPHENATION_ENGINE_RULES = "rules"          # Встроенные эвристические правила (по умолчанию)
+HYPHENATION_ENGINE_PATTERNS = "patterns"    # Шаблоны Кнута -- Ляна из файлов в формате TeX (hyph-utf8)
+SUPPORTED_HYPHENATION_ENGINES = frozenset([HYPHENATION_ENGINE_RULES, HYPHENATION_ENGINE_PATTERNS])
+
+# Выбор точек переноса в слове (Hyphenator)
+HYPHENATION_BREAKPOINTS_OPTIMAL = "optimal"  # Лучший набор точек для всего слова сразу (по умолчанию)
+HYPHENATION_BREAKPOINTS_HALVING = "halving"  # Рекурсивное половинное деление (как в прежних версиях)
+SUPPORTED_HYPHENATION_BREAKPOINTS = frozenset([HYPHENATION_BREAKPOINTS_OPTIMAL, HYPHENATION_BREAKPOINTS_HALVING])
+
 # === ИСТОЧНИК ПРАВДЫ ===
 # --- Базовые алфавиты: Эти константы используются как для правил переноса, так и для правил кодирования ---
 
@@ -567,14 +588,21 @@ CUSTOM_ENCODE_MAP = {
     '\u2118': '&wp;',           # ℘ / &wp; / &weierp;
 }
 
-# === Динамическая генерация карт преобразования ===
+# === Генерация карты кодирования ===
+# Карта строится по html.entities заранее и хранится в модуле `encode_map.py`, чтобы при импорте не перебирать
+# таблицы мнемоник. После изменения правил кодирования (CUSTOM_ENCODE_MAP, NEVER_ENCODE_CHARS и т.д.) нужно
+# увеличить ENCODE_MAP_VERSION и пересобрать модуль:
+# `python -c "from etpgrf.config import write_encode_map; write_encode_map()"`.
+ENCODE_MAP_VERSION = 1
+
 
 def _build_translation_maps() -> dict[str, str]:
     """
-    Создает карту для кодирования на лету, используя все доступные источники
+    Создает карту для кодирования, используя все доступные источники
     из html.entities и строгий порядок приоритетов для обеспечения
     предсказуемого и детерминированного результата.
     """
+    from html import entities
     # ШАГ 1: Создаем ЕДИНУЮ и ПОЛНУЮ карту {каноническое_имя: числовой_код}.
     # Это решает проблему разных форматов и дубликатов с точкой с запятой.
     unified_name2codepoint = {}
@@ -622,8 +650,39 @@ def _build_translation_maps() -> dict[str, str]:
     return encode_map
 
 
-# Создаем карту один раз при импорте модуля.
-ENCODE_MAP = _build_translation_maps()
+def render_encode_map() -> str:
+    """
+    Возвращает исходный текст модуля `encode_map.py` с заранее построенной картой кодирования.
+    """
+    def literal(char: str) -> str:
+        if ' ' < char < '\x7f' and char not in '\'\\':
+            return f"'{char}'"
+        code = ord(char)
+        return f"'\\u{code:04x}'" if code <= 0xffff else f"'\\U{code:08x}'"
+
+    lines = [
+        '# etpgrf/encode_map.py',
+        '# Карта кодирования Unicode -> HTML-мнемоники, построенная заранее (см. `config._build_translation_maps`).',
+        '# Модуль сгенерирован функцией `config.write_encode_map()`, вручную не редактируется.',
+        '',
+        f'ENCODE_MAP_VERSION = {ENCODE_MAP_VERSION}',
+        '',
+        'ENCODE_MAP = {',
+    ]
+    for char, mnemonic in sorted(_build_translation_maps().items()):
+        lines.append(f"    {literal(char)}: '{mnemonic}',")
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_encode_map() -> None:
+    """
+    Пересобирает модуль `encode_map.py` (после изменения правил кодирования).
+    """
+    import os
+    with open(os.path.join(os.path.dirname(__file__), 'encode_map.py'), 'w', encoding='utf-8') as file:
+        file.write(render_encode_map())
+
 
 # --- Публичный API модуля ---
 def get_encode_map():
@@ -685,6 +744,18 @@ ABBR_COMMON_PREPOSITION = [
 # === КОНСТАНТЫ ДЛЯ HTML-ТЕГОВ, ВНУТРИ КОТОРЫХ НЕ НАДО ТИПОГРАФИРОВАТЬ ===
 PROTECTED_HTML_TAGS = ['style', 'script', 'pre', 'code', 'kbd', 'samp', 'math']
 
+# Блочные элементы HTML (границы, через которые не работают правила с контекстом в потоковом разборе HTML,
+# и границы блоков при инкрементальной обработке)
+BLOCK_HTML_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul',
+})
+# Элементы HTML без закрывающего тега
+VOID_HTML_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+})
+
 # === КОНСТАНТЫ ДЛЯ ВИСЯЧЕЙ ТИПОГРАФИКИ ===
 
 # 1. Набор символов, которые могут "висеть" слева
@@ -719,4 +790,5 @@ HANGING_PUNCTUATION_CLASSES = {
     '.': 'etp-r-dot',
     ',': 'etp-r-comma',
     ':': 'etp-r-colon',
-}
\ No newline at end of file
+}
+
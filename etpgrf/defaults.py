@@ -1,6 +1,7 @@
 # etpgrf/defaults.py -- Настройки по умолчанию для типографа etpgrf
 import logging
-from etpgrf.config import LANG_RU, MODE_MIXED
+from etpgrf.config import (LANG_RU, MODE_MIXED, HTML_BACKEND_SOUP, BATCH_POOL_AUTO, HYPHENATION_ENGINE_RULES,
+                           HYPHENATION_BREAKPOINTS_OPTIMAL)
 
 class LoggingDefaults:
     LEVEL = logging.NOTSET
@@ -15,6 +16,62 @@ class HyphenationDefaults:
     """
     MAX_UNHYPHENATED_LEN: int = 12
     MIN_TAIL_LEN: int = 5           # Это значение должно быть >= 2 (чтоб не "вылетать" за индекс в английских словах)
+    CACHE_SIZE: int = 0             # Сколько слов запоминать в кэше переносов Hyphenator (0 -- кэш выключен)
+    CACHE_MAX_WORD_LEN: int = 64    # Слова длиннее стольких символов в кэш переносов не попадают
+    DICTIONARY_MAX_WORD_LEN: int = 100  # Слова длиннее стольких символов в словарь переносов не записываются
+    ENGINE: str = HYPHENATION_ENGINE_RULES  # Способ расстановки переносов: 'rules' или 'patterns'
+    PATTERNS: dict[str, str] = {}   # Файлы шаблонов переносов для способа 'patterns': {язык: путь к файлу}
+    BREAKPOINTS: str = HYPHENATION_BREAKPOINTS_OPTIMAL  # Выбор точек переноса: 'optimal' или 'halving'
+
+
+class BatchDefaults:
+    """
+    Настройки по умолчанию для пакетной обработки (Typographer.process_many).
+    """
+    POOL: str = BATCH_POOL_AUTO     # Пул: 'process', 'thread' или 'auto' (потоки, если интерпретатор без GIL)
+    WORKERS: int | None = None      # Число процессов (потоков) пула (None -- по числу ядер процессора)
+    CHUNKSIZE: int = 64             # Максимальное число документов в одной пачке для процесса пула
+    CHUNK_CHARS: int = 256_000      # Максимальный суммарный размер пачки в символах. Документ такого размера и
+                                    # больше отправляется в пул отдельно, чтобы не задерживать пачку мелких.
+
+
+class StreamDefaults:
+    """
+    Настройки по умолчанию для потоковой обработки (Typographer.process_stream).
+    """
+    CHUNK_SIZE: int = 64 * 1024     # Желаемый размер обрабатываемого фрагмента в символах
+    MAX_BUFFER_CHUNKS: int = 16     # Предел буфера в фрагментах: если абзацного разрыва нет дольше, текст режется
+                                    # по пробелу (см. `etpgrf.streaming.find_fallback_cut`)
+
+
+class AsyncDefaults:
+    """
+    Настройки по умолчанию для асинхронного API (Typographer.aprocess, Typographer.aprocess_many).
+    """
+    INLINE_MAX_LEN: int = 4096      # Тексты короче этого обрабатываются прямо в цикле событий, без перехода в пул
+    MAX_IN_FLIGHT: int = 16         # Максимальное число документов, одновременно находящихся в обработке
+
+
+class CacheDefaults:
+    """
+    Настройки по умолчанию для кэша результатов (ResultCache).
+    """
+    MAX_ENTRIES: int = 10_000       # Максимальное число записей в кэше
+    MAX_BYTES: int = 64 * 1024 * 1024   # Максимальный суммарный объем результатов в кэше (в байтах)
+    # Персистентный кэш (SQLiteResultCache)
+    SQLITE_MAX_BYTES: int = 512 * 1024 * 1024   # Максимальный суммарный объем результатов в базе (в байтах)
+    SQLITE_TIMEOUT: float = 5.0     # Сколько секунд ждать, если база заблокирована другим процессом
+    SQLITE_EVICT_EVERY: int = 64    # Проверять объем базы и вытеснять записи раз в столько записей
+    SQLITE_ATIME_RESOLUTION: float = 60.0   # Обновлять время использования записи не чаще, чем раз в столько секунд
+
+
+class SlowLogDefaults:
+    """
+    Настройки по умолчанию для записи медленных документов (SlowDocumentRecorder).
+    """
+    THRESHOLD: float = 1.0          # Документы, обработка которых длилась дольше стольких секунд, записываются
+    MAX_DOCUMENTS: int = 100        # Сколько документов хранить в каталоге (самые старые удаляются)
+    MAX_DOCUMENT_CHARS: int = 10_000_000    # Документы длиннее стольких символов не записываются
 
 
 class EtpgrfDefaultSettings:
@@ -24,9 +81,15 @@ class EtpgrfDefaultSettings:
     def __init__(self):
         self.LANGS: list[str] | str = LANG_RU
         self.MODE: str = MODE_MIXED
+        self.HTML_BACKEND: str = HTML_BACKEND_SOUP    # Способ разбора HTML ('soup' или 'stream')
         # self.PROCESS_HTML: bool = False   # Флаг обработки HTML-тегов
         self.logging_settings = LoggingDefaults()
         self.hyphenation = HyphenationDefaults()
+        self.batch = BatchDefaults()
+        self.stream = StreamDefaults()
+        self.aio = AsyncDefaults()
+        self.cache = CacheDefaults()
+        self.slowlog = SlowLogDefaults()
         # self.quotes = EtpgrfQuoteDefaults()
 
 etpgrf_settings = EtpgrfDefaultSettings()
\ No newline at end of file
@@ -2,13 +2,17 @@
 # Модуль для расстановки висячей пунктуации.
 
 import logging
-from bs4 import BeautifulSoup, NavigableString, Tag
+from typing import TYPE_CHECKING
+from .comutil import collect_text_nodes, replace_text_nodes
 from .config import (
     HANGING_PUNCTUATION_LEFT_CHARS,
     HANGING_PUNCTUATION_RIGHT_CHARS,
     HANGING_PUNCTUATION_CLASSES
 )
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,72 +58,62 @@ class HangingPunctuationProcessor:
 
         logger.debug(f"HangingPunctuationProcessor initialized. Mode: {mode}, Active chars count: {len(self.active_chars)}")
 
-    def process(self, soup: BeautifulSoup) -> BeautifulSoup:
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        if self.target_tags is not None:
+            return {'mode': sorted(self.target_tags)}
+        return {'mode': self.mode}
+
+    def process(self, soup: 'BeautifulSoup') -> 'BeautifulSoup':
         """
         Проходит по дереву soup и оборачивает висячие символы в span.
         """
         if not self.active_chars:
             return soup
 
-        # Если задан список целевых тегов, обрабатываем только их содержимое
-        if self.target_tags:
-            # Находим все теги из списка
-            # Используем select для поиска (например: "p, blockquote, h1")
-            selector = ", ".join(self.target_tags)
-            roots = soup.select(selector)
-        else:
-            # Иначе обрабатываем весь документ (начиная с корня)
-            roots = [soup]
-
-        for root in roots:
-            self._process_node_recursive(root, soup)
+        # Если задан список целевых тегов, обрабатываем только их содержимое (на любой глубине),
+        # иначе -- весь документ. Обход итеративный, каждый узел обрабатывается один раз.
+        replacements = []
+        for text_node, parent, index, in_target, _ in collect_text_nodes(soup, target_tags=self.target_tags or None):
+            if in_target:
+                new_nodes = self.split_text(str(text_node), soup)
+                if new_nodes is not None:
+                    replacements.append((text_node, parent, index, new_nodes))
+        replace_text_nodes(replacements)
 
         return soup
 
-    def _process_node_recursive(self, node, soup):
-        """
-        Рекурсивно обходит узлы. Если находит NavigableString с нужными символами,
-        разбивает его и вставляет span'ы.
+    def hang_segments(self, text: str) -> list[tuple[str, str | None]] | None:
         """
-        # Работаем с копией списка детей, так как будем менять структуру дерева на лету
-        # (replace_with меняет дерево)
-        if hasattr(node, 'children'):
-            for child in list(node.children):
-                if isinstance(child, NavigableString):
-                    self._process_text_node(child, soup)
-                elif isinstance(child, Tag):
-                    # Не заходим внутрь тегов, которые мы сами же и создали (или аналогичных),
-                    # чтобы избежать рекурсивного ада, хотя классы у нас специфичные.
-                    self._process_node_recursive(child, soup)
-
-    def _process_text_node(self, text_node: NavigableString, soup: BeautifulSoup):
-        """
-        Анализирует текстовый узел. Если в нем есть символы для висячей пунктуации,
-        заменяет узел на фрагмент (список узлов), где эти символы обернуты в span.
+        Анализирует текст узла и режет его на части: обычный текст и висячие символы (в подходящем контексте).
+
+        :param text: Текст узла.
+        :return: Список пар (фрагмент, css-класс или None для обычного текста) или None, если висячих символов
+                 в тексте нет.
         """
-        text = str(text_node)
-        
         # Быстрая проверка: если в тексте вообще нет ни одного нашего символа, выходим
-        if not any(char in text for char in self.active_chars):
-            return
+        if self.active_chars.isdisjoint(text):
+            return None
 
         # Если символы есть, нам нужно "разобрать" строку.
-        new_nodes = []
-        current_text_buffer = ""
+        segments = []
+        buffer_start = 0
         text_len = len(text)
 
         for i, char in enumerate(text):
             if char in self.char_to_class:
                 should_hang = False
-                
+
                 # Проверяем контекст (пробелы или другие висячие символы вокруг)
                 if char in HANGING_PUNCTUATION_LEFT_CHARS:
                     # Левая пунктуация:
                     # 1. Начало узла
                     # 2. Перед ней пробел
                     # 3. Перед ней другой левый висячий символ (например, "((text")
-                    if (i == 0 or 
-                        text[i-1].isspace() or 
+                    if (i == 0 or
+                        text[i-1].isspace() or
                         text[i-1] in HANGING_PUNCTUATION_LEFT_CHARS):
                         should_hang = True
                 elif char in HANGING_PUNCTUATION_RIGHT_CHARS:
@@ -127,40 +121,48 @@ class HangingPunctuationProcessor:
                     # 1. Конец узла
                     # 2. После нее пробел
                     # 3. После нее другой правый висячий символ (например, "text.»")
-                    if (i == text_len - 1 or 
-                        text[i+1].isspace() or 
+                    if (i == text_len - 1 or
+                        text[i+1].isspace() or
                         text[i+1] in HANGING_PUNCTUATION_RIGHT_CHARS):
                         should_hang = True
-                
+
                 if should_hang:
-                    # 1. Сбрасываем накопленный буфер текста (если есть)
-                    if current_text_buffer:
-                        new_nodes.append(NavigableString(current_text_buffer))
-                        current_text_buffer = ""
-                    
-                    # 2. Создаем span для висячего символа
-                    span = soup.new_tag("span")
-                    span['class'] = self.char_to_class[char]
-                    span.string = char
-                    new_nodes.append(span)
-                else:
-                    # Если контекст не подходит, оставляем символ как обычный текст
-                    current_text_buffer += char
+                    # Сбрасываем накопленный текст (если есть) и добавляем висячий символ
+                    if buffer_start < i:
+                        segments.append((text[buffer_start:i], None))
+                    segments.append((char, self.char_to_class[char]))
+                    buffer_start = i + 1
+
+        if not segments:
+            # Ни один символ не "повис"
+            return None
+        # Добавляем остаток текста
+        if buffer_start < text_len:
+            segments.append((text[buffer_start:], None))
+        return segments
+
+    def split_text(self, text: str, soup: 'BeautifulSoup', make_string=None) -> list | None:
+        """
+        Анализирует текст узла. Если в нем есть символы для висячей пунктуации (в подходящем контексте),
+        возвращает фрагмент (список узлов), где эти символы обернуты в span.
+
+        :param text: Текст узла.
+        :param soup: Документ (нужен для создания тегов).
+        :param make_string: Фабрика текстовых узлов (None -- обычный `NavigableString`).
+        :return: Список новых узлов или None, если висячих символов в тексте нет.
+        """
+        segments = self.hang_segments(text)
+        if segments is None:
+            return None
+        if make_string is None:
+            from bs4 import NavigableString as make_string
+        new_nodes = []
+        for fragment, css_class in segments:
+            if css_class is None:
+                new_nodes.append(make_string(fragment))
             else:
-                # Просто накапливаем символ
-                current_text_buffer += char
-
-        # Добавляем остаток буфера
-        if current_text_buffer:
-            new_nodes.append(NavigableString(current_text_buffer))
-
-        # Заменяем исходный текстовый узел на набор новых узлов.
-        if new_nodes:
-            first_node = new_nodes[0]
-            text_node.replace_with(first_node)
-            
-            # Остальные вставляем последовательно после первого
-            current_pos = first_node
-            for next_node in new_nodes[1:]:
-                current_pos.insert_after(next_node)
-                current_pos = next_node
+                span = soup.new_tag("span")
+                span['class'] = css_class
+                span.append(make_string(fragment))
+                new_nodes.append(span)
+        return new_nodes
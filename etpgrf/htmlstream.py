@@ -0,0 +1,248 @@
+# etpgrf/htmlstream.py
+# Потоковая обработка HTML без построения дерева BeautifulSoup.
+# HTML разбирается инкрементальным токенизатором (стандартный `html.parser`). Теги, комментарии и прочая разметка
+# выводятся как есть, а буферизуется только текст текущего блока (между блочными тегами): правилам с контекстом
+# (кавычки, неразрывные пробелы) нужен текст соседних строчных элементов, но не соседних блоков. Поэтому память
+# пропорциональна самому большому блоку, а не всему документу, а результат выдается частями по мере чтения.
+
+import html
+import logging
+from html.parser import HTMLParser
+from collections.abc import Iterable, Iterator
+from typing import IO
+from etpgrf.config import BLOCK_HTML_TAGS, VOID_HTML_TAGS, PROTECTED_HTML_TAGS
+from etpgrf.defaults import etpgrf_settings
+from etpgrf.codec import escape_html_text
+from etpgrf.streaming import _iter_source
+from etpgrf.stats import StageTimer, STAGE_PARSE, STAGE_HANGING, STAGE_SERIALIZE
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Виды событий токенизатора
+_TEXT = 'text'              # Текст в исходном виде (мнемоники не декодированы)
+_CHARREF = 'charref'        # Мнемоника или числовая ссылка на символ в исходном виде ("&nbsp;", "&#160;", "&copy")
+_RAW_TEXT = 'raw'           # Содержимое <script> и <style> (как есть, без декодирования)
+_START = 'start'            # Открывающий тег
+_END = 'end'                # Закрывающий тег
+_MARKUP = 'markup'          # Прочая разметка: самозакрывающиеся теги, комментарии, doctype и т.п.
+
+
+class _HtmlTokenizer(HTMLParser):
+    """
+    Инкрементальный токенизатор HTML: копит события разбора в список `events` в виде кортежей
+    (вид события, имя тега или None, исходный текст разметки или текст).
+
+    Мнемоники не декодируются: внутри защищенных тегов (<code>, <pre> и т.п.) текст выводится в исходном виде,
+    а декодирует остальной текст `HtmlStreamProcessor`.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.events: list[tuple[str, str | None, str]] = []
+        self._charref_pending = False
+
+    def handle_starttag(self, tag, attrs):
+        self.events.append((_START, tag, self.get_starttag_text()))
+
+    def handle_startendtag(self, tag, attrs):
+        self.events.append((_MARKUP, tag, self.get_starttag_text()))
+
+    def handle_endtag(self, tag):
+        # Исходный текст тега становится известен только в `parse_endtag` (см. ниже)
+        self.events.append((_END, tag, f'</{tag}>'))
+
+    def parse_endtag(self, i):
+        events_before = len(self.events)
+        end = super().parse_endtag(i)
+        if end > i and len(self.events) == events_before + 1 and self.events[-1][0] == _END:
+            # Сохраняем закрывающий тег в исходном виде (с регистром и пробелами как в документе)
+            self.events[-1] = (_END, self.events[-1][1], self.rawdata[i:end])
+        return end
+
+    def handle_data(self, data):
+        if self.cdata_elem is not None and not getattr(self, '_escapable', False):
+            self.events.append((_RAW_TEXT, None, data))
+        else:
+            self.events.append((_TEXT, None, data))
+
+    def handle_entityref(self, name):
+        self._charref_pending = True
+
+    def handle_charref(self, name):
+        self._charref_pending = True
+
+    def updatepos(self, i, j):
+        if self._charref_pending:
+            # Границы мнемоники (с ";" или без) известны только здесь: `goahead` сдвигает позицию сразу после
+            # вызова `handle_entityref` или `handle_charref`
+            self._charref_pending = False
+            self.events.append((_CHARREF, None, self.rawdata[i:j]))
+        return super().updatepos(i, j)
+
+    def handle_comment(self, data):
+        self.events.append((_MARKUP, None, f'<!--{data}-->'))
+
+    def handle_decl(self, decl):
+        self.events.append((_MARKUP, None, f'<!{decl}>'))
+
+    def unknown_decl(self, data):
+        self.events.append((_MARKUP, None, f'<![{data}]>'))
+
+    def handle_pi(self, data):
+        self.events.append((_MARKUP, None, f'<?{data}>'))
+
+
+class _TextRun:
+    """Текст между тегами в буфере блока (может приходить от токенизатора по частям)."""
+    __slots__ = ('parts', 'in_target')
+
+    def __init__(self, text: str, in_target: bool):
+        self.parts = [text]
+        self.in_target = in_target
+
+
+class HtmlStreamProcessor:
+    """
+    Потоковый обработчик HTML для типографа. Получает события токенизатора, копит текст текущего блока
+    и на границе блока отдает готовый HTML этого блока.
+    """
+
+    def __init__(self, typographer, timer: StageTimer | None = None):
+        """
+        :param typographer: Типограф (Typographer), правила которого применяются к тексту.
+        :param timer: Замер этапов обработки (None -- без замера).
+        """
+        self.typographer = typographer
+        self.timer = timer
+        hanging = typographer.hanging
+        # Теги, внутри которых расставляется висячая пунктуация (None -- во всем документе)
+        self.target_tags = (hanging.target_tags or None) if hanging else None
+        self._open_tags: dict[str, int] = {}    # Сколько раз открыт каждый защищенный или целевой тег
+        self._protected_depth = 0
+        self._target_depth = 0
+        self._block: list[str | _TextRun] = []  # Буфер текущего блока: разметка и текст
+
+    def _in_target(self) -> bool:
+        return self.target_tags is None or self._target_depth > 0
+
+    def feed_events(self, events: list[tuple[str, str | None, str]]) -> str:
+        """
+        Обрабатывает события токенизатора.
+
+        :param events: События (см. `_HtmlTokenizer`).
+        :return: Готовый HTML для завершенных блоков (может быть пустым).
+        """
+        output = []
+        for kind, tag, data in events:
+            if kind == _TEXT or kind == _CHARREF:
+                if self._protected_depth:
+                    # Содержимое защищенных тегов не обрабатывается и выводится в исходном виде
+                    self._block.append(data)
+                    continue
+                data = html.unescape(data)
+                if (self._block and isinstance(self._block[-1], _TextRun)
+                        and self._block[-1].in_target == self._in_target()):
+                    self._block[-1].parts.append(data)
+                else:
+                    self._block.append(_TextRun(data, self._in_target()))
+                continue
+            self._block.append(data)
+            if kind == _START and tag not in VOID_HTML_TAGS:
+                self._open_tag(tag)
+            elif kind == _END:
+                self._close_tag(tag)
+            if tag in BLOCK_HTML_TAGS:
+                output.append(self.flush())
+        return ''.join(output)
+
+    def _open_tag(self, tag: str) -> None:
+        protected = tag in PROTECTED_HTML_TAGS
+        target = self.target_tags is not None and tag in self.target_tags
+        if protected or target:
+            self._open_tags[tag] = self._open_tags.get(tag, 0) + 1
+            self._protected_depth += protected
+            self._target_depth += target
+
+    def _close_tag(self, tag: str) -> None:
+        if self._open_tags.get(tag):
+            # Непарные закрывающие теги игнорируются
+            self._open_tags[tag] -= 1
+            self._protected_depth -= tag in PROTECTED_HTML_TAGS
+            self._target_depth -= self.target_tags is not None and tag in self.target_tags
+
+    def flush(self) -> str:
+        """
+        Обрабатывает текст накопленного блока и возвращает готовый HTML блока.
+        """
+        block = self._block
+        self._block = []
+        runs = [item for item in block if isinstance(item, _TextRun)]
+        if not runs:
+            return ''.join(block)
+        typographer = self.typographer
+        texts = [''.join(run.parts) for run in runs]
+
+        # Все правила проходят один раз по тексту блока, результат раскладывается по фрагментам (как в бэкенде
+        # BeautifulSoup, где блок -- часть "супер-строки" документа)
+        timer = self.timer
+        new_texts = typographer._process_text_runs(texts, timer=timer)
+        all_segments = [typographer.hanging.hang_segments(new_text) if typographer.hanging and run.in_target
+                        else None for run, new_text in zip(runs, new_texts)]
+        if timer is not None and typographer.hanging:
+            timer.lap(STAGE_HANGING)
+        mode = typographer.mode
+        rendered = {}
+        for run, new_text, segments in zip(runs, new_texts, all_segments):
+            if segments is None:
+                rendered[id(run)] = escape_html_text(new_text, mode)
+            else:
+                rendered[id(run)] = ''.join(
+                    escape_html_text(fragment, mode) if css_class is None
+                    else f'<span class="{css_class}">{escape_html_text(fragment, mode)}</span>'
+                    for fragment, css_class in segments)
+        result = ''.join(rendered[id(item)] if isinstance(item, _TextRun) else item for item in block)
+        if timer is not None:
+            timer.lap(STAGE_SERIALIZE)
+        return result
+
+
+def iter_process_html(typographer,
+                      source: str | IO[str] | Iterable[str],
+                      read_size: int | None = None,
+                      timer: StageTimer | None = None) -> Iterator[str]:
+    """
+    Потоковая обработка HTML без построения дерева.
+
+    :param typographer: Типограф (Typographer).
+    :param source: Источник: файлоподобный объект с методом `read()`, итератор фрагментов HTML или строка.
+    :param read_size: Сколько символов читать из файлоподобного объекта за раз.
+    :param timer: Замер этапов обработки (None -- без замера). Время между выдачей фрагментов в него не входит,
+                  а длина прочитанного HTML добавляется к `timer.chars_in`.
+    :return: Генератор фрагментов готового HTML.
+    """
+    if read_size is None:
+        read_size = etpgrf_settings.stream.CHUNK_SIZE
+    if read_size < 1:
+        raise ValueError(f"etpgrf: размер фрагмента (chunk_size) должен быть >= 1, а не {read_size}")
+    tokenizer = _HtmlTokenizer()
+    processor = HtmlStreamProcessor(typographer, timer)
+    if timer is not None:
+        timer.mark()
+    for piece in _iter_source(source, read_size):
+        tokenizer.feed(piece)
+        events, tokenizer.events = tokenizer.events, []
+        if timer is not None:
+            timer.chars_in += len(piece)
+            timer.lap(STAGE_PARSE)
+        output = processor.feed_events(events)
+        if output:
+            yield output
+            if timer is not None:
+                timer.mark()
+    tokenizer.close()
+    if timer is not None:
+        timer.lap(STAGE_PARSE)
+    output = processor.feed_events(tokenizer.events) + processor.flush()
+    if output:
+        yield output
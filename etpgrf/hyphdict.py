@@ -0,0 +1,261 @@
+# etpgrf/hyphdict.py
+# Предвычисленный словарь переносов. Каждый рабочий процесс (например, gunicorn) заново находит одни и те же
+# переносы в `Hyphenator.hyp_in_word`, а кэши в памяти процессов дублируют друг друга. Словарь строится один раз
+# по списку слов или корпусу текстов и сохраняется в компактный двоичный файл только для чтения: слово -> позиции
+# переносов. Hyphenator открывает файл через `mmap`, поэтому все процессы используют одну копию в страничном кэше
+# ОС, а поиск слова -- хэш-таблица в файле, без расчета переносов по правилам:
+#
+#     python -m etpgrf.hyphdict ru.hyph corpus1.txt corpus2.txt --langs ru
+#     python -m etpgrf.hyphdict ru.hyph corpus.txt --langs ru --engine patterns --patterns ru=hyph-ru.tex
+#     typo = Typographer(langs='ru', hyphenation=Hyphenator(langs='ru', dictionary='ru.hyph'))
+#
+# Формат файла (все числа little-endian):
+#     заголовок: сигнатура (8 байт), версия формата (u16), резерв (u16), число слов (u32), размер хэш-таблицы (u32),
+#                длина конфигурации (u32);
+#     конфигурация Hyphenator и версия etpgrf (JSON, UTF-8), выравнивание до 4 байт;
+#     хэш-таблица: смещение записи + 1 (u32, 0 -- пустая ячейка), открытая адресация по crc32 слова;
+#     записи, отсортированные по байтам слова: длина слова (u8), слово (UTF-8), число переносов (u8),
+#     позиции переносов (u8 каждая: перенос стоит перед символом слова с этим индексом).
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+from etpgrf.defaults import etpgrf_settings
+
+if TYPE_CHECKING:
+    from etpgrf.hyphenation import Hyphenator
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'ETPHYPH\0'
+DICTIONARY_FORMAT = 1
+_HEADER = struct.Struct('<8sHHIII')
+_OFFSET = struct.Struct('<I')
+_MAX_WORD_BYTES = 255       # Длина слова в записи -- один байт
+_MAX_WORD_LEN = 255         # Позиция переноса в записи -- один байт
+
+
+def _comparable_config(config: dict) -> dict:
+    # Порядок языков в конфигурации зависит от порядка обхода frozenset, он не важен. Файлы шаблонов сравниваются
+    # по содержимому (`patterns_digest`), а не по пути: словарь остается годным, если файлы перенесены
+    return {**config, 'langs': sorted(config['langs']), 'patterns': sorted(config.get('patterns', ())),
+            'patterns_digest': config.get('patterns_digest') or {}}
+
+
+def _table_size(count: int) -> int:
+    # Заполненность хэш-таблицы не больше половины: в среднем поиск укладывается в одну-две пробы
+    size = 8
+    while size < 2 * count:
+        size *= 2
+    return size
+
+
+def build_dictionary(hyphenator: 'Hyphenator',
+                     words: Iterable[str],
+                     path: str | os.PathLike,
+                     max_word_len: int | None = None) -> int:
+    """
+    Расставляет переносы в словах и записывает словарь переносов.
+
+    :param hyphenator: Hyphenator, конфигурация которого записывается в словарь.
+    :param words: Слова (повторы допустимы). Слова не длиннее `max_unhyphenated_len` Hyphenator'а пропускаются:
+                  переносы в них не ставятся никогда.
+    :param path: Путь к файлу словаря (файл записывается атомарно).
+    :param max_word_len: Слова длиннее пропускаются (None -- `etpgrf_settings.hyphenation.DICTIONARY_MAX_WORD_LEN`).
+    :return: Число слов в словаре.
+    """
+    max_word_len = etpgrf_settings.hyphenation.DICTIONARY_MAX_WORD_LEN if max_word_len is None else max_word_len
+    if not 0 < max_word_len <= _MAX_WORD_LEN:
+        raise ValueError(f"etpgrf: max_word_len словаря переносов должен быть от 1 до {_MAX_WORD_LEN}, "
+                         f"а не {max_word_len}")
+    entries = {}
+    for word in words:
+        if hyphenator.max_unhyphenated_len < len(word) <= max_word_len and word not in entries:
+            key = word.encode('utf-8', 'surrogatepass')
+            if len(key) > _MAX_WORD_BYTES:
+                continue
+            entries[word] = (key, bytes(hyphenator._break_points(word)))
+
+    from etpgrf import __version__
+    config = json.dumps({'hyphenator': _comparable_config(hyphenator.get_config()), 'etpgrf_version': __version__},
+                        sort_keys=True, ensure_ascii=False).encode('utf-8')
+    config += b'\0' * (-(_HEADER.size + len(config)) % 4)
+    table_size = _table_size(len(entries))
+    table = [0] * table_size
+    records = bytearray()
+    for key, positions in sorted(entries.values()):
+        slot = zlib.crc32(key) % table_size
+        while table[slot]:
+            slot = (slot + 1) % table_size
+        table[slot] = len(records) + 1
+        records += bytes((len(key),)) + key + bytes((len(positions),)) + positions
+
+    path = os.fspath(path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, DICTIONARY_FORMAT, 0, len(entries), table_size, len(config)))
+        file.write(config)
+        file.write(struct.pack(f'<{table_size}I', *table))
+        file.write(records)
+    os.replace(temp_path, path)
+    logger.debug(f"build_dictionary: {len(entries)} words written to {path}")
+    return len(entries)
+
+
+class HyphenationDictionary:
+    """
+    Словарь переносов, открытый через `mmap` (только чтение). Потокобезопасен: поиск только читает файл.
+    При передаче в другой процесс (pickle) передается путь, и процесс открывает файл сам.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        :param path: Путь к файлу словаря (см. `build_dictionary`).
+        """
+        self.path = os.fspath(path)
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, 'rb') as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:     # Пустой файл
+                raise ValueError(f"etpgrf: файл не является словарем переносов: {self.path}") from None
+        try:
+            magic, version, _, count, table_size, config_len = _HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = version = None
+        if magic != _MAGIC or version != DICTIONARY_FORMAT:
+            self._mmap.close()
+            raise ValueError(f"etpgrf: файл не является словарем переносов формата {DICTIONARY_FORMAT}: {self.path}")
+        self._count = count
+        self._table_size = table_size
+        self._table_start = _HEADER.size + config_len
+        self._records_start = self._table_start + 4 * table_size - 1     # Смещения в таблице -- от единицы
+        meta = json.loads(self._mmap[_HEADER.size:self._table_start].rstrip(b'\0').decode('utf-8'))
+        self.config: dict = meta['hyphenator']
+        self.etpgrf_version: str = meta['etpgrf_version']
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.path = state['path']
+        self._open()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'HyphenationDictionary':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрывает файл словаря."""
+        self._mmap.close()
+
+    def check_config(self, hyphenator: 'Hyphenator') -> None:
+        """
+        Проверяет, что словарь построен для той же конфигурации, что и у Hyphenator.
+
+        :raises ValueError: Если конфигурации различаются (переносы из словаря отличались бы от правил).
+        """
+        if _comparable_config(self.config) != _comparable_config(hyphenator.get_config()):
+            raise ValueError(f"etpgrf: словарь переносов {self.path} построен для другой конфигурации Hyphenator: "
+                             f"{self.config}")
+        from etpgrf import __version__
+        if self.etpgrf_version != __version__:
+            logger.warning(f"HyphenationDictionary: словарь {self.path} построен etpgrf {self.etpgrf_version}, "
+                           f"а используется {__version__}: правила переносов могли измениться")
+
+    def lookup(self, word: str) -> int | None:
+        """
+        Ищет слово в словаре.
+
+        :return: Позиции переносов в виде битовой маски (бит i -- перенос перед `word[i]`) или None, если слова
+                 в словаре нет.
+        """
+        key = word.encode('utf-8', 'surrogatepass')
+        if len(key) > _MAX_WORD_BYTES or not self._count:
+            return None
+        data = self._mmap
+        table_start = self._table_start
+        table_size = self._table_size
+        slot = zlib.crc32(key) % table_size
+        while True:
+            offset = _OFFSET.unpack_from(data, table_start + 4 * slot)[0]
+            if not offset:
+                return None
+            offset += self._records_start
+            key_end = offset + 1 + data[offset]
+            if data[offset + 1:key_end] == key:
+                mask = 0
+                for index in data[key_end + 1:key_end + 1 + data[key_end]]:
+                    mask |= 1 << index
+                return mask
+            slot = (slot + 1) % table_size
+
+
+def iter_words(texts: Iterable[str]) -> Iterable[str]:
+    """
+    Слова текстов (последовательности букв): корпус или список слов, по одному в строке.
+    """
+    import regex
+    pattern = regex.compile(r'\p{L}+')
+    for text in texts:
+        for match in pattern.finditer(text):
+            yield match.group()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Построение словаря переносов etpgrf по корпусу или списку слов")
+    parser.add_argument('output', help="Файл словаря")
+    parser.add_argument('inputs', nargs='*', help="Тексты или списки слов в UTF-8 (по умолчанию -- stdin)")
+    parser.add_argument('--langs', default=None, help="Языки Hyphenator, например ru+en")
+    parser.add_argument('--max-unhyphenated-len', type=int, default=None)
+    parser.add_argument('--min-tail-len', type=int, default=None)
+    parser.add_argument('--breakpoints', default=None, help="Выбор точек переноса: optimal или halving")
+    parser.add_argument('--engine', default=None, help="Способ расстановки переносов: rules или patterns")
+    parser.add_argument('--patterns', action='append', default=[], metavar='LANG=PATH',
+                        help="Файл шаблонов переносов для языка (для --engine patterns), можно повторять")
+    parser.add_argument('--min-count', type=int, default=1,
+                        help="Записывать только слова, которые встретились не меньше стольких раз (по умолчанию 1)")
+    parser.add_argument('--max-word-len', type=int, default=None, help="Слова длиннее не записываются")
+    args = parser.parse_args(argv)
+    patterns = {}
+    for item in args.patterns:
+        lang, sep, path = item.partition('=')
+        if not sep or not lang or not path:
+            parser.error(f"--patterns ожидает LANG=PATH, а не {item!r}")
+        patterns[lang] = path
+
+    from etpgrf.hyphenation import Hyphenator
+    hyphenator = Hyphenator(langs=args.langs, max_unhyphenated_len=args.max_unhyphenated_len,
+                            min_tail_len=args.min_tail_len, breakpoints=args.breakpoints, engine=args.engine,
+                            patterns=patterns or None)
+    counts = Counter()
+    if args.inputs:
+        for name in args.inputs:
+            with open(name, encoding='utf-8') as file:
+                counts.update(iter_words(file))
+    else:
+        counts.update(iter_words(sys.stdin))
+    words = [word for word, count in counts.items() if count >= args.min_count]
+    written = build_dictionary(hyphenator, words, args.output, max_word_len=args.max_word_len)
+    print(f"Слов в словаре: {written}, размер файла: {os.path.getsize(args.output)} байт")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,17 +3,32 @@
 # Тем более что пользователь может отключить переносы из типографа.
 # Для русского языка правила реализованы лучше. Для английского дают "разумные" переносы во многих случаях, но из-за
 # большого числа беззвучных согласных и их сочетаний, могут давать не совсем корректный результат.
+# Точнее переносы по шаблонам Кнута -- Ляна из файлов TeX (`engine='patterns'`, см. `etpgrf.hyphpatterns`).
 
 import regex
 import logging
 import html
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 from etpgrf.config import (
-    CHAR_SHY, LANG_RU, LANG_RU_OLD, LANG_EN,
+    CHAR_SHY, LANG_RU, LANG_RU_OLD, LANG_EN, SUPPORTED_LANGS,
+    HYPHENATION_ENGINE_PATTERNS, SUPPORTED_HYPHENATION_ENGINES,
+    HYPHENATION_BREAKPOINTS_OPTIMAL, SUPPORTED_HYPHENATION_BREAKPOINTS,
     RU_VOWELS_UPPER, RU_CONSONANTS_UPPER, RU_J_SOUND_UPPER, RU_SIGNS_UPPER, # RU_ALPHABET_UPPER,
     EN_VOWELS_UPPER, EN_CONSONANTS_UPPER # , EN_ALPHABET_UPPER
 )
 from etpgrf.defaults import etpgrf_settings
-from etpgrf.comutil import parse_and_validate_langs, is_inside_unbreakable_segment
+from etpgrf.comutil import (parse_and_validate_langs, is_inside_unbreakable_segment, unbreakable_split_positions,
+                            RuleTrigger)
+from etpgrf.textmap import EditLog, tracked_sub
+
+if TYPE_CHECKING:
+    from etpgrf.hyphdict import HyphenationDictionary
+    from etpgrf.hyphpatterns import PatternTrie
 
 
 _RU_OLD_VOWELS_UPPER = frozenset(['І',      # И-десятеричное (гласная)
@@ -31,12 +46,169 @@ _EN_SUFFIXES_WITHOUT_HYPHENATION_UPPER = frozenset([
 _EN_UNBREAKABLE_X_GRAPHS_UPPER = frozenset(["SH", "CH", "TH", "PH", "WH", "CK", "NG", "AW",   # диграфы с согласными
                                          "TCH", "DGE", "IGH",               # триграфы
                                          "EIGH", "OUGH"])                   # квадрографы
+_EN_SUFFIX_MAX_LEN = max(map(len, _EN_SUFFIXES_WITHOUT_HYPHENATION_UPPER))
 
 
 # --- Настройки логирования ---
 logger = logging.getLogger(__name__)
 
 
+def _break_mask(word: str, hyphenated: str) -> int:
+    """
+    Позиции переносов как битовая маска: бит i установлен, если перед `word[i]` стоит перенос.
+
+    :param word: Исходное слово.
+    :param hyphenated: Оно же с расставленными переносами (см. `Hyphenator.hyp_in_word`).
+    """
+    mask = 0
+    i = 0
+    for char in hyphenated:
+        if i < len(word) and char == word[i]:
+            i += 1
+        else:
+            mask |= 1 << i      # Вставленный символ переноса
+    return mask
+
+
+def _apply_break_mask(word: str, mask: int) -> str:
+    """
+    Расставляет переносы в слове по битовой маске (см. `_break_mask`). Слово берется как есть, поэтому регистр букв
+    сохраняется.
+    """
+    if not mask:
+        return word
+    parts = []
+    start = 0
+    while mask:
+        low_bit = mask & -mask
+        index = low_bit.bit_length() - 1
+        parts.append(word[start:index])
+        start = index
+        mask ^= low_bit
+    parts.append(word[start:])
+    return CHAR_SHY.join(parts)
+
+
+def _points_mask(points: list[int]) -> int:
+    """
+    Позиции переносов (индексы символов слова) как битовая маска (см. `_break_mask`).
+    """
+    mask = 0
+    for point in points:
+        mask |= 1 << point
+    return mask
+
+
+def _mask_points(mask: int) -> list[int]:
+    """
+    Позиции переносов из битовой маски (см. `_break_mask`), по возрастанию.
+    """
+    points = []
+    while mask:
+        low_bit = mask & -mask
+        points.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return points
+
+
+def _join_parts(word: str, points: list[int]) -> str:
+    """
+    Расставляет переносы в слове перед символами с индексами `points` (по возрастанию).
+    """
+    if not points:
+        return word
+    parts = []
+    previous = 0
+    for point in points:
+        parts.append(word[previous:point])
+        previous = point
+    parts.append(word[previous:])
+    return CHAR_SHY.join(parts)
+
+
+class HyphenationCache:
+    """
+    Потокобезопасный LRU-кэш переносов `Hyphenator.hyp_in_word`: слово -> позиции переносов в виде битовой маски
+    (целое число вместо строки с переносами). Частота слов подчиняется закону Ципфа, поэтому несколько тысяч
+    самых частых длинных слов дают большую часть работы по расстановке переносов.
+
+    При передаче в другой процесс (pickle) передаются только ограничения, а не содержимое.
+    """
+
+    def __init__(self, max_entries: int, max_word_len: int | None = None):
+        """
+        :param max_entries: Максимальное число слов в кэше (при превышении вытесняются давно не использованные).
+        :param max_word_len: Слова длиннее в кэш не попадают (None -- `etpgrf_settings.hyphenation.CACHE_MAX_WORD_LEN`).
+        """
+        self.max_entries = max_entries
+        self.max_word_len = etpgrf_settings.hyphenation.CACHE_MAX_WORD_LEN if max_word_len is None else max_word_len
+        if self.max_entries < 1:
+            raise ValueError(f"etpgrf: размер кэша переносов должен быть >= 1, а не {self.max_entries}")
+        self._init_storage()
+
+    def _init_storage(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> dict:
+        return {'max_entries': self.max_entries, 'max_word_len': self.max_word_len}
+
+    def __setstate__(self, state: dict) -> None:
+        self.max_entries = state['max_entries']
+        self.max_word_len = state['max_word_len']
+        self._init_storage()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, word: str) -> int | None:
+        """
+        Возвращает маску переносов слова (и помечает запись как недавно использованную) или None.
+        """
+        with self._lock:
+            mask = self._entries.get(word)
+            if mask is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(word)
+            self.hits += 1
+            return mask
+
+    def put(self, word: str, mask: int) -> None:
+        """
+        Запоминает маску переносов слова.
+        """
+        with self._lock:
+            self._entries[word] = mask
+            self._entries.move_to_end(word)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Очищает кэш (счетчики попаданий, промахов и вытеснений сохраняются).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику кэша: попадания, промахи, доля попаданий, вытеснения и число записей.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries),
+                    'max_entries': self.max_entries}
+
+
 # --- Класс Hyphenator (расстановка переносов) ---
 class Hyphenator:
     """Правила расстановки переносов для разных языков.
@@ -44,7 +216,13 @@ class Hyphenator:
     def __init__(self,
                  langs: str | list[str] | tuple[str, ...] | frozenset[str] | None = None,
                  max_unhyphenated_len: int | None = None,  # Максимальная длина непереносимой группы
-                 min_tail_len: int | None = None):  # Минимальная длина после переноса (хвост, который разрешено переносить)
+                 min_tail_len: int | None = None,  # Минимальная длина после переноса (хвост, который разрешено переносить)
+                 cache_size: int | None = None,  # Сколько слов запоминать в кэше переносов (0 -- без кэша)
+                 dictionary: 'str | os.PathLike | HyphenationDictionary | None' = None,  # Словарь переносов
+                 engine: str | None = None,  # Способ расстановки переносов: 'rules' или 'patterns'
+                 patterns: dict[str, str | os.PathLike] | None = None,  # Файлы шаблонов: {язык: путь}
+                 breakpoints: str | None = None,  # Выбор точек переноса: 'optimal' или 'halving'
+                 patterns_digest: dict[str, str] | None = None):  # Ожидаемые хэши файлов шаблонов (из get_config)
         self.langs: frozenset[str] = parse_and_validate_langs(langs)
         self.max_unhyphenated_len = etpgrf_settings.hyphenation.MAX_UNHYPHENATED_LEN if max_unhyphenated_len is None else max_unhyphenated_len
         self.min_chars_per_part = etpgrf_settings.hyphenation.MIN_TAIL_LEN if min_tail_len is None else min_tail_len
@@ -67,11 +245,96 @@ class Hyphenator:
         self._en_alphabet_upper: frozenset = frozenset()
         # Загружает наборы символов на основе self.langs
         self._load_language_resources_for_hyphenation()
+        # Таблица классов символов для `str.translate` (см. `_char_classes`): строится один раз на объект
+        self._class_table = str.maketrans({char: char_class
+                                           for chars, char_class in ((self._vowels, 'v'), (self._consonants, 'c'),
+                                                                     (self._j_sound_upper, 'j'),
+                                                                     (self._signs_upper, 's'))
+                                           for char in chars})
+        # Паттерн слова-кандидата на перенос. Слова не длиннее max_unhyphenated_len `hyp_in_word` все равно
+        # возвращает как есть, поэтому их не ищем вовсе (и не вызываем для них Python-функцию).
+        self._long_word_pattern = regex.compile(rf'\b\p{{L}}{{{self.max_unhyphenated_len + 1},}}\b')
+        # Условие применимости: переносы возможны только в тексте, где есть длинное слово с гласной
+        self._trigger = RuleTrigger(self._vowels, min_len=self.max_unhyphenated_len + 1, ignore_case=True)
+        # Символы, которые могут появиться в тексте после обработки
+        self.produced_chars = frozenset((CHAR_SHY,))
+        # Способ расстановки переносов: правила или шаблоны Кнута -- Ляна (см. `etpgrf.hyphpatterns`)
+        self.engine = etpgrf_settings.hyphenation.ENGINE if engine is None else engine
+        if self.engine not in SUPPORTED_HYPHENATION_ENGINES:
+            raise ValueError(f"etpgrf: способ расстановки переносов '{self.engine}' не поддерживается. "
+                             f"Поддерживаемые: {sorted(SUPPORTED_HYPHENATION_ENGINES)}")
+        patterns = etpgrf_settings.hyphenation.PATTERNS if patterns is None else patterns
+        self.patterns: dict[str, str] = {lang: os.path.abspath(os.fspath(path)) for lang, path in patterns.items()}
+        self._pattern_tries: list[tuple[frozenset, 'PatternTrie']] = []
+        # Хэши содержимого загруженных файлов шаблонов: входят в конфигурацию, так что отпечаток типографа
+        # (ключ кэша результатов) и проверка словаря переносов замечают правку файла, а не только смену пути
+        self.patterns_digest: dict[str, str] = {}
+        if self.engine == HYPHENATION_ENGINE_PATTERNS:
+            self._load_patterns()
+        if patterns_digest is not None and patterns_digest != self.patterns_digest:
+            # Конфигурация сохранена (например, в журнале медленных документов) с другими файлами шаблонов
+            logger.warning(f"Hyphenator: файлы шаблонов переносов изменились с момента сохранения конфигурации: "
+                           f"{patterns_digest} -> {self.patterns_digest}")
+        # Выбор точек переноса: лучший набор для всего слова (`_optimal_break_points`) или половинное деление
+        self.breakpoints = etpgrf_settings.hyphenation.BREAKPOINTS if breakpoints is None else breakpoints
+        if self.breakpoints not in SUPPORTED_HYPHENATION_BREAKPOINTS:
+            raise ValueError(f"etpgrf: способ выбора точек переноса '{self.breakpoints}' не поддерживается. "
+                             f"Поддерживаемые: {sorted(SUPPORTED_HYPHENATION_BREAKPOINTS)}")
+        self._optimal = self.breakpoints == HYPHENATION_BREAKPOINTS_OPTIMAL
+        # Кэш переносов (см. HyphenationCache)
+        cache_size = etpgrf_settings.hyphenation.CACHE_SIZE if cache_size is None else cache_size
+        if cache_size < 0:
+            raise ValueError(f"etpgrf: размер кэша переносов (cache_size) должен быть >= 0, а не {cache_size}")
+        self.cache: HyphenationCache | None = HyphenationCache(cache_size) if cache_size else None
+        # Предвычисленный словарь переносов (см. `etpgrf.hyphdict`): путь к файлу или открытый словарь
+        if dictionary is not None:
+            from etpgrf.hyphdict import HyphenationDictionary
+            if not isinstance(dictionary, HyphenationDictionary):
+                dictionary = HyphenationDictionary(dictionary)
+            dictionary.check_config(self)
+        self.dictionary: 'HyphenationDictionary | None' = dictionary
 
         # ...
         logger.debug(f"Hyphenator `__init__`. Langs: {self.langs},"
                      f" Max unhyphenated_len: {self.max_unhyphenated_len},"
-                     f" Min chars_per_part: {self.min_chars_per_part}")
+                     f" Min chars_per_part: {self.min_chars_per_part},"
+                     f" Cache size: {cache_size},"
+                     f" Dictionary: {dictionary.path if dictionary is not None else None},"
+                     f" Engine: {self.engine},"
+                     f" Breakpoints: {self.breakpoints}")
+
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        return {'langs': list(self.langs),
+                'max_unhyphenated_len': self.max_unhyphenated_len,
+                'min_tail_len': self.min_chars_per_part,
+                'engine': self.engine,
+                'patterns': dict(self.patterns),
+                'patterns_digest': dict(self.patterns_digest),
+                'breakpoints': self.breakpoints}
+
+    def _load_patterns(self) -> None:
+        """
+        Загружает шаблоны переносов для языков Hyphenator. Слова языков без шаблонов переносятся по правилам.
+        """
+        from etpgrf.hyphpatterns import load_patterns
+        unknown = set(self.patterns) - SUPPORTED_LANGS
+        if unknown:
+            raise ValueError(f"etpgrf: шаблоны переносов заданы для неподдерживаемых языков: {sorted(unknown)}")
+        # Порядок проверки языков -- как в правилах: сначала русский, затем английский
+        for langs, alphabet in (((LANG_RU, LANG_RU_OLD), self._ru_alphabet_upper),
+                                ((LANG_EN,), self._en_alphabet_upper)):
+            for lang in langs:
+                if lang in self.langs and lang in self.patterns:
+                    trie = load_patterns(self.patterns[lang])
+                    self._pattern_tries.append((alphabet, trie))
+                    self.patterns_digest[lang] = trie.digest
+                    break
+        if not self._pattern_tries:
+            raise ValueError(f"etpgrf: для способа переносов '{HYPHENATION_ENGINE_PATTERNS}' нужны файлы шаблонов "
+                             f"(patterns) хотя бы для одного из языков {sorted(self.langs)}")
 
     def _load_language_resources_for_hyphenation(self):
         # Определяем наборы гласных, согласных и т.д. в зависимости языков.
@@ -116,222 +379,467 @@ class Hyphenator:
 
     def hyp_in_word(self, word: str) -> str:
         """ Расстановка переносов в русском слове с учетом максимальной длины непереносимой группы.
-        Переносы ставятся половинным делением слова, рекурсивно.
+        Из допустимых точек переноса выбирается лучший набор для всего слова (`breakpoints='optimal'`, см.
+        `_optimal_break_points`) или точки ищутся половинным делением слова (`'halving'`). Если включен кэш
+        переносов (`cache_size`), позиции переносов частых слов берутся из него, а если задан словарь переносов
+        (`dictionary`) -- из словаря.
 
         :param word:      Слово, в котором надо расставить переносы
         :return:          Слово с расставленными переносами
         """
+        if (self.cache is None and self.dictionary is None) or len(word) <= self.max_unhyphenated_len:
+            return _join_parts(word, self._break_points(word))
+        return _apply_break_mask(word, self._lookup_break_mask(word))
+
+    def hyphenation_points_word(self, word: str) -> array:
+        """ Позиции переносов в слове без вставки символов переноса: для программ, которым нужны только места
+        разрыва (отрисовка PDF/canvas, поисковые индексы). Позиции те же, что у `hyp_in_word` (с кэшем и словарем).
+
+        :param word: Слово.
+        :return: `array('I')` индексов символов слова (по возрастанию), перед которыми допустим перенос.
+        """
+        return array('I', self._word_break_points(word))
+
+    def _word_break_points(self, word: str) -> list[int]:
+        """ Позиции переносов в слове с учетом кэша и словаря (см. `hyphenation_points_word`).
+        """
+        if (self.cache is None and self.dictionary is None) or len(word) <= self.max_unhyphenated_len:
+            return self._break_points(word)
+        return _mask_points(self._lookup_break_mask(word))
+
+    def _lookup_break_mask(self, word: str) -> int:
+        """ Позиции переносов длинного слова в виде битовой маски: из кэша, из словаря или по правилам
+        (результат запоминается в кэше).
+        """
+        cache = self.cache
+        dictionary = self.dictionary
+        use_cache = cache is not None and len(word) <= cache.max_word_len
+        if use_cache:
+            mask = cache.get(word)
+            if mask is not None:
+                return mask
+        mask = dictionary.lookup(word) if dictionary is not None else None
+        if mask is None:
+            mask = _points_mask(self._break_points(word))
+        if use_cache:
+            cache.put(word, mask)
+        return mask
+
+    def _break_points(self, word: str) -> list[int]:
+        """ Позиции переносов в слове без кэша и словаря (см. `hyp_in_word`): индексы символов слова
+        (по возрастанию), перед которыми ставится перенос.
+        """
         # 1. ОБЩИЕ ПРОВЕРКИ
         # TODO: возможно, для скорости, надо сделать проверку на пробелы и другие разделители, которых не должно быть
         if not word:
             # Явная проверка на пустую строку
-            return ""
+            return []
         if len(word) <= self.max_unhyphenated_len or not any(self._is_vow(c) for c in word):
             # Если слово короткое или не содержит гласных, перенос не нужен
-            return word
-        logger.debug(f"Hyphenator: word: `{word}` // langs: {self.langs} // max_unhyphenated_len: {self.max_unhyphenated_len} // min_tail_len: {self.min_chars_per_part}")
+            return []
+        # Отладочные сообщения формируются, только если они будут выведены (это горячий путь)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"Hyphenator: word: `{word}` // langs: {self.langs} // max_unhyphenated_len: {self.max_unhyphenated_len} // min_tail_len: {self.min_chars_per_part}")
+        # 1.1. Шаблоны Кнута -- Ляна (если выбраны и есть для языка слова)
+        if self._pattern_tries:
+            word_upper_chars = frozenset(word.upper())
+            for alphabet, trie in self._pattern_tries:
+                if word_upper_chars <= alphabet:
+                    return self._pattern_break_points(word, trie)
         # 2. ОБНАРУЖЕНИЕ ЯЗЫКА И ПОДКЛЮЧЕНИЕ ЯЗЫКОВОЙ ЛОГИКИ
         # Поиск вхождения букв строки (слова) через `frozenset` -- O(1). Это быстрее регулярного выражения -- O(n)
         # 2.1. Проверяем RU и RU_OLD (правила одинаковые, но разные наборы букв)
         if (LANG_RU in self.langs or LANG_RU_OLD in self.langs) and frozenset(word.upper()) <= self._ru_alphabet_upper:
             # Пользователь подключил русскую логику, и слово содержит только русские буквы
-            logger.debug(f"`{word}` -- use `{LANG_RU}` or `{LANG_RU_OLD}` rules")
-
-            # Поиск допустимой позиции для переноса около заданного индекса
-            def find_hyphen_point_ru(word_segment: str, start_idx: int) -> int:
-                word_len = len(word_segment)
-                min_part = self.min_chars_per_part
-
-                # --- Вложенная функция для оценки качества точки переноса ---
-                def get_split_score(i: int) -> int:
-                    """
-                    Вычисляет "оценку" для точки переноса `i`. Чем выше оценка, тем качественнее перенос.
-                    -1 означает, что перенос в этой точке запрещен.
-                    """
-                    # --- Сначала идут ЗАПРЕТЫ (жесткие "нельзя") ---
-                    # Если правило нарушено, сразу дисквалифицируем точку.
-                    if self._is_sign(word_segment[i]) or self._is_j_sound(word_segment[i]):
-                        return -1  # ЗАПРЕТ 1: Новая строка не может начинаться с Ь, Ъ или Й.
-                    if self._is_j_sound(word_segment[i - 1]) and self._is_vow(word_segment[i]):
-                        return -1  # ЗАПРЕТ 2: Нельзя отрывать Й от следующей за ней гласной.
-                    # --- Теперь идут РАЗРЕШЕНИЯ с разными приоритетами ---
-                    # РАЗРЕШЕНИЕ 1: Перенос между сдвоенными согласными.
-                    if self._is_cons(word_segment[i - 1]) and word_segment[i - 1] == word_segment[i]:
-                        return 10
-                    # РАЗРЕШЕНИЕ 2: Перенос после "слога" с Ь/Ъ, если дальше идет СОГЛАСНАЯ.
-                    #               Пример: "строитель-ство", но НЕ "компь-ютер".
-                    #               По-хорошему нужно проверять, что перед Ь/Ъ нет йотированной гласной
-                    #               (и переработать ЗАПРЕТ 2), но это еще больше усложнит логику.
-                    if self._is_sign(word_segment[i - 1]) and self._is_cons(word_segment[i]):
-                        return 9
-                    # РАЗРЕШЕНИЕ 3: Перенос после "слога" если предыдущий Й (очень качественный перенос).
-                    if self._is_j_sound(word_segment[i - 1]):
-                        return 7
-                    # РАЗРЕШЕНИЕ 4: Перенос между тремя согласными (C-CС), чуть лучше, чем после гласной.
-                    if self._is_cons(word_segment[i]) and self._is_cons(word_segment[i-1]) and self._is_cons(word_segment[i+1]):
-                        return 6
-                    # # РАЗРЕШЕНИЕ 5 (?): Перенос между согласной и согласной (C-C).
-                    # if self._is_cons(word_segment[i - 1]) and self._is_cons(word_segment[i]):
-                    #     return 5
-                    # РАЗРЕШЕНИЕ 6 (Основное правило): Перенос после гласной.
-                    if self._is_vow(word_segment[i - 1]):
-                        return 5
-                    # Если ни одно правило не подошло, точка не подходит для переноса.
-                    return 0
-
-                # 1. Собираем всех кандидатов и их оценки
-                candidates = []
-                possible_indices = range(min_part, word_len - min_part + 1)
-                for i in possible_indices:
-                    score = get_split_score(i)
-                    if score > 0:
-                        # Добавляем только подходящих кандидатов
-                        distance_from_center = abs(i - start_idx)
-                        candidates.append({'score': score, 'distance': distance_from_center, 'index': i})
-
-                # 2. Если подходящих кандидатов нет, сдаемся
-                if not candidates:
-                    return -1
-
-                # 3. Сортируем кандидатов: сначала по убыванию ОЦЕНКИ, потом по возрастанию УДАЛЕННОСТИ от центра.
-                # Это гарантирует, что перенос "н-н" (score=10) будет выбран раньше, чем "е-н" (score=5),
-                # даже если "е-н" чуть ближе к центру.
-                best_candidate = sorted(candidates, key=lambda c: (-c['score'], c['distance']))[0]
-
-                return best_candidate['index']  # Не нашли подходящую позицию
-
-            # Рекурсивное деление слова
-            def split_word_ru(word_to_split: str) -> str:
-                # Если длина укладывается в лимит, перенос не нужен
-                if len(word_to_split) <= self.max_unhyphenated_len:
-                    return word_to_split
-                # Ищем точку переноса около середины
-                hyphen_idx = find_hyphen_point_ru(word_to_split, len(word_to_split) // 2)
-                # Если не нашли точку переноса
-                if hyphen_idx == -1:
-                    return word_to_split
-                # Разделяем слово на две части (до и после точки переноса)
-                left_part = word_to_split[:hyphen_idx]
-                right_part = word_to_split[hyphen_idx:]
-                # Рекурсивно делим левую и правую части и соединяем их через символ переноса
-                return split_word_ru(left_part) + CHAR_SHY + split_word_ru(right_part)
-
-            # Основная логика
-            return split_word_ru(word)    # Рекурсивно делим слово на части с переносами
+            if debug:
+                logger.debug(f"`{word}` -- use `{LANG_RU}` or `{LANG_RU_OLD}` rules")
+            return self._ru_break_points(word)
 
         # 2.2. Проверяем EN
         elif LANG_EN in self.langs and frozenset(word.upper()) <= self._en_alphabet_upper:
             # Пользователь подключил английскую логику, и слово содержит только английские буквы
-            logger.debug(f"`{word}` -- use `{LANG_EN}` rules")
-            # --- Начало логики для английского языка (заглушка) ---
-            # ПРИМЕЧАНИЕ: правила переноса в английском языке основаны на слогах, и их точное определение без словаря
-            # слогов или сложного алгоритма (вроде Knuth-Liang) — непростая задача. Здесь реализована упрощенная
-            # логика и поиск потенциальных точек переноса основан на простых правилах: между согласными, или между
-            # гласной и согласной. Метод половинного деления и рекурсии (поиск переносов о середины слова).
-
-            # Функция для поиска допустимой позиции для переноса около заданного индекса
-            # Ищет точку переноса, соблюдая min_chars_per_part и простые правила
-            def find_hyphen_point_en(word_segment: str, start_idx: int) -> int:
-                word_len = len(word_segment)
-                min_part = self.min_chars_per_part
-
-                # Определяем диапазон допустимых индексов для переноса
-                # Индекс 'i' - это точка разреза. word_segment[:i] и word_segment[i:] должны быть не короче min_part.
-                # i >= min_part
-                # word_len - i >= min_part => i <= word_len - min_part
-                valid_split_indices = [i for i in range(min_part, word_len - min_part + 1)]
-
-                if not valid_split_indices:
-                    # Нет ни одного места, где можно поставить перенос, соблюдая min_part
-                    logger.debug(f"No valid split indices for '{word_segment}' within min_part={min_part}")
-                    return -1
-
-                # Сортируем допустимые индексы по удаленности от start_idx (середины)
-                # Это реализует поиск "около центра"
-                valid_split_indices.sort(key=lambda i: abs(i - start_idx))
-
-                # Проверяем каждый потенциальный индекс переноса по упрощенным правилам
-                for i in valid_split_indices:
-                    # Упрощенные правила английского переноса (основаны на частых паттернах, не на слогах):
-                    # 1. Запрет переноса между гласными
-                    if self._is_vow(word_segment[i - 1]) and self._is_vow(word_segment[i]):
-                        logger.debug(
-                            f"Skipping V-V split point at index {i} in '{word_segment}' ({word_segment[i - 1]}{word_segment[i]})")
-                        continue  # Переходим к следующему кандидату i
-
-                    # 2. Запрет переноса ВНУТРИ неразрывных диграфов/триграфов и т.д.
-                    if is_inside_unbreakable_segment(word_segment=word_segment,
-                                                     split_index=i,
-                                                     unbreakable_set=_EN_UNBREAKABLE_X_GRAPHS_UPPER):
-                        logger.debug(f"Skipping unbreakable segment at index {i} in '{word_segment}'")
-                        continue
-
-                    # 3. Перенос между двумя согласными (C-C), например, 'but-ter', 'subjec-tive'
-                    #    Точка переноса - индекс i. Проверяем символы word[i-1] и word[i].
-                    if self._is_cons(word_segment[i - 1]) and self._is_cons(word_segment[i]):
-                        logger.debug(f"Found C-C split point at index {i} in '{word_segment}'")
-                        return i
-
-                    # 4. Перенос перед одиночной согласной между двумя гласными (V-C-V), например, 'ho-tel', 'ba-by'
-                    #    Точка переноса - индекс i (перед согласной). Проверяем word[i-1], word[i], word[i+1].
-                    #    Требуется как минимум 3 символа для этого паттерна.
-                    if i < word_len - 1 and \
-                            self._is_vow(word_segment[i - 1]) and self._is_cons(word_segment[i]) and self._is_vow(
-                        word_segment[i + 1]):
-                        logger.debug(f"Found V-C-V (split before C) split point at index {i} in '{word_segment}'")
-                        return i
-
-                    # 5. Перенос после одиночной согласной между двумя гласными (V-C-V), например, 'riv-er', 'fin-ish'
-                    #    Точка переноса - индекс i (после согласной). Проверяем word[i-2], word[i-1], word[i].
-                    #    Требуется как минимум 3 символа для этого паттерна.
-                    if i < word_len and \
-                            self._is_vow(word_segment[i - 2]) and self._is_cons(word_segment[i - 1]) and \
-                            self._is_vow(word_segment[i]):
-                        logger.debug(f"Found V-C-V (split after C) split point at index {i} in '{word_segment}'")
-                        return i
-
-                    # 6. Правила для распространенных суффиксов (перенос ПЕРЕД суффиксом). Проверяем, что word_segment
-                    #    заканчивается на суффикс, и точка переноса (i) находится как раз перед ним
-                    if word_segment[i:].upper() in _EN_SUFFIXES_WITHOUT_HYPHENATION_UPPER:
-                        # Мы нашли потенциальный суффикс.
-                        logger.debug(f"Found suffix '-{word_segment[i:]}' split point at index {i} in '{word_segment}'")
-                        return i
-
-                # Если ни одна подходящая точка переноса не найдена в допустимом диапазоне
-                logger.debug(f"No suitable hyphen point found for '{word_segment}' near center.")
-                return -1
-
-            # Рекурсивная функция для деления слова на части с переносами
-            def split_word_en(word_to_split: str) -> str:
-                # Базовый случай рекурсии: если часть слова достаточно короткая, не делим ее дальше
-                if len(word_to_split) <= self.max_unhyphenated_len:
-                    return word_to_split
-
-                # Ищем точку переноса около середины текущей части слова
-                hyphen_idx = find_hyphen_point_en(word_to_split, len(word_to_split) // 2)
-
-                # Если подходящая точка переноса не найдена, возвращаем часть слова как есть
-                if hyphen_idx == -1:
-                    return word_to_split
-
-                # Рекурсивно обрабатываем обе части и объединяем их символом переноса
-                return (split_word_en(word_to_split[:hyphen_idx]) +
-                        CHAR_SHY + split_word_en(word_to_split[hyphen_idx:]))
-
-            # --- Конец логики для английского языка ---
-            return split_word_en(word)
+            if debug:
+                logger.debug(f"`{word}` -- use `{LANG_EN}` rules")
+            return self._en_break_points(word, debug)
         else:
             # кстати "слова" в которых есть пробелы или другие разделители, тоже попадают сюда
-            logger.debug(f"`{word}` -- use `UNDEFINE` rules")
-            return word
+            if debug:
+                logger.debug(f"`{word}` -- use `UNDEFINE` rules")
+            return []
 
+    def _char_classes(self, word: str) -> str:
+        """
+        Строка классов символов слова (по одному на символ) -- одним вызовом `str.translate` вместо `upper()`
+        и проверки множеств для каждого символа: 'v' -- гласная, 'c' -- согласная, 'j' -- Й, 's' -- Ь или Ъ,
+        прочие символы -- другие.
+        """
+        word_upper = word.upper()
+        if len(word_upper) == len(word):
+            return word_upper.translate(self._class_table)
+        # Перевод в верхний регистр изменил длину (например, "ß" -> "SS"): классы по отдельным символам
+        return ''.join(char_upper.translate(self._class_table) if len(char_upper) == 1 else '?'
+                       for char_upper in map(str.upper, word))
+
+    @staticmethod
+    def _ru_split_scores(word: str, classes: str) -> bytearray:
+        """
+        "Оценки" точек переноса русского слова. Чем выше оценка, тем качественнее перенос, 0 -- перенос в этой
+        точке запрещен или не подходит. Оценка точки `i` зависит только от символов `i - 1`, `i` и `i + 1`,
+        поэтому считается один раз для всего слова, а не для каждой части при половинном делении.
 
-    def hyp_in_text(self, text: str) -> str:
+        :param word: Слово.
+        :param classes: Классы символов слова (см. `_char_classes`).
+        :return: Оценка для каждой позиции слова.
+        """
+        scores = bytearray(len(word))
+        for i in range(1, len(word) - 1):
+            current = classes[i]
+            # --- Сначала идут ЗАПРЕТЫ (жесткие "нельзя") ---
+            if current == 's' or current == 'j':
+                continue    # ЗАПРЕТ 1: Новая строка не может начинаться с Ь, Ъ или Й.
+            previous = classes[i - 1]
+            if previous == 'j':
+                if current != 'v':
+                    # РАЗРЕШЕНИЕ 3: Перенос после "слога" если предыдущий Й (очень качественный перенос).
+                    scores[i] = 7
+                continue    # ЗАПРЕТ 2: Нельзя отрывать Й от следующей за ней гласной.
+            # --- Теперь идут РАЗРЕШЕНИЯ с разными приоритетами ---
+            if previous == 'c' and word[i - 1] == word[i]:
+                # РАЗРЕШЕНИЕ 1: Перенос между сдвоенными согласными.
+                scores[i] = 10
+            elif previous == 's' and current == 'c':
+                # РАЗРЕШЕНИЕ 2: Перенос после "слога" с Ь/Ъ, если дальше идет СОГЛАСНАЯ.
+                #               Пример: "строитель-ство", но НЕ "компь-ютер".
+                #               По-хорошему нужно проверять, что перед Ь/Ъ нет йотированной гласной
+                #               (и переработать ЗАПРЕТ 2), но это еще больше усложнит логику.
+                scores[i] = 9
+            elif current == 'c' and previous == 'c' and classes[i + 1] == 'c':
+                # РАЗРЕШЕНИЕ 4: Перенос между тремя согласными (C-CС), чуть лучше, чем после гласной.
+                scores[i] = 6
+            elif previous == 'v':
+                # РАЗРЕШЕНИЕ 6 (Основное правило): Перенос после гласной.
+                scores[i] = 5
+            # Если ни одно правило не подошло, точка не подходит для переноса.
+        return scores
+
+    def _ru_break_points(self, word: str) -> list[int]:
+        """
+        Позиции переносов в русском слове: лучший набор точек по оценкам (см. `_optimal_break_points`) или половинное
+        деление, в каждой части -- точка с наибольшей оценкой, а из равных -- ближайшая к середине части (обе части
+        не короче `min_tail_len`).
+        """
+        scores = self._ru_split_scores(word, self._char_classes(word))
+        if self._optimal:
+            return self._optimal_break_points(len(word), scores)
+        min_part = self.min_chars_per_part
+        points = []
+
+        # Рекурсивное деление слова
+        def split(start: int, end: int) -> None:
+            # Если длина укладывается в лимит, перенос не нужен
+            if end - start <= self.max_unhyphenated_len:
+                return
+            middle = start + (end - start) // 2
+            best = -1
+            best_key = None
+            for i in range(start + min_part, end - min_part + 1):
+                score = scores[i]
+                if score:
+                    # Сначала по убыванию ОЦЕНКИ, потом по возрастанию УДАЛЕННОСТИ от центра. Это гарантирует,
+                    # что перенос "н-н" (score=10) будет выбран раньше, чем "е-н" (score=5), даже если "е-н" чуть
+                    # ближе к центру. При равенстве остается левая точка.
+                    key = (-score, abs(i - middle))
+                    if best_key is None or key < best_key:
+                        best, best_key = i, key
+            # Если не нашли точку переноса
+            if best < 0:
+                return
+            split(start, best)
+            points.append(best)
+            split(best, end)
+
+        split(0, len(word))
+        return points
+
+    def _en_break_points(self, word: str, debug: bool = False) -> list[int]:
+        """
+        Позиции переносов в английском слове.
+        """
+        # ПРИМЕЧАНИЕ: правила переноса в английском языке основаны на слогах, и их точное определение без словаря
+        # слогов или сложного алгоритма (вроде Knuth-Liang) — непростая задача. Здесь реализована упрощенная
+        # логика и поиск потенциальных точек переноса основан на простых правилах: между согласными, или между
+        # гласной и согласной. Метод половинного деления и рекурсии (поиск переносов о середины слова).
+        classes = self._char_classes(word)
+        if self._optimal:
+            return self._optimal_break_points(len(word), self._en_split_scores(word, classes))
+        points = []
+
+        # Рекурсивная функция для деления слова на части с переносами
+        def split(start: int, end: int) -> None:
+            # Базовый случай рекурсии: если часть слова достаточно короткая, не делим ее дальше
+            if end - start <= self.max_unhyphenated_len:
+                return
+            # Ищем точку переноса около середины текущей части слова
+            hyphen_idx = self._find_hyphen_point_en(word[start:end], classes[start:end], (end - start) // 2, debug)
+            # Если подходящая точка переноса не найдена, оставляем часть слова как есть
+            if hyphen_idx == -1:
+                return
+            split(start, start + hyphen_idx)
+            points.append(start + hyphen_idx)
+            split(start + hyphen_idx, end)
+
+        split(0, len(word))
+        return points
+
+    def _find_hyphen_point_en(self, word_segment: str, classes: str, start_idx: int, debug: bool = False) -> int:
+        """
+        Ищет допустимую позицию для переноса около заданного индекса, соблюдая min_chars_per_part и простые правила.
+
+        :param word_segment: Часть слова.
+        :param classes: Классы символов части слова (см. `_char_classes`).
+        :param start_idx: Индекс, около которого ищется перенос (середина части).
+        :return: Позиция переноса или -1.
+        """
+        word_len = len(word_segment)
+        min_part = self.min_chars_per_part
+
+        # Определяем диапазон допустимых индексов для переноса
+        # Индекс 'i' - это точка разреза. word_segment[:i] и word_segment[i:] должны быть не короче min_part.
+        # i >= min_part
+        # word_len - i >= min_part => i <= word_len - min_part
+        valid_split_indices = list(range(min_part, word_len - min_part + 1))
+
+        if not valid_split_indices:
+            # Нет ни одного места, где можно поставить перенос, соблюдая min_part
+            if debug:
+                logger.debug(f"No valid split indices for '{word_segment}' within min_part={min_part}")
+            return -1
+
+        # Сортируем допустимые индексы по удаленности от start_idx (середины)
+        # Это реализует поиск "около центра"
+        valid_split_indices.sort(key=lambda i: abs(i - start_idx))
+
+        # Проверяем каждый потенциальный индекс переноса по упрощенным правилам
+        for i in valid_split_indices:
+            previous, current = classes[i - 1], classes[i]
+            # Упрощенные правила английского переноса (основаны на частых паттернах, не на слогах):
+            # 1. Запрет переноса между гласными
+            if previous == 'v' and current == 'v':
+                if debug:
+                    logger.debug(
+                        f"Skipping V-V split point at index {i} in '{word_segment}' ({word_segment[i - 1]}{word_segment[i]})")
+                continue  # Переходим к следующему кандидату i
+
+            # 2. Запрет переноса ВНУТРИ неразрывных диграфов/триграфов и т.д.
+            if is_inside_unbreakable_segment(word_segment=word_segment,
+                                             split_index=i,
+                                             unbreakable_set=_EN_UNBREAKABLE_X_GRAPHS_UPPER):
+                if debug:
+                    logger.debug(f"Skipping unbreakable segment at index {i} in '{word_segment}'")
+                continue
+
+            # 3. Перенос между двумя согласными (C-C), например, 'but-ter', 'subjec-tive'
+            #    Точка переноса - индекс i. Проверяем символы word[i-1] и word[i].
+            if previous == 'c' and current == 'c':
+                if debug:
+                    logger.debug(f"Found C-C split point at index {i} in '{word_segment}'")
+                return i
+
+            # 4. Перенос перед одиночной согласной между двумя гласными (V-C-V), например, 'ho-tel', 'ba-by'
+            #    Точка переноса - индекс i (перед согласной). Проверяем word[i-1], word[i], word[i+1].
+            #    Требуется как минимум 3 символа для этого паттерна.
+            if i < word_len - 1 and previous == 'v' and current == 'c' and classes[i + 1] == 'v':
+                if debug:
+                    logger.debug(f"Found V-C-V (split before C) split point at index {i} in '{word_segment}'")
+                return i
+
+            # 5. Перенос после одиночной согласной между двумя гласными (V-C-V), например, 'riv-er', 'fin-ish'
+            #    Точка переноса - индекс i (после согласной). Проверяем word[i-2], word[i-1], word[i].
+            if classes[i - 2] == 'v' and previous == 'c' and current == 'v':
+                if debug:
+                    logger.debug(f"Found V-C-V (split after C) split point at index {i} in '{word_segment}'")
+                return i
+
+            # 6. Правила для распространенных суффиксов (перенос ПЕРЕД суффиксом). Проверяем, что word_segment
+            #    заканчивается на суффикс, и точка переноса (i) находится как раз перед ним
+            #    (хвост длиннее самого длинного суффикса не сравниваем: срез длинного слова дорог)
+            if word_len - i <= _EN_SUFFIX_MAX_LEN and \
+                    word_segment[i:].upper() in _EN_SUFFIXES_WITHOUT_HYPHENATION_UPPER:
+                # Мы нашли потенциальный суффикс.
+                if debug:
+                    logger.debug(f"Found suffix '-{word_segment[i:]}' split point at index {i} in '{word_segment}'")
+                return i
+
+        # Если ни одна подходящая точка переноса не найдена в допустимом диапазоне
+        if debug:
+            logger.debug(f"No suitable hyphen point found for '{word_segment}' near center.")
+        return -1
+
+    def _en_split_scores(self, word: str, classes: str) -> bytearray:
+        """
+        "Оценки" точек переноса английского слова (см. `_ru_split_scores`) по тем же правилам, что
+        и в `_find_hyphen_point_en`, но для всего слова сразу: перед суффиксом -- 4, между согласными и перед
+        согласной между гласными -- 3, после согласной между гласными -- 2, иначе 0.
+        """
+        word_len = len(word)
+        min_part = self.min_chars_per_part
+        scores = bytearray(word_len)
+        inside_unbreakable = unbreakable_split_positions(word, _EN_UNBREAKABLE_X_GRAPHS_UPPER)
+        for i in range(min_part, word_len - min_part + 1):
+            previous, current = classes[i - 1], classes[i]
+            if (previous == 'v' and current == 'v') or inside_unbreakable[i]:
+                continue    # Запрет переноса между гласными и внутри диграфов/триграфов
+            if word_len - i <= _EN_SUFFIX_MAX_LEN and word[i:].upper() in _EN_SUFFIXES_WITHOUT_HYPHENATION_UPPER:
+                scores[i] = 4
+            elif (previous == 'c' and current == 'c') or \
+                    (previous == 'v' and current == 'c' and classes[i + 1] == 'v'):
+                scores[i] = 3
+            elif classes[i - 2] == 'v' and previous == 'c' and current == 'v':
+                scores[i] = 2
+        return scores
+
+    def _optimal_break_points(self, length: int, scores: bytes | bytearray) -> list[int]:
+        """
+        Лучший набор точек переноса для всего слова -- динамическим программированием за один проход, без рекурсии
+        и срезов слова. Части слова не короче `min_tail_len`, и из всех наборов выбирается (по порядку важности):
+        меньше всего символов сверх `max_unhyphenated_len` в слишком длинных частях, меньше всего переносов,
+        наибольшая сумма оценок точек, самые ровные части (наименьшая сумма квадратов длин частей, кроме слишком
+        длинных). Время -- O(длина слова x `max_unhyphenated_len`).
+
+        :param length: Длина слова.
+        :param scores: Оценки точек переноса по позициям (0 -- перенос перед символом с этим индексом недопустим).
+        :return: Позиции переносов по возрастанию.
+        """
+        max_len = self.max_unhyphenated_len
+        min_part = self.min_chars_per_part
+        positions = [0]
+        positions.extend(i for i in range(min_part, length - min_part + 1) if scores[i])
+        positions.append(length)
+        # costs[k] -- лучшая "стоимость" начала слова до переноса перед positions[k]: (символов сверх max_len,
+        # число переносов, минус сумма оценок, сумма квадратов длин частей); previous[k] -- предыдущий перенос.
+        # Стоимости сравниваются как кортежи (лексикографически).
+        costs: list[tuple[int, int, int, int] | None] = [(0, 0, 0, 0)]
+        previous = [-1]
+        far = 0             # Позиции до far -- дальше max_len от текущей (часть от них была бы слишком длинной)
+        far_best = None     # Лучшая из них: (излишек - позиция, переносы, минус оценки, ровность, индекс). Излишек
+                            # слишком длинной части -- текущая позиция минус ее начало, поэтому лучшая одна для всех
+        last = len(positions) - 1
+        for k in range(1, last + 1):
+            position = positions[k]
+            while positions[far] < position - max_len:
+                cost = costs[far]
+                if cost is not None:
+                    key = (cost[0] - positions[far], cost[1], cost[2], cost[3], far)
+                    if far_best is None or key < far_best:
+                        far_best = key
+                far += 1
+            is_break = k != last
+            best = None
+            best_j = -1
+            if far_best is not None:
+                excess, breaks, score, evenness, best_j = far_best
+                best = (excess + position - max_len, breaks + is_break,
+                        score - scores[position] if is_break else score, evenness)
+            for j in range(far, k):
+                part = position - positions[j]
+                if part < min_part:
+                    break
+                cost = costs[j]
+                if cost is None:
+                    continue
+                oversized, breaks, score, evenness = cost
+                candidate = (oversized, breaks + is_break, score - scores[position] if is_break else score,
+                             evenness + part * part)
+                if best is None or candidate < best:
+                    best, best_j = candidate, j
+            costs.append(best)
+            previous.append(best_j)
+        # Восстанавливаем переносы с конца
+        points = []
+        k = previous[last]
+        while k > 0:
+            points.append(positions[k])
+            k = previous[k]
+        points.reverse()
+        return points
+
+    def _pattern_break_points(self, word: str, trie: 'PatternTrie') -> list[int]:
+        """
+        Позиции переносов по шаблонам: из допустимых точек переноса выбираются те, что нужны, чтобы части слова
+        были не длиннее `max_unhyphenated_len`, -- как в правилах: лучший набор для всего слова или половинным
+        делением (точка, ближайшая к середине части, причем обе части не короче `min_tail_len`).
+        """
+        points = trie.break_points(word)
+        if not points:
+            return []
+        if self._optimal:
+            # Все допустимые по шаблонам точки равноценны
+            scores = bytearray(len(word))
+            for point in points:
+                scores[point] = 1
+            return self._optimal_break_points(len(word), scores)
+        min_part = self.min_chars_per_part
+        selected = []
+
+        def split(start: int, end: int) -> None:
+            if end - start <= self.max_unhyphenated_len:
+                return
+            lo = bisect_left(points, start + min_part)
+            hi = bisect_right(points, end - min_part)
+            if lo >= hi:
+                return
+            middle = (start + end) // 2
+            index = bisect_left(points, middle, lo, hi)
+            # Ближайшая к середине точка (при равенстве -- левая)
+            if index == hi or (index > lo and middle - points[index - 1] <= points[index] - middle):
+                index -= 1
+            point = points[index]
+            split(start, point)
+            selected.append(point)
+            split(point, end)
+
+        split(0, len(word))
+        return selected
+
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет по набору символов текста, могут ли в нем появиться переносы.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если текст точно останется без изменений.
+        """
+        return self._trigger.may_apply(chars, length)
+
+    def hyphenation_points(self, text: str) -> array:
+        """ Позиции переносов в тексте без вставки символов переноса (см. `hyphenation_points_word`). Слова ищутся
+        так же, как в `hyp_in_text`, поэтому позиции совпадают с местами, куда `hyp_in_text` вставил бы переносы.
+
+        :param text: Текст (без HTML-разметки).
+        :return: `array('I')` индексов символов текста (по возрастанию), перед которыми допустим перенос.
+        """
+        points = array('I')
+        for match in self._long_word_pattern.finditer(text):
+            word_points = self._word_break_points(match.group())
+            if word_points:
+                start = match.start()
+                points.extend(start + point for point in word_points)
+        return points
+
+    def hyp_in_text(self, text: str, chars: set[str] | None = None, edits: EditLog | None = None) -> str:
         """ Расстановка переносов в тексте
 
             :param text: Строка, которую надо обработать (главный аргумент).
+            :param chars: Множество символов текста (необязательно). Если передано, обработка пропускается,
+                          когда переносы в тексте точно невозможны, а символ переноса добавляется в множество.
+            :param edits: Журнал правок (необязательно): замены записываются в него (см. `etpgrf.textmap`).
             :return: str: Строка с расставленными переносами.
         """
+        if chars is not None and not self._trigger.may_apply(chars, len(text)):
+            return text
+
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         # 1. Определяем функцию, которая будет вызываться для каждого найденного слова
         def replace_word_with_hyphenated(match_obj):
@@ -342,17 +850,19 @@ class Hyphenator:
             hyphenated_word = self.hyp_in_word(word_to_process)
 
             # ============= Для отладки (слова в которых появились переносы) ==================
-            if word_to_process != hyphenated_word:
+            if debug and word_to_process != hyphenated_word:
                 logger.debug(f"hyp_in_text: '{word_to_process}' -> '{hyphenated_word}'")
 
             return hyphenated_word
 
-        # 2. regex.sub() -- поиск с заменой. Ищем по паттерну `r'\b\p{L}+\b'`  (`\b` - граница слова;
-        #                   `\p{L}` - любая буква Unicode; `+` - одно или более вхождений).
+        # 2. regex.sub() -- поиск с заменой. Ищем по паттерну `r'\b\p{L}{N,}\b'`  (`\b` - граница слова;
+        #                   `\p{L}` - любая буква Unicode; `{N,}` - слова длиннее max_unhyphenated_len).
         #                    Второй аргумент - это наша функция replace_word_with_hyphenated.
         #                    regex.sub вызовет ее для каждого найденного слова, передав match_obj.
-        processed_text = regex.sub(pattern=r'\b\p{L}+\b', repl=replace_word_with_hyphenated, string=text)
+        processed_text = tracked_sub(self._long_word_pattern, replace_word_with_hyphenated, text, edits)
 
+        if chars is not None and processed_text != text:
+            chars |= self.produced_chars
         return processed_text
 
 
@@ -0,0 +1,201 @@
+# etpgrf/hyphpatterns.py
+# Переносы по шаблонам Кнута -- Ляна (как в TeX). Файлы шаблонов в формате TeX (например, hyph-ru.tex
+# и hyph-en-us.tex из пакета hyph-utf8 на CTAN) загружаются с диска и один раз компилируются в компактное префиксное
+# дерево на массивах `array`. Все допустимые точки переноса слова находятся за один проход
+# O(длина слова x длина самого длинного шаблона).
+#
+# Шаблон -- буквы с цифрами между ними: "hen5at" означает, что между "hen" и "at" значение 5. Для каждой позиции
+# слова берется максимум значений всех подходящих шаблонов, и перенос допустим там, где максимум нечетный.
+# Точка в начале или в конце шаблона обозначает границу слова.
+
+import functools
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+
+_WORD_BOUNDARY = '.'
+_NO_VALUES = 0xFFFFFFFF      # У узла нет значений (шаблон в нем не заканчивается)
+
+
+def parse_pattern_file(text: str) -> tuple[list[str], list[str]]:
+    """
+    Разбирает файл шаблонов переносов.
+
+    Поддерживается формат TeX (блоки `\\patterns{...}` и `\\hyphenation{...}`, комментарии после `%`) и простой
+    текстовый формат: шаблоны через пробельные символы (например, hyph-ru.pat.txt из hyph-utf8).
+
+    :param text: Содержимое файла.
+    :return: (шаблоны, исключения). Исключения -- слова с явными переносами через дефис ("ta-ble").
+    """
+    lines = []
+    for line in text.splitlines():
+        comment = line.find('%')
+        lines.append(line if comment < 0 else line[:comment])
+    text = '\n'.join(lines)
+    blocks = {'patterns': [], 'hyphenation': []}
+    found = False
+    for name, tokens in blocks.items():
+        start = 0
+        while (start := text.find(f'\\{name}{{', start)) >= 0:
+            start += len(name) + 2
+            end = text.find('}', start)
+            if end < 0:
+                raise ValueError(f"etpgrf: не закрыт блок \\{name} в файле шаблонов переносов")
+            tokens.extend(text[start:end].split())
+            found = True
+            start = end
+    if not found:
+        return text.split(), []
+    return blocks['patterns'], blocks['hyphenation']
+
+
+class PatternTrie:
+    """
+    Шаблоны переносов, скомпилированные в префиксное дерево на массивах (только чтение, потокобезопасно).
+
+    Узел `n` -- это срез `[first_edge[n], first_edge[n + 1])` массивов ребер: коды символов (отсортированы, поиск
+    дочернего узла -- двоичный поиск) и номера дочерних узлов. Значения шаблона, заканчивающегося в узле, лежат
+    в общем массиве байтов `values` со смещения `value_start[n]` (длина шаблона + 1 байт).
+    """
+    __slots__ = ('_first_edge', '_edge_chars', '_edge_targets', '_value_start', '_values', '_exceptions',
+                 'max_pattern_len', 'pattern_count', 'digest')
+
+    def __init__(self, patterns: list[str], exceptions: list[str] | tuple[str, ...] = ()):
+        """
+        :param patterns: Шаблоны в формате TeX ("hen5at", ".ach4").
+        :param exceptions: Слова с явными переносами ("ta-ble").
+        """
+        # 1. Дерево на словарях (только на время компиляции)
+        nodes: list[dict[str, int]] = [{}]
+        node_values: dict[int, bytes] = {}
+        max_len = 0
+        for pattern in patterns:
+            letters = []
+            digits = [0]
+            for char in pattern:
+                if char.isdigit():
+                    digits[-1] = int(char)
+                else:
+                    letters.append(char.lower())
+                    digits.append(0)
+            if not letters:
+                continue
+            node = 0
+            for char in letters:
+                child = nodes[node].get(char)
+                if child is None:
+                    child = nodes[node][char] = len(nodes)
+                    nodes.append({})
+                node = child
+            previous = node_values.get(node)
+            if previous is not None:
+                # Повтор шаблона с другими значениями (TeX считает это ошибкой) -- берем максимум
+                digits = [max(pair) for pair in zip(previous, digits)]
+            node_values[node] = bytes(digits)
+            max_len = max(max_len, len(letters))
+
+        # 2. Упаковка в массивы
+        self._first_edge = array('I', [0])
+        self._edge_chars = array('I')
+        self._edge_targets = array('I')
+        self._value_start = array('I')
+        self._values = bytearray()
+        for node, children in enumerate(nodes):
+            for char in sorted(children):
+                self._edge_chars.append(ord(char))
+                self._edge_targets.append(children[char])
+            self._first_edge.append(len(self._edge_chars))
+            values = node_values.get(node)
+            if values is None:
+                self._value_start.append(_NO_VALUES)
+            else:
+                self._value_start.append(len(self._values))
+                self._values += values
+        self._values = bytes(self._values)
+        self.max_pattern_len = max_len
+        self.pattern_count = len(node_values)
+        # Хэш содержимого файла шаблонов (задает `load_patterns`; None -- дерево создано не из файла)
+        self.digest: str | None = None
+
+        # 3. Исключения: слово в нижнем регистре -> позиции переносов
+        self._exceptions: dict[str, tuple[int, ...]] = {}
+        for exception in exceptions:
+            parts = exception.lower().split('-')
+            positions = []
+            length = 0
+            for part in parts[:-1]:
+                length += len(part)
+                positions.append(length)
+            self._exceptions[''.join(parts)] = tuple(positions)
+
+    def break_points(self, word: str) -> list[int]:
+        """
+        Все допустимые точки переноса слова (без учета минимальной длины частей).
+
+        :param word: Слово.
+        :return: Отсортированные индексы символов слова, перед которыми допустим перенос.
+        """
+        lowered = word.lower()
+        if len(lowered) != len(word):
+            return []       # Перевод в нижний регистр изменил длину слова: позиции не сопоставить
+        exception = self._exceptions.get(lowered)
+        if exception is not None:
+            return list(exception)
+        codes = [ord(char) for char in f'{_WORD_BOUNDARY}{lowered}{_WORD_BOUNDARY}']
+        length = len(codes)
+        points = bytearray(length + 1)
+        # Горячий цикл: поиск дочернего узла (`_child`) встроен, атрибуты -- в локальных переменных
+        first_edge = self._first_edge
+        edge_chars = self._edge_chars
+        edge_targets = self._edge_targets
+        value_start = self._value_start
+        values = self._values
+        max_pattern_len = self.max_pattern_len
+        for start in range(length):
+            node = 0
+            for end in range(start, min(length, start + max_pattern_len)):
+                first, last = first_edge[node], first_edge[node + 1]
+                code = codes[end]
+                index = bisect_left(edge_chars, code, first, last)
+                if index == last or edge_chars[index] != code:
+                    break
+                node = edge_targets[index]
+                offset = value_start[node]
+                if offset != _NO_VALUES:
+                    for k in range(end - start + 2):
+                        value = values[offset + k]
+                        if value > points[start + k]:
+                            points[start + k] = value
+        # points[i] -- значение перед text[i]; символ слова word[p] -- это text[p + 1]
+        return [position for position in range(1, len(word)) if points[position + 1] % 2]
+
+
+@functools.lru_cache(maxsize=16)
+def _load_trie(path: str, mtime_ns: int, size: int) -> PatternTrie:
+    with open(path, 'rb') as file:
+        data = file.read()
+    patterns, exceptions = parse_pattern_file(data.decode('utf-8'))
+    if not patterns:
+        raise ValueError(f"etpgrf: в файле шаблонов переносов нет шаблонов: {path}")
+    trie = PatternTrie(patterns, exceptions)
+    trie.digest = blake2b(data, digest_size=16).hexdigest()
+    return trie
+
+
+_load_lock = threading.Lock()
+
+
+def load_patterns(path: str | os.PathLike) -> PatternTrie:
+    """
+    Загружает и компилирует файл шаблонов переносов. Скомпилированное дерево общее для всех, кто загружает тот же
+    (неизмененный) файл.
+
+    :param path: Путь к файлу шаблонов в формате TeX или простом текстовом формате (UTF-8).
+    :return: Скомпилированные шаблоны.
+    """
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    with _load_lock:
+        return _load_trie(path, stat.st_mtime_ns, stat.st_size)
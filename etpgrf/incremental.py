@@ -0,0 +1,310 @@
+# etpgrf/incremental.py
+# Модуль инкрементальной обработки: при повторном сохранении документа, в котором изменился один абзац,
+# заново обрабатываются только измененные блоки (абзацы простого текста или блочные элементы HTML верхнего уровня),
+# а результат для неизмененных блоков берется из предыдущего результата как есть.
+#
+# Блоки сопоставляются по порядку: входной текст и результат его обработки режутся на блоки одинаково (обработка
+# не меняет блочную структуру HTML, а абзацы простого текста может только "склеить"), и если блоки сопоставить
+# не удалось, делается полная обработка. Граница между измененной и неизмененной частью документа допускается только там, где обработка
+# частей по отдельности совпадает с обработкой целого (как в потоковом режиме, см. `etpgrf.streaming`): иначе
+# измененная область расширяется на соседний блок. Так правила с контекстом (кавычки, неразрывные пробелы,
+# тире в начале абзаца) получают столько соседнего текста, сколько им нужно.
+
+import html
+import logging
+import regex
+from html.parser import HTMLParser
+from collections.abc import Callable
+from etpgrf.streaming import _PARAGRAPH_BREAK_PATTERN, is_safe_cut
+from etpgrf.config import BLOCK_HTML_TAGS, VOID_HTML_TAGS
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Все, кроме букв и цифр
+_NON_LETTERS_PATTERN = regex.compile(r'[^\p{L}\p{N}]+')
+
+
+# --- Нарезка на блоки ---
+
+def split_plain_text(text: str) -> tuple[list[str], list[str]]:
+    """
+    Режет простой текст на абзацы. Абзацный разрыв относится к предшествующему абзацу.
+
+    :param text: Текст.
+    :return: Пара (блоки, подписи блоков). Конкатенация блоков равна тексту. Подпись блока -- его абзацный разрыв
+             (у последнего блока -- пустая строка).
+    """
+    blocks = []
+    signatures = []
+    pos = 0
+    for match in _PARAGRAPH_BREAK_PATTERN.finditer(text):
+        if match.start() == 0:
+            # Пробельные символы в начале текста -- часть первого абзаца
+            continue
+        blocks.append(text[pos:match.end()])
+        signatures.append(match.group())
+        pos = match.end()
+    if pos < len(text) or not blocks:
+        blocks.append(text[pos:])
+        signatures.append('')
+    return blocks, signatures
+
+
+class _TopLevelBlockParser(HTMLParser):
+    """
+    Находит позиции блочных элементов верхнего уровня в HTML (начало открывающего и конец закрывающего тега).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.depth = 0
+        self.blocks: list[tuple[str, tuple[int, int], tuple[int, int] | None]] = []
+        self._open_block = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_HTML_TAGS:
+            self.handle_startendtag(tag, attrs)
+            return
+        if self.depth == 0 and tag in BLOCK_HTML_TAGS:
+            self._open_block = (tag, self.getpos())
+        self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth == 0 and tag in BLOCK_HTML_TAGS:
+            self.blocks.append((tag, self.getpos(), None))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_HTML_TAGS:
+            return
+        self.depth -= 1
+        if self.depth == 0 and self._open_block is not None:
+            open_tag, start = self._open_block
+            self.blocks.append((open_tag, start, self.getpos()))
+            self._open_block = None
+        elif self.depth < 0:
+            # Лишний закрывающий тег -- структура не распознана
+            raise ValueError("etpgrf: непарный закрывающий тег")
+
+
+def split_html(text: str) -> tuple[list[str], list[str]]:
+    """
+    Режет HTML на блоки по блочным элементам верхнего уровня. Текст и строчные элементы между ними -- отдельные
+    блоки, а пробельные символы между блоками относятся к предшествующему блоку.
+
+    :param text: HTML.
+    :return: Пара (блоки, подписи блоков). Конкатенация блоков равна тексту. Подпись блока -- имя блочного тега
+             (у текста между блоками -- пустая строка).
+    :raises ValueError: Если структуру документа не удалось разобрать (например, незакрытые теги).
+    """
+    parser = _TopLevelBlockParser()
+    parser.feed(text)
+    parser.close()
+    if parser.depth != 0:
+        raise ValueError("etpgrf: незакрытые теги")
+    # Переводим позиции (строка, столбец) в смещения
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+
+    def to_offset(line_col: tuple[int, int]) -> int:
+        return line_starts[line_col[0] - 1] + line_col[1]
+
+    blocks = []
+    signatures = []
+    pos = 0
+    for tag, start, end in parser.blocks:
+        start_offset = to_offset(start)
+        # Конец блока -- конец закрывающего тега (или самого тега, если он без пары)
+        end_offset = text.index('>', to_offset(end if end is not None else start)) + 1
+        between = text[pos:start_offset]
+        if between.strip():
+            blocks.append(between)
+            signatures.append('')
+        elif between and blocks:
+            blocks[-1] += between
+        else:
+            start_offset = pos
+        blocks.append(text[start_offset:end_offset])
+        signatures.append(tag)
+        pos = end_offset
+    tail = text[pos:]
+    if tail.strip() or not blocks:
+        blocks.append(tail)
+        signatures.append('')
+    elif tail:
+        blocks[-1] += tail
+    return blocks, signatures
+
+
+def _text_letters(text: str, symbols=None) -> str:
+    """
+    Оставляет от текста только буквы и цифры: "подпись" содержимого абзаца. Псевдографику, которая превращается
+    в символы (например, "(c)"), заранее заменяет обработчиком `symbols`, если он задан.
+    """
+    text = html.unescape(text)
+    if symbols is not None:
+        text = symbols.process(text)
+    return _NON_LETTERS_PATTERN.sub('', text)
+
+
+def _group_plain_blocks(in_blocks: list[str],
+                        in_signatures: list[str],
+                        out_blocks: list[str],
+                        out_signatures: list[str],
+                        symbols=None) -> tuple[list[str], list[str], list[int]]:
+    """
+    Сопоставляет абзацы входного текста абзацам результата. Обработка может "склеить" абзацы (например, предлог
+    в конце абзаца приклеивается неразрывным пробелом к следующему), поэтому одному абзацу результата может
+    соответствовать группа из нескольких входных абзацев. Абзацы сравниваются по буквам и цифрам и по абзацному
+    разрыву в конце.
+
+    :param symbols: SymbolsProcessor типографа (или None), которым нормализуются входные абзацы.
+    :return: Тройка (группы входных абзацев, их подписи, число абзацев в каждой группе). Группы сопоставлены
+             с `out_blocks` один к одному.
+    :raises ValueError: Если сопоставить не удалось.
+    """
+    groups = []
+    signatures = []
+    sizes = []
+    pos = 0
+    for out_block, out_signature in zip(out_blocks, out_signatures):
+        target = _text_letters(out_block)
+        letters = ''
+        start = pos
+        while pos < len(in_blocks) and (pos == start or len(letters) < len(target)
+                                        or in_signatures[pos - 1] != out_signature):
+            letters += _text_letters(in_blocks[pos], symbols)
+            pos += 1
+        if letters != target or in_signatures[pos - 1] != out_signature:
+            raise ValueError("абзацы результата не совпадают с абзацами входа")
+        groups.append(''.join(in_blocks[start:pos]))
+        signatures.append(out_signature)
+        sizes.append(pos - start)
+    if pos != len(in_blocks):
+        raise ValueError("абзацы результата не совпадают с абзацами входа")
+    return groups, signatures, sizes
+
+
+# --- Проверка границ ---
+
+def _plain_boundary_checker(process: Callable[[str], str],
+                            blocks: list[str],
+                            signatures: list[str]) -> Callable[[int], bool]:
+    """
+    Возвращает функцию проверки: можно ли резать простой текст перед блоком `i` (по абзацному разрыву).
+    """
+    text = ''.join(blocks)
+    offsets = [0]
+    for block in blocks:
+        offsets.append(offsets[-1] + len(block))
+
+    def is_safe(i: int) -> bool:
+        if i <= 0 or i >= len(blocks):
+            return True     # Начало и конец документа -- всегда безопасные границы
+        return is_safe_cut(process, text, offsets[i] - len(signatures[i - 1]), offsets[i])
+
+    return is_safe
+
+
+def _html_boundary_checker(process: Callable[[str], str],
+                           blocks: list[str],
+                           signatures: list[str]) -> Callable[[int], bool]:
+    """
+    Возвращает функцию проверки: можно ли резать HTML перед блоком `i` (обработка двух соседних блоков вместе
+    совпадает с обработкой по отдельности).
+    """
+    def is_safe(i: int) -> bool:
+        if i <= 0 or i >= len(blocks):
+            return True     # Начало и конец документа -- всегда безопасные границы
+        return process(blocks[i - 1] + blocks[i]) == process(blocks[i - 1]) + process(blocks[i])
+
+    return is_safe
+
+
+# --- Инкрементальная обработка ---
+
+def process_incremental(typographer, old_text: str, old_output: str, new_text: str) -> str:
+    """
+    Обрабатывает новую версию документа, переиспользуя результат обработки предыдущей версии.
+
+    :param typographer: Настроенный Typographer (тот же, которым получен `old_output`).
+    :param old_text: Предыдущая версия входного документа.
+    :param old_output: Результат обработки `old_text`.
+    :param new_text: Новая версия входного документа.
+    :return: Результат обработки `new_text` (совпадает с `typographer.process(new_text)`).
+    """
+    if not new_text:
+        return ""
+    if not old_text or not old_output:
+        return typographer.process(new_text)
+    if new_text == old_text:
+        return old_output
+
+    # Результаты обработки фрагментов запоминаем: одни и те же блоки нужны и для проверки границ, и для ответа
+    memo = {}
+
+    def process(fragment: str) -> str:
+        result = memo.get(fragment)
+        if result is None:
+            result = memo[fragment] = typographer.process(fragment)
+        return result
+
+    if typographer.process_html:
+        split, make_checker = split_html, _html_boundary_checker
+    else:
+        split, make_checker = split_plain_text, _plain_boundary_checker
+    try:
+        old_units, old_unit_signatures = split(old_text)
+        out_blocks, out_signatures = split(old_output)
+        new_units, new_signatures = split(new_text)
+        if typographer.process_html:
+            # Обработка HTML не объединяет и не разделяет блочные элементы: блоки сопоставляются один к одному
+            if old_unit_signatures != out_signatures:
+                raise ValueError("блочная структура результата не совпадает со структурой входа")
+            old_blocks, old_signatures, sizes = old_units, old_unit_signatures, [1] * len(old_units)
+        else:
+            old_blocks, old_signatures, sizes = _group_plain_blocks(old_units, old_unit_signatures,
+                                                                    out_blocks, out_signatures, typographer.symbols)
+    except (ValueError, AssertionError) as e:
+        # Блоки результата не сопоставляются с блоками входа (например, санитайзер убрал разметку)
+        logger.debug(f"process_incremental: не удалось сопоставить блоки ({e}), полная обработка")
+        return typographer.process(new_text)
+
+    # 1. Ищем измененную область: общие блоки в начале и в конце документа. Блок старой версии может состоять из
+    #    нескольких абзацев (`sizes`), если обработка "склеила" их, поэтому сравниваем его с группой абзацев
+    #    новой версии.
+    start, new_start = 0, 0
+    while (start < len(old_blocks) and new_start + sizes[start] <= len(new_units)
+           and ''.join(new_units[new_start:new_start + sizes[start]]) == old_blocks[start]):
+        new_start += sizes[start]
+        start += 1
+    old_end, new_end = len(old_blocks), len(new_units)
+    while (old_end > start and new_end - sizes[old_end - 1] >= new_start
+           and ''.join(new_units[new_end - sizes[old_end - 1]:new_end]) == old_blocks[old_end - 1]):
+        old_end -= 1
+        new_end -= sizes[old_end]
+
+    # 2. Расширяем область, пока ее границы не станут "безопасными" и в старой, и в новой версии
+    old_is_safe = make_checker(process, old_blocks, old_signatures)
+    new_is_safe = make_checker(process, new_units, new_signatures)
+    while start > 0 and not (old_is_safe(start) and new_is_safe(new_start)):
+        start -= 1
+        new_start -= sizes[start]
+    while old_end < len(old_blocks) and not (old_is_safe(old_end) and new_is_safe(new_end)):
+        new_end += sizes[old_end]
+        old_end += 1
+
+    # 3. Проверяем сопоставление блоков: соседние с областью блоки старого результата должны совпадать
+    #    с обработкой соответствующих блоков старого входа
+    if ((start > 0 and process(old_blocks[start - 1]) != out_blocks[start - 1])
+            or (old_end < len(old_blocks) and process(old_blocks[old_end]) != out_blocks[old_end])):
+        logger.debug("process_incremental: блоки результата не соответствуют блокам входа, полная обработка")
+        return typographer.process(new_text)
+
+    # 4. Собираем результат: неизмененные блоки -- из старого результата, измененная область -- заново
+    changed = ''.join(new_units[new_start:new_end])
+    logger.debug(f"process_incremental: блоков: {len(new_units)}, заново обработано: {new_end - new_start}")
+    return ''.join(out_blocks[:start]) + (process(changed) if changed else '') + ''.join(out_blocks[old_end:])
@@ -7,7 +7,9 @@ from etpgrf.config import (LANG_RU, LANG_EN, CHAR_NBSP, CHAR_THIN_SP, CHAR_NDASH
                            CHAR_UNIT_SEPARATOR, DEFAULT_POST_UNITS, DEFAULT_PRE_UNITS, UNIT_MATH_OPERATORS,
                            ABBR_COMMON_FINAL, ABBR_COMMON_PREPOSITION)
 
-from etpgrf.comutil import parse_and_validate_langs
+from etpgrf.comutil import parse_and_validate_langs, RuleTrigger, WHITESPACE_CHARS
+from etpgrf.textmap import EditLog, tracked_sub, tracked_replace
+from etpgrf.budget import regex_timeout
 
 
 
@@ -54,15 +56,17 @@ class LayoutProcessor:
         # 4. Паттерны для обработки инициалов и акронимов.
         # \p{Lu} - любая заглавная буква в Unicode.
 
-        # Правила для случаев, когда пробел УЖЕ ЕСТЬ (заменяем на неразрывный)
+        # Правила для случаев, когда пробел УЖЕ ЕСТЬ (заменяем на неразрывный).
         # Используем ` +` (пробел) вместо `\s+`, чтобы не заменять уже вставленные тонкие пробелы.
-        self._initial_to_initial_ws_pattern = regex.compile(r'(\p{Lu}\.) +(?=\p{Lu}\.)')
-        self._initial_to_surname_ws_pattern = regex.compile(r'(\p{Lu}\.) +(?=\p{Lu}\p{L}{1,})')
-        self._surname_to_initial_ws_pattern = regex.compile(r'(\p{Lu}\p{L}{2,}) +(?=\p{Lu}\.)')
+        # Три правила ("инициал -- инициал", "инициал -- фамилия", "фамилия -- инициал") объединены в один проход:
+        # они срабатывают на непересекающихся местах, поэтому результат тот же, что и у трех проходов подряд.
+        # (?|...|...) -- "сброс номеров групп" (branch reset): в обеих ветках захваченный текст -- группа 1.
+        self._initials_ws_pattern = regex.compile(r'(?|(\p{Lu}\.) +(?=\p{Lu}(?:\.|\p{L}))'
+                                                  r'|(\p{Lu}\p{L}{2,}) +(?=\p{Lu}\.))')
 
-        # Правила для случаев, когда пробела НЕТ (вставляем тонкий пробел)
-        self._initial_to_initial_ns_pattern = regex.compile(r'(\p{Lu}\.)(?=\p{Lu}\.)')
-        self._initial_to_surname_ns_pattern = regex.compile(r'(\p{Lu}\.)(?=\p{Lu}\p{L}{1,})')
+        # Правила для случаев, когда пробела НЕТ (вставляем тонкий пробел): "инициал -- инициал"
+        # и "инициал -- фамилия" в один проход.
+        self._initials_ns_pattern = regex.compile(r'(\p{Lu}\.)(?=\p{Lu}(?:\.|\p{L}))')
 
         # Вся логика обработки финальных сокращений перенесена в метод process для надежной итеративной обработки
 
@@ -96,9 +100,10 @@ class LayoutProcessor:
 
                 # Простые единицы: число + единица
                 self._post_units_pattern = regex.compile(rf'({self._NUMBER_PATTERN})\s+({units_pattern_part_full})(?!\w)')
-                # Составные единицы: ищет пару "единица." + "единица"
-                self._complex_unit_pattern = regex.compile(r'\b(' + units_pattern_part_clean + r')\.(\s*)('
-                                                           + units_pattern_part_clean + r')(?!\w)')
+                # Составные единицы: ищет пару "единица." + "единица". Вторая единица -- в просмотре вперед,
+                # чтобы цепочки ("кв. м. ч.") склеивались за один проход: поиск продолжается со второй единицы.
+                self._complex_unit_pattern = regex.compile(r'\b(' + units_pattern_part_clean + r')\.(\s*)(?=('
+                                                           + units_pattern_part_clean + r')(?!\w))')
                 # Математические операции между единицами
                 math_ops_pattern = '|'.join(map(regex.escape, UNIT_MATH_OPERATORS))
                 self._math_unit_pattern = regex.compile(
@@ -109,12 +114,95 @@ class LayoutProcessor:
             self._pre_units_pattern = regex.compile(
                 r'(?<![\p{L}\p{N}])(' + '|'.join(map(regex.escape, DEFAULT_PRE_UNITS)) + rf')\s+({self._NUMBER_PATTERN})')
 
+        # 8. Паттерны для сокращений (компилируются один раз, а не при каждом вызове `process`).
+        self._final_abbr_patterns = self._compile_abbreviations(ABBR_COMMON_FINAL, 'final')
+        self._preposition_abbr_patterns = self._compile_abbreviations(ABBR_COMMON_PREPOSITION, 'prepositional')
+
+        # 9. Таблица правил в порядке применения: (условия применимости, символы, которые правило может
+        # добавить, функция обработки). Правило выполняется, если выполнено ХОТЯ БЫ ОДНО из его условий.
+        separator_trigger = RuleTrigger(CHAR_UNIT_SEPARATOR)
+        self._rules = [
+            # 1. Пробелы вокруг тире
+            ((RuleTrigger(CHAR_MDASH + CHAR_NDASH, WHITESPACE_CHARS, min_len=5),),
+             frozenset((CHAR_NBSP, ' ')),
+             self._apply_dash),
+            # 2. Пробел после многоточия
+            ((RuleTrigger(CHAR_HELLIP, WHITESPACE_CHARS, min_len=3),),
+             frozenset((CHAR_NBSP,)),
+             self._apply_ellipsis),
+            # 3. Пробел перед отрицательными числами/минусом
+            ((RuleTrigger('-', WHITESPACE_CHARS, RuleTrigger.DIGITS, min_len=3),),
+             frozenset((CHAR_NBSP,)),
+             self._apply_negative_numbers),
+            # 4. Сокращения (сравнение без учета регистра, "склейка" заменяет найденное на каноничное написание)
+            ((RuleTrigger({abbr[0] for abbr in ABBR_COMMON_FINAL}, ignore_case=True), separator_trigger),
+             frozenset(CHAR_NBSP + CHAR_THIN_SP + ''.join(ABBR_COMMON_FINAL)),
+             self._apply_final_abbreviations),
+            ((RuleTrigger({abbr[0] for abbr in ABBR_COMMON_PREPOSITION}, ignore_case=True), separator_trigger),
+             frozenset(CHAR_NBSP + CHAR_THIN_SP + ''.join(ABBR_COMMON_PREPOSITION)),
+             self._apply_preposition_abbreviations),
+        ]
+        # 5. Инициалы и акронимы (если включено)
+        if self.process_initials_and_acronyms:
+            self._rules += [
+                # Сначала вставляем тонкие пробелы там, где пробелов не было.
+                ((RuleTrigger('.', min_len=3),),
+                 frozenset((CHAR_THIN_SP,)),
+                 self._apply_initials_ns),
+                # Затем заменяем существующие пробелы на неразрывные.
+                ((RuleTrigger(' ', '.', min_len=4),),
+                 frozenset((CHAR_NBSP,)),
+                 self._apply_initials_ws),
+            ]
+        # 6. Единицы измерения (если включено)
+        if self.process_units:
+            if self._complex_unit_pattern:
+                # "Склеиваем" все составные единицы с помощью временного разделителя. Один проход: вторая
+                # единица пары не поглощается (просмотр вперед), поэтому она может стать первой единицей
+                # следующей пары.
+                self._rules.append(((RuleTrigger('.'),),
+                                    frozenset((CHAR_UNIT_SEPARATOR,)),
+                                    self._apply_complex_units))
+            if self._math_unit_pattern:
+                self._rules.append(((RuleTrigger(''.join(UNIT_MATH_OPERATORS)),),
+                                    frozenset(),
+                                    self._apply_math_units))
+            # И только потом привязываем простые единицы к числам
+            number_triggers = (RuleTrigger(RuleTrigger.DIGITS, WHITESPACE_CHARS, min_len=2),
+                               RuleTrigger('IVXLCDM', WHITESPACE_CHARS, min_len=2))
+            if self._post_units_pattern:
+                self._rules.append((number_triggers,
+                                    frozenset((CHAR_NBSP,)),
+                                    self._apply_post_units))
+            if self._pre_units_pattern:
+                self._rules.append(((RuleTrigger({unit[0] for unit in DEFAULT_PRE_UNITS}, WHITESPACE_CHARS,
+                                                 min_len=3),),
+                                    frozenset((CHAR_NBSP,)),
+                                    self._apply_pre_units))
+            # Заменяем все временные разделители на правильную тонкую шпацию.
+            self._rules.append(((separator_trigger,),
+                                frozenset((CHAR_THIN_SP,)),
+                                self._apply_unit_separator))
+        # Все символы, которые могут появиться в тексте после обработки
+        self.produced_chars = frozenset().union(*(produced for _, produced, _ in self._rules))
+
         logger.debug(f"LayoutProcessor `__init__`. "
                      f"Langs: {self.langs}, "
                      f"Main lang: {self.main_lang}, "
                      f"Process initials and acronyms: {self.process_initials_and_acronyms}, "
                      f"Process units: {bool(self.process_units)}")
 
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        process_units = self.process_units
+        if isinstance(process_units, (list, tuple, set, frozenset)):
+            process_units = sorted(process_units)
+        return {'langs': list(self.langs),
+                'process_initials_and_acronyms': self.process_initials_and_acronyms,
+                'process_units': process_units}
+
     def _replace_dash_spacing(self, match: regex.Match) -> str:
         """Callback-функция для расстановки пробелов вокруг тире с учетом языка."""
         dash = match.group(1)  # Получаем сам символ тире (— или –)
@@ -124,88 +212,142 @@ class LayoutProcessor:
         # По умолчанию (и для русского) — отбивка пробелами.
         return f'{CHAR_NBSP}{dash} '
 
-    def _process_abbreviations(self, text: str, abbreviations: list[str], mode: str) -> str:
+    @staticmethod
+    def _compile_abbreviations(abbreviations: list[str], mode: str) -> tuple:
         """
-        Универсальный обработчик для разных типов сокращений.
+        Компилирует паттерны для обработки сокращений (см. `_process_abbreviations`).
 
-        :param text: Входной текст.
         :param abbreviations: Список сокращений для обработки.
         :param mode: 'final' (NBSP ставится перед) или 'prepositional' (NBSP ставится после).
-        :return: Обработанный текст.
+        :return: Кортеж (паттерн-детектор многосоставных сокращений или None,
+                         список пар (паттерн, замена) для "склейки" многосоставных сокращений,
+                         паттерн расстановки неразрывного пробела и замена для него).
         """
-        processed_text = text
-
-        # Шаг 1: "Склеиваем" многосоставные сокращения временным разделителем CHAR_UNIT_SEPARATOR
+        # Многосоставные сокращения, от длинных к коротким
+        glue_patterns = []
         for abbr in sorted(abbreviations, key=len, reverse=True):
             if ' ' in abbr:
                 pattern = regex.escape(abbr).replace(r'\ ', r'\s*')
-                replacement = abbr.replace(' ', CHAR_UNIT_SEPARATOR)
-                processed_text = regex.sub(pattern, replacement, processed_text, flags=regex.IGNORECASE)
+                glue_patterns.append((regex.compile(pattern, flags=regex.IGNORECASE),
+                                      abbr.replace(' ', CHAR_UNIT_SEPARATOR)))
+        # Детектор: если в тексте нет ни одного многосоставного сокращения, "склейку" можно пропустить целиком
+        glue_detector = None
+        if glue_patterns:
+            glue_detector = regex.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _ in glue_patterns),
+                                          flags=regex.IGNORECASE)
 
-        # Шаг 2: Ставим неразрывный пробел.
         glued_abbrs = [a.replace(' ', CHAR_UNIT_SEPARATOR) for a in abbreviations]
         all_abbrs_pattern = '|'.join(map(regex.escape, sorted(glued_abbrs, key=len, reverse=True)))
-
         if mode == 'final':
             # Ставим nbsp перед сокращением, если перед ним есть пробел
             nbsp_pattern = regex.compile(r'(\s)(' + all_abbrs_pattern + r')(?=[.,!?]|\s|$)', flags=regex.IGNORECASE)
-            processed_text = nbsp_pattern.sub(fr'{CHAR_NBSP}\2', processed_text)
-        elif mode == 'prepositional':
+            nbsp_replacement = fr'{CHAR_NBSP}\2'
+        else:
             # Ставим nbsp после сокращения, если после него есть пробел
             nbsp_pattern = regex.compile(r'(' + all_abbrs_pattern + r')(\s)', flags=regex.IGNORECASE)
-            processed_text = nbsp_pattern.sub(fr'\1{CHAR_NBSP}', processed_text)
+            nbsp_replacement = fr'\1{CHAR_NBSP}'
+        return glue_detector, glue_patterns, nbsp_pattern, nbsp_replacement
+
+    def _process_abbreviations(self, text: str, compiled: tuple, edits: EditLog | None = None) -> str:
+        """
+        Универсальный обработчик для разных типов сокращений.
+
+        :param text: Входной текст.
+        :param compiled: Скомпилированные паттерны (см. `_compile_abbreviations`).
+        :param edits: Журнал правок (необязательно).
+        :return: Обработанный текст.
+        """
+        glue_detector, glue_patterns, nbsp_pattern, nbsp_replacement = compiled
+        processed_text = text
+
+        # Шаг 1: "Склеиваем" многосоставные сокращения временным разделителем CHAR_UNIT_SEPARATOR
+        if glue_detector is not None and glue_detector.search(processed_text, timeout=regex_timeout()):
+            for pattern, replacement in glue_patterns:
+                processed_text = tracked_sub(pattern, replacement, processed_text, edits)
+
+        # Шаг 2: Ставим неразрывный пробел.
+        processed_text = tracked_sub(nbsp_pattern, nbsp_replacement, processed_text, edits)
 
         # Шаг 3: Заменяем временный разделитель на правильную тонкую шпацию
-        return processed_text.replace(CHAR_UNIT_SEPARATOR, CHAR_THIN_SP)
-
-    def process(self, text: str) -> str:
-         """Применяет правила компоновки к тексту."""
-         # Порядок применения правил важен.
-         processed_text = text
-
-         # 1. Обработка пробелов вокруг тире.
-         processed_text = self._dash_pattern.sub(self._replace_dash_spacing, processed_text)
-
-         # 2. Обработка пробела после многоточия.
-         processed_text = self._ellipsis_pattern.sub(f'\\1{CHAR_NBSP}', processed_text)
-
-         # 3. Обработка пробела перед отрицательными числами/минусом.
-         processed_text = self._negative_number_pattern.sub(f'{CHAR_NBSP}-\\1', processed_text)
-
-         # 4. Обработка сокращений.
-         processed_text = self._process_abbreviations(processed_text, ABBR_COMMON_FINAL, 'final')
-         processed_text = self._process_abbreviations(processed_text, ABBR_COMMON_PREPOSITION, 'prepositional')
-
-         # 5. Обработка инициалов и акронимов (если включено).
-         if self.process_initials_and_acronyms:
-             # Сначала вставляем тонкие пробелы там, где пробелов не было.
-             processed_text = self._initial_to_initial_ns_pattern.sub(f'\\1{CHAR_THIN_SP}', processed_text)
-             processed_text = self._initial_to_surname_ns_pattern.sub(f'\\1{CHAR_THIN_SP}', processed_text)
-
-             # Затем заменяем существующие пробелы на неразрывные.
-             processed_text = self._initial_to_initial_ws_pattern.sub(f'\\1{CHAR_NBSP}', processed_text)
-             processed_text = self._initial_to_surname_ws_pattern.sub(f'\\1{CHAR_NBSP}', processed_text)
-             processed_text = self._surname_to_initial_ws_pattern.sub(f'\\1{CHAR_NBSP}', processed_text)
-
-         # 6. Обработка единиц измерения (если включено).
-         if self.process_units:
-             if self._complex_unit_pattern:
-                # Шаг 1: "Склеиваем" все составные единицы с помощью временного разделителя.
-                # Цикл безопасен, так как мы заменяем пробелы на непробельный символ, и паттерн не найдет себя снова.
-                while self._complex_unit_pattern.search(processed_text):
-                    processed_text = self._complex_unit_pattern.sub(
-                        fr'\1.{CHAR_UNIT_SEPARATOR}\3', processed_text, count=1)
-
-             if self._math_unit_pattern:
-                 # processed_text = self._math_unit_pattern.sub(r'\1/\2', processed_text)
-                 processed_text = self._math_unit_pattern.sub(r'\1\2\3', processed_text)
-             # И только потом привязываем простые единицы к числам
-             if self._post_units_pattern:
-                 processed_text = self._post_units_pattern.sub(f'\\1{CHAR_NBSP}\\2', processed_text)
-             if self._pre_units_pattern:
-                 processed_text = self._pre_units_pattern.sub(f'\\1{CHAR_NBSP}\\2', processed_text)
-
-             # Шаг 2: Заменяем все временные разделители на правильную тонкую шпацию.
-             processed_text = processed_text.replace(CHAR_UNIT_SEPARATOR, CHAR_THIN_SP)
-
-         return processed_text
+        return tracked_replace(processed_text, CHAR_UNIT_SEPARATOR, CHAR_THIN_SP, edits)
+
+    def _apply_dash(self, text: str, edits: EditLog | None = None) -> str:
+        """Пробелы вокруг тире."""
+        return tracked_sub(self._dash_pattern, self._replace_dash_spacing, text, edits)
+
+    def _apply_ellipsis(self, text: str, edits: EditLog | None = None) -> str:
+        """Неразрывный пробел после многоточия."""
+        return tracked_sub(self._ellipsis_pattern, f'\\1{CHAR_NBSP}', text, edits)
+
+    def _apply_negative_numbers(self, text: str, edits: EditLog | None = None) -> str:
+        """Неразрывный пробел перед отрицательными числами/минусом."""
+        return tracked_sub(self._negative_number_pattern, f'{CHAR_NBSP}-\\1', text, edits)
+
+    def _apply_final_abbreviations(self, text: str, edits: EditLog | None = None) -> str:
+        """Сокращения, которые привязываются к предыдущему слову."""
+        return self._process_abbreviations(text, self._final_abbr_patterns, edits)
+
+    def _apply_preposition_abbreviations(self, text: str, edits: EditLog | None = None) -> str:
+        """Сокращения, которые привязываются к следующему слову."""
+        return self._process_abbreviations(text, self._preposition_abbr_patterns, edits)
+
+    def _apply_initials_ns(self, text: str, edits: EditLog | None = None) -> str:
+        """Тонкие пробелы между инициалами, записанными без пробелов."""
+        return tracked_sub(self._initials_ns_pattern, f'\\1{CHAR_THIN_SP}', text, edits)
+
+    def _apply_initials_ws(self, text: str, edits: EditLog | None = None) -> str:
+        """Неразрывные пробелы вместо обычных у инициалов и фамилий."""
+        return tracked_sub(self._initials_ws_pattern, f'\\1{CHAR_NBSP}', text, edits)
+
+    def _apply_complex_units(self, text: str, edits: EditLog | None = None) -> str:
+        """"Склейка" составных единиц измерения временным разделителем."""
+        return tracked_sub(self._complex_unit_pattern, fr'\1.{CHAR_UNIT_SEPARATOR}', text, edits)
+
+    def _apply_math_units(self, text: str, edits: EditLog | None = None) -> str:
+        """Удаление пробелов вокруг математических операций между единицами измерения."""
+        return tracked_sub(self._math_unit_pattern, r'\1\2\3', text, edits)
+
+    def _apply_post_units(self, text: str, edits: EditLog | None = None) -> str:
+        """Привязка единиц измерения к числам."""
+        return tracked_sub(self._post_units_pattern, f'\\1{CHAR_NBSP}\\2', text, edits)
+
+    def _apply_pre_units(self, text: str, edits: EditLog | None = None) -> str:
+        """Привязка чисел к пред-позиционным единицам (№, $ и т.п.)."""
+        return tracked_sub(self._pre_units_pattern, f'\\1{CHAR_NBSP}\\2', text, edits)
+
+    def _apply_unit_separator(self, text: str, edits: EditLog | None = None) -> str:
+        """Замена временных разделителей на тонкую шпацию."""
+        return tracked_replace(text, CHAR_UNIT_SEPARATOR, CHAR_THIN_SP, edits)
+
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет по набору символов текста, может ли хотя бы одно правило компоновки что-то изменить.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если текст точно останется без изменений.
+        """
+        return any(trigger.may_apply(chars, length) for triggers, _, _ in self._rules for trigger in triggers)
+
+    def process(self, text: str, chars: set[str] | None = None, edits: EditLog | None = None) -> str:
+        """
+        Применяет правила компоновки к тексту.
+
+        :param text: Текст для обработки.
+        :param chars: Множество символов текста (необязательно). Если не передано, вычисляется по тексту.
+                      Правила, которые не могут сработать на этом тексте, пропускаются, а новые символы
+                      добавляются в это множество.
+        :param edits: Журнал правок (необязательно): замены записываются в него (см. `etpgrf.textmap`).
+        :return: Обработанный текст.
+        """
+        if chars is None:
+            chars = set(text)
+        # Порядок применения правил важен (см. `self._rules`).
+        processed_text = text
+        for triggers, produced, apply in self._rules:
+            if any(trigger.may_apply(chars, len(processed_text)) for trigger in triggers):
+                new_text = apply(processed_text, edits)
+                if new_text is not processed_text:
+                    chars |= produced
+                    processed_text = new_text
+        return processed_text
@@ -6,7 +6,8 @@ import logging
 from .config import (LANG_RU, LANG_EN, CHAR_RU_QUOT1_OPEN, CHAR_RU_QUOT1_CLOSE, CHAR_EN_QUOT1_OPEN,
                      CHAR_EN_QUOT1_CLOSE, CHAR_RU_QUOT2_OPEN, CHAR_RU_QUOT2_CLOSE, CHAR_EN_QUOT2_OPEN,
                      CHAR_EN_QUOT2_CLOSE)
-from .comutil import parse_and_validate_langs
+from .comutil import parse_and_validate_langs, RuleTrigger
+from .textmap import EditLog, tracked_sub
 
 # --- Настройки логирования ---
 logger = logging.getLogger(__name__)
@@ -55,10 +56,44 @@ class QuotesProcessor:
         # self._closing_quote_pattern = regex.compile(r'(?<=\p{L}|\p{N})\"(?=\s|[\.,;:!?\)\"»”’]|\Z)')
         # self._closing_quote_pattern = regex.compile(r'(?<=\p{L}|[?!…])\"(?=\s|[\p{Po}\p{Pf}"\']|\Z)')
 
-    def process(self, text: str) -> str:
+        # Условие применимости: нужна прямая кавычка и хотя бы еще один символ (буква рядом с ней)
+        self._trigger = RuleTrigger('"', min_len=2)
+        # Символы, которые могут появиться в тексте после обработки
+        self.produced_chars = frozenset((self.open_quote, self.close_quote))
+
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        return {'langs': list(self.langs)}
+
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет по набору символов текста, может ли обработка кавычек что-то изменить.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если текст точно останется без изменений.
+        """
+        return self._trigger.may_apply(chars, length)
+
+    def process(self, text: str, chars: set[str] | None = None, edits: EditLog | None = None) -> str:
         """
         Применяет правила замены кавычек к тексту.
+
+        :param text: Текст для обработки.
+        :param chars: Множество символов текста (необязательно). Если передано, обработка пропускается,
+                      когда в тексте нет прямых кавычек, а новые символы добавляются в это множество.
+        :param edits: Журнал правок (необязательно): замены записываются в него (см. `etpgrf.textmap`).
+        :return: Обработанный текст.
         """
+        if chars is not None:
+            if not self._trigger.may_apply(chars, len(text)):
+                return text
+            result = self.process(text, edits=edits)
+            if result is not text:
+                chars |= self.produced_chars
+            return result
         if '"' not in text:
             # Быстрый выход, если в тексте нет прямых кавычек
             return text
@@ -67,9 +102,9 @@ class QuotesProcessor:
 
         # 1. Заменяем открывающие кавычки
         # Заменяем только найденную кавычку, так как просмотр вперед не захватывает символы.
-        processed_text = self._opening_quote_pattern.sub(self.open_quote, processed_text)
+        processed_text = tracked_sub(self._opening_quote_pattern, self.open_quote, processed_text, edits)
 
         # 2. Заменяем закрывающие кавычки
-        processed_text = self._closing_quote_pattern.sub(self.close_quote, processed_text)
+        processed_text = tracked_sub(self._closing_quote_pattern, self.close_quote, processed_text, edits)
 
         return processed_text
\ No newline at end of file
@@ -2,10 +2,13 @@
 # Модуль для очистки и нормализации HTML-кода перед типографикой.
 
 import logging
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
 from .config import (SANITIZE_ALL_HTML, SANITIZE_ETPGRF, SANITIZE_NONE,
                      HANGING_PUNCTUATION_CLASSES, PROTECTED_HTML_TAGS)
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,7 +40,13 @@ class SanitizerProcessor:
 
         logger.debug(f"SanitizerProcessor `__init__`. Mode: {self.mode}")
 
-    def process(self, soup: BeautifulSoup) -> BeautifulSoup | str:
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        return {'mode': self.mode}
+
+    def process(self, soup: 'BeautifulSoup') -> 'BeautifulSoup | str':
         """
         Применяет правила очистки к `soup`-объекту.
 
@@ -0,0 +1,240 @@
+# etpgrf/slowlog.py
+# Запись медленных документов и их повторная обработка. Под реальной нагрузкой время ответа (p99) определяют
+# единичные "патологические" документы, и к моменту разбора их уже нет. SlowDocumentRecorder сохраняет документ,
+# обработка которого заняла больше порога, вместе с конфигурацией типографа и временем этапов в ограниченный
+# каталог (самые старые записи удаляются). Записанные документы можно обработать текущей версией кода и сравнить
+# время:
+#
+#     python -m etpgrf.slowlog /var/tmp/etpgrf-slow
+#     python -m etpgrf.slowlog /var/tmp/etpgrf-slow --repeat 5 -o replay.json
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from hashlib import blake2b
+from typing import TYPE_CHECKING
+from etpgrf.defaults import etpgrf_settings
+from etpgrf.cache import config_fingerprint
+
+if TYPE_CHECKING:
+    from etpgrf.stats import StageTimer
+    from etpgrf.typograph import Typographer
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Формат файла записи (увеличивается при несовместимых изменениях)
+RECORD_FORMAT = 1
+_RECORD_SUFFIX = '.json'
+
+
+def _digest(text: str) -> str:
+    return blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+class SlowDocumentRecorder:
+    """
+    Потокобезопасная запись медленных документов в каталог. Каждый документ -- отдельный файл JSON: текст,
+    конфигурация типографа и ее отпечаток, общее время и время этапов, объем входа и выхода, хэш результата.
+    Один и тот же документ с той же конфигурацией хранится в одном файле (повторная запись его обновляет).
+    Ошибки записи не прерывают обработку, а только записываются в лог.
+    """
+
+    def __init__(self,
+                 directory: str | os.PathLike,
+                 threshold: float | None = None,
+                 max_documents: int | None = None,
+                 max_document_chars: int | None = None):
+        """
+        :param directory: Каталог для записей (создается при необходимости).
+        :param threshold: Порог в секундах: записываются документы, обработка которых длилась дольше.
+        :param max_documents: Сколько записей хранить: при превышении удаляются самые старые.
+        :param max_document_chars: Документы длиннее стольких символов не записываются.
+        """
+        defaults = etpgrf_settings.slowlog
+        self.directory = os.fspath(directory)
+        self.threshold = defaults.THRESHOLD if threshold is None else threshold
+        self.max_documents = defaults.MAX_DOCUMENTS if max_documents is None else max_documents
+        self.max_document_chars = defaults.MAX_DOCUMENT_CHARS if max_document_chars is None else max_document_chars
+        if self.threshold < 0:
+            raise ValueError(f"etpgrf: порог записи медленных документов должен быть >= 0, а не {self.threshold}")
+        if self.max_documents < 1:
+            raise ValueError(f"etpgrf: max_documents должен быть >= 1, а не {self.max_documents}")
+        self._lock = threading.Lock()
+        logger.debug(f"SlowDocumentRecorder `__init__`. Directory: {self.directory}, threshold: {self.threshold}, "
+                     f"max documents: {self.max_documents}")
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def observe(self, typographer: 'Typographer', text: str, result: str, timer: 'StageTimer') -> bool:
+        """
+        Записывает документ, если его обработка длилась дольше порога.
+
+        :param typographer: Типограф, который обработал документ.
+        :param text: Входной текст.
+        :param result: Результат обработки.
+        :param timer: Замер обработки (см. `etpgrf.stats.StageTimer`).
+        :return: True, если документ записан.
+        """
+        seconds = timer.stop()
+        if seconds < self.threshold or timer.cached or len(text) > self.max_document_chars:
+            return False
+        config = typographer.get_config()
+        fingerprint = config_fingerprint(config)
+        from etpgrf import __version__
+        record = {
+            'format': RECORD_FORMAT,
+            'etpgrf_version': __version__,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'seconds': seconds,
+            'threshold': self.threshold,
+            'stages': dict(timer.stages),
+            'degraded': timer.degraded,
+            'chars_in': len(text),
+            'chars_out': len(result),
+            'output_digest': _digest(result),
+            'fingerprint': fingerprint,
+            'config': config,
+            'text': text,
+        }
+        path = os.path.join(self.directory, f"{fingerprint}-{_digest(text)}{_RECORD_SUFFIX}")
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8', errors='surrogatepass') as file:
+                    json.dump(record, file, ensure_ascii=False, default=str)
+                os.replace(temp_path, path)
+                # Время изменения файла задает порядок записей в каталоге. Время файловой системы бывает грубее
+                # (несколько миллисекунд), поэтому оно выставляется явно
+                now = time.time_ns()
+                os.utime(path, ns=(now, now))
+                self._prune()
+        except OSError as e:
+            logger.warning(f"SlowDocumentRecorder: не удалось записать медленный документ в {self.directory}: {e!r}")
+            return False
+        logger.info(f"SlowDocumentRecorder: документ ({len(text)} симв.) обработан за {seconds:.3f} с, "
+                    f"записан в {path}")
+        return True
+
+    def _prune(self) -> None:
+        """Удаляет самые старые записи сверх `max_documents`."""
+        paths = list_records(self.directory)
+        for path in paths[:max(0, len(paths) - self.max_documents)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass    # Уже удалена другим процессом
+
+
+def list_records(directory: str | os.PathLike) -> list[str]:
+    """
+    Возвращает пути записей в каталоге, от самых старых к самым новым.
+    """
+    directory = os.fspath(directory)
+    paths = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(_RECORD_SUFFIX) and entry.is_file():
+            try:
+                paths.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                pass
+    return [path for _, path in sorted(paths)]
+
+
+def load_record(path: str | os.PathLike) -> dict:
+    """
+    Читает запись медленного документа.
+    """
+    with open(path, encoding='utf-8', errors='surrogatepass') as file:
+        record = json.load(file)
+    if record.get('format') != RECORD_FORMAT:
+        raise ValueError(f"etpgrf: неподдерживаемый формат записи медленного документа: {path}")
+    return record
+
+
+def replay_record(record: dict, repeat: int = 3) -> dict:
+    """
+    Обрабатывает записанный документ текущей версией кода с записанной конфигурацией.
+
+    :param record: Запись (см. `load_record`).
+    :param repeat: Сколько раз обработать документ (берется самый быстрый раз).
+    :return: Словарь: время и время этапов при записи и сейчас, ускорение (во сколько раз быстрее, чем при записи)
+             и изменился ли результат обработки.
+    """
+    from etpgrf.typograph import Typographer
+    runs = []
+    typographer = Typographer.from_config(record['config'], stats_callback=runs.append)
+    text = record['text']
+    result = None
+    for _ in range(max(1, repeat)):
+        result = typographer.process(text)
+    best = min(runs, key=lambda run: run['seconds'])
+    return {
+        'chars': len(text),
+        'recorded_seconds': record['seconds'],
+        'seconds': best['seconds'],
+        'speedup': record['seconds'] / best['seconds'] if best['seconds'] else float('inf'),
+        'recorded_stages': record['stages'],
+        'stages': best['stages'],
+        'recorded_version': record['etpgrf_version'],
+        'output_changed': _digest(result) != record['output_digest'],
+    }
+
+
+def replay(directory: str | os.PathLike, repeat: int = 3) -> dict[str, dict]:
+    """
+    Обрабатывает все записанные документы каталога (см. `replay_record`).
+
+    :return: Результаты по именам файлов записей, от самых старых к самым новым.
+    """
+    return {os.path.basename(path): replay_record(load_record(path), repeat) for path in list_records(directory)}
+
+
+def _slowest_stage(stages: dict[str, float]) -> str:
+    if not stages:
+        return '-'
+    stage = max(stages, key=stages.get)
+    return f"{stage} {stages[stage]:.3f} с"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Повторная обработка записанных медленных документов etpgrf")
+    parser.add_argument('directory', help="Каталог записей (SlowDocumentRecorder)")
+    parser.add_argument('--repeat', type=int, default=3, help="Сколько раз обработать документ (по умолчанию 3)")
+    parser.add_argument('-o', '--output', help="Файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        parser.error(f"каталог не найден: {args.directory}")
+
+    started = time.perf_counter()
+    results = {}
+    for path in list_records(args.directory):
+        name = os.path.basename(path)
+        results[name] = result = replay_record(load_record(path), args.repeat)
+        changed = '  результат изменился' if result['output_changed'] else ''
+        print(f"{name[:40]:<40} {result['chars']:>10} симв. {result['recorded_seconds']:8.3f} -> "
+              f"{result['seconds']:8.3f} с  x{result['speedup']:.2f}  "
+              f"[{_slowest_stage(result['recorded_stages'])} -> {_slowest_stage(result['stages'])}]{changed}",
+              flush=True)
+    print(f"Документов: {len(results)}, {time.perf_counter() - started:.1f} с")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
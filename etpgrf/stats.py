@@ -0,0 +1,155 @@
+# etpgrf/stats.py
+# Статистика работы типографа для метрик в продакшене: сколько времени занимает каждый этап обработки (разбор HTML,
+# санитизация, модули правил, висячая пунктуация, кодирование и сборка результата), сколько раз он выполнялся
+# и каков объем входа и выхода. Статистика включается параметром `stats` у `Typographer`; без него замеры
+# не выполняются вовсе.
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Этапы обработки
+STAGE_CACHE = 'cache'               # Поиск в кэше результатов
+STAGE_PARSE = 'parse'               # Разбор HTML (или нормализация простого текста) и подготовка текста к правилам
+STAGE_SANITIZE = 'sanitize'         # Санитизация HTML
+STAGE_QUOTES = 'quotes'
+STAGE_UNBREAKABLES = 'unbreakables'
+STAGE_SYMBOLS = 'symbols'
+STAGE_LAYOUT = 'layout'
+STAGE_HYPHENATION = 'hyphenation'
+STAGE_HANGING = 'hanging'           # Висячая пунктуация
+STAGE_ENCODE = 'encode'             # Раскладка результата по текстовым узлам и кодирование в мнемоники
+STAGE_SERIALIZE = 'serialize'       # Запись в дерево HTML и сборка результата
+STAGES = (STAGE_CACHE, STAGE_PARSE, STAGE_SANITIZE, STAGE_QUOTES, STAGE_UNBREAKABLES, STAGE_SYMBOLS, STAGE_LAYOUT,
+          STAGE_HYPHENATION, STAGE_HANGING, STAGE_ENCODE, STAGE_SERIALIZE)
+
+
+class StageTimer:
+    """
+    Замер обработки одного документа: время этапов и объем входа и выхода. Время этапа -- время от предыдущей
+    отметки (`mark` или `lap`) до вызова `lap`.
+    """
+    __slots__ = ('started', 'seconds', 'stages', 'chars_in', 'chars_out', 'cached', 'degraded', '_last')
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.seconds: float | None = None   # Общее время (после `stop`)
+        self.stages: dict[str, float] = {}
+        self.chars_in = 0
+        self.chars_out = 0
+        self.cached = False
+        self.degraded = False   # Этапы пропущены из-за нехватки времени (см. `Typographer.process_with_budget`)
+
+    def mark(self) -> None:
+        """Отметка без этапа: время до нее ни к какому этапу не относится."""
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Добавляет этапу время от предыдущей отметки."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def stop(self) -> float:
+        """Завершает замер (повторные вызовы не меняют результат) и возвращает общее время."""
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+        return self.seconds
+
+
+class TypographerStats:
+    """
+    Потокобезопасная накопительная статистика типографа.
+
+    При передаче в другой процесс (pickle, например, в пул процессов) счетчики и функция обратного вызова
+    не передаются: каждый процесс ведет свою статистику, а статистика процессов пула в исходный процесс
+    не возвращается.
+    """
+
+    def __init__(self, callback: Callable[[dict], None] | None = None):
+        """
+        :param callback: Функция, которая вызывается после обработки каждого документа со словарем замера
+                         (см. `finish`), например, для отправки в систему метрик. Исключения в ней записываются
+                         в лог и не прерывают обработку.
+        """
+        self.callback = callback
+        self._init_counters()
+
+    def _init_counters(self) -> None:
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.documents = 0
+        self.cache_hits = 0
+        self.degraded = 0
+        self.seconds = 0.0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.stage_seconds: dict[str, float] = {}
+        self.stage_calls: dict[str, int] = {}
+
+    def __getstate__(self) -> dict:
+        return {}
+
+    def __setstate__(self, state: dict) -> None:
+        self.callback = None
+        self._init_counters()
+
+    def start(self) -> StageTimer:
+        """Начинает замер обработки документа."""
+        return StageTimer()
+
+    def finish(self, timer: StageTimer) -> None:
+        """
+        Завершает замер документа: добавляет его к накопленной статистике и вызывает `callback` со словарем
+        {'seconds': общее время, 'chars_in': длина входа, 'chars_out': длина результата,
+        'cached': результат взят из кэша, 'degraded': этапы пропущены из-за нехватки времени,
+        'stages': {этап: время}}.
+        """
+        seconds = timer.stop()
+        with self._lock:
+            self.documents += 1
+            self.cache_hits += timer.cached
+            self.degraded += timer.degraded
+            self.seconds += seconds
+            self.chars_in += timer.chars_in
+            self.chars_out += timer.chars_out
+            for stage, stage_seconds in timer.stages.items():
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + stage_seconds
+                self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+        if self.callback is not None:
+            try:
+                self.callback({'seconds': seconds,
+                               'chars_in': timer.chars_in,
+                               'chars_out': timer.chars_out,
+                               'cached': timer.cached,
+                               'degraded': timer.degraded,
+                               'stages': dict(timer.stages)})
+            except Exception as e:
+                logger.warning(f"Ошибка в функции обратного вызова статистики: {e!r}")
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает копию накопленной статистики: число документов, попаданий в кэш и документов, обработанных
+        не полностью из-за нехватки времени, общее время, объем входа и выхода (в символах) и по каждому этапу --
+        число документов, прошедших этап, и суммарное время.
+        """
+        with self._lock:
+            return {'documents': self.documents,
+                    'cache_hits': self.cache_hits,
+                    'degraded': self.degraded,
+                    'seconds': self.seconds,
+                    'chars_in': self.chars_in,
+                    'chars_out': self.chars_out,
+                    'stages': {stage: {'calls': self.stage_calls[stage], 'seconds': self.stage_seconds[stage]}
+                               for stage in STAGES if stage in self.stage_calls}}
+
+    def reset(self) -> None:
+        """Обнуляет накопленную статистику."""
+        with self._lock:
+            self._reset_counters()
@@ -0,0 +1,178 @@
+# etpgrf/streaming.py
+# Модуль потоковой обработки простого текста с ограниченным расходом памяти.
+# Текст читается частями и режется на "безопасных" границах -- абзацных разрывах, через которые не "дотягивается"
+# ни одно правило типографа. Поэтому результат совпадает с обработкой всего текста за один вызов `process`,
+# а в памяти одновременно находится только один фрагмент (O(chunk_size)). В тексте без абзацных разрывов буфер
+# ограничен `MAX_BUFFER_CHUNKS` фрагментами: дальше текст режется по пробелу (см. `find_fallback_cut`).
+
+import logging
+import regex
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO
+from etpgrf.defaults import etpgrf_settings
+
+# --- Настройки логирования ---
+logger = logging.getLogger(__name__)
+
+# Абзацный разрыв: максимальная серия пробельных символов, содержащая не менее двух переводов строки.
+_PARAGRAPH_BREAK_PATTERN = regex.compile(r'\s*\n[^\S\n]*\n\s*')
+
+# Сколько символов контекста по обе стороны от разрыва проверяется на "безопасность".
+# Самые длинные правила, которые могут "дотянуться" через разрыв (сокращения вида "д. м. н.", тире с пробелами,
+# цепочки единиц измерения), укладываются в несколько слов, так что 80 символов хватает с запасом.
+_CUT_CONTEXT_CHARS = 80
+
+# Любая пробельная серия (кандидаты для разреза переполненного буфера) и кавычки, внутри которых его не режем
+_WHITESPACE_PATTERN = regex.compile(r'\s+')
+_QUOTE_CHARS = frozenset('"«»„“”')
+# Сколько пробельных серий с конца буфера проверять "честно" (`is_safe_cut`) при переполнении буфера
+_FALLBACK_CUT_ATTEMPTS = 64
+
+
+def is_safe_cut(process: Callable[[str], str], text: str, cut_start: int, cut_end: int) -> bool:
+    """
+    Проверяет, можно ли разрезать текст по пробельной серии text[cut_start:cut_end] так, чтобы результат
+    обработки частей по отдельности совпал с обработкой целого текста.
+
+    Проверка делается "честно": окно контекста вокруг разрыва обрабатывается целиком и по частям
+    (левая часть вместе с самим разрывом и правая часть), и результаты сравниваются. Так правила, которые
+    "съедают" или заменяют пробелы разрыва (предлоги, частицы, тире, единицы измерения, сокращения),
+    автоматически запрещают резать в этом месте.
+
+    :param process: Функция обработки простого текста (обычно `Typographer._process_plain_text`).
+    :param text: Текст.
+    :param cut_start: Начало пробельной серии.
+    :param cut_end: Конец пробельной серии (позиция, с которой начнется следующий фрагмент).
+    :return: True, если резать можно.
+    """
+    left = text[max(0, cut_start - _CUT_CONTEXT_CHARS):cut_end]
+    right = text[cut_end:cut_end + _CUT_CONTEXT_CHARS]
+    return process(left + right) == process(left) + process(right)
+
+
+def find_safe_cut(process: Callable[[str], str], text: str, start: int = 0, final: bool = False) -> int | None:
+    """
+    Ищет последнюю "безопасную" границу (абзацный разрыв) в тексте, начиная с позиции `start`.
+
+    :param process: Функция обработки простого текста.
+    :param text: Текст (буфер).
+    :param start: С какой позиции искать разрывы (более ранние уже были проверены).
+    :param final: True -- текст закончился, и справа от последнего разрыва больше ничего не будет.
+                  Иначе разрывы, справа от которых еще не набралось контекста, пропускаются.
+    :return: Позиция, по которой нужно резать (конец пробельной серии), или None.
+    """
+    limit = len(text) if final else len(text) - _CUT_CONTEXT_CHARS
+    breaks = [m.span() for m in _PARAGRAPH_BREAK_PATTERN.finditer(text, start)
+              if 0 < m.start() and m.end() < limit]
+    for cut_start, cut_end in reversed(breaks):
+        if is_safe_cut(process, text, cut_start, cut_end):
+            return cut_end
+    return None
+
+
+def _outside_quotes(text: str, end: int) -> bool:
+    """Проверяет, что позиция `end` не внутри кавычек: прямые кавычки парные, а «елочки» и „лапки“ закрыты."""
+    straight = text.count('"', 0, end)
+    opened = text.count('«', 0, end) + text.count('„', 0, end)
+    closed = text.count('»', 0, end) + text.count('“', 0, end) + text.count('”', 0, end)
+    return straight % 2 == 0 and opened <= closed
+
+
+def find_fallback_cut(process: Callable[[str], str], text: str) -> int:
+    """
+    Граница для переполненного буфера, в котором нет безопасного абзацного разрыва (например, весь текст -- один
+    абзац). Сначала ищется безопасный разрез (`is_safe_cut`) по любой пробельной серии с конца буфера, затем --
+    последняя пробельная серия вне кавычек, и в крайнем случае текст режется по длине. В двух последних случаях
+    результат на стыке может отличаться от обработки всего текста целиком.
+
+    :param process: Функция обработки простого текста.
+    :param text: Текст (буфер).
+    :return: Позиция, по которой нужно резать (0 < позиция < len(text)).
+    """
+    limit = len(text) - _CUT_CONTEXT_CHARS
+    spaces = [m.span() for m in _WHITESPACE_PATTERN.finditer(text) if 0 < m.start() and m.end() < limit]
+    for cut_start, cut_end in spaces[:-_FALLBACK_CUT_ATTEMPTS - 1:-1]:
+        if is_safe_cut(process, text, cut_start, cut_end):
+            return cut_end
+    logger.warning(f"iter_process_stream: нет безопасной границы в буфере из {len(text)} символов, "
+                   f"текст режется по пробелу (результат на стыке может отличаться от обработки целиком)")
+    if any(char in _QUOTE_CHARS for char in text):
+        for _, cut_end in reversed(spaces):
+            if _outside_quotes(text, cut_end):
+                return cut_end
+    elif spaces:
+        return spaces[-1][1]
+    return max(1, limit)
+
+
+def _iter_source(source: str | IO[str] | Iterable[str], read_size: int) -> Iterator[str]:
+    """Превращает источник (строку, файлоподобный объект или итератор фрагментов) в поток фрагментов."""
+    if isinstance(source, str):
+        for start in range(0, len(source), read_size):
+            yield source[start:start + read_size]
+    elif hasattr(source, 'read'):
+        while True:
+            piece = source.read(read_size)
+            if not piece:
+                break
+            yield piece
+    else:
+        for piece in source:
+            if piece:
+                yield piece
+
+
+def iter_process_stream(process: Callable[[str], str],
+                        source: str | IO[str] | Iterable[str],
+                        chunk_size: int | None = None,
+                        max_buffer: int | None = None) -> Iterator[str]:
+    """
+    Потоковая обработка простого текста.
+
+    :param process: Функция обработки простого текста (обычно `Typographer._process_plain_text`).
+    :param source: Источник: файлоподобный объект с методом `read()`, итератор фрагментов текста или строка.
+    :param chunk_size: Желаемый размер обрабатываемого фрагмента в символах.
+    :param max_buffer: Предел буфера в символах (None -- `chunk_size * etpgrf_settings.stream.MAX_BUFFER_CHUNKS`).
+                       Если безопасного абзацного разрыва нет дольше, буфер режется по пробелу (`find_fallback_cut`).
+    :return: Генератор обработанных фрагментов. Их конкатенация совпадает с обработкой всего текста целиком, если
+             буфер ни разу не переполнился.
+    """
+    if chunk_size is None:
+        chunk_size = etpgrf_settings.stream.CHUNK_SIZE
+    if chunk_size < 1:
+        raise ValueError(f"etpgrf: размер фрагмента (chunk_size) должен быть >= 1, а не {chunk_size}")
+    if max_buffer is None:
+        max_buffer = chunk_size * etpgrf_settings.stream.MAX_BUFFER_CHUNKS
+    # Буфер должен вмещать фрагмент и контекст проверки по обе стороны от разреза
+    max_buffer = max(max_buffer, chunk_size, 4 * _CUT_CONTEXT_CHARS)
+
+    pieces = []         # Прочитанные, но еще не склеенные в буфер фрагменты
+    pieces_len = 0
+    buffer = ''         # Текст, который еще не был обработан
+    checked = 0         # До этой позиции буфера разрывы уже проверены и признаны небезопасными
+    for piece in _iter_source(source, chunk_size):
+        pieces.append(piece)
+        pieces_len += len(piece)
+        if len(buffer) + pieces_len < chunk_size:
+            continue
+        buffer += ''.join(pieces)
+        pieces = []
+        pieces_len = 0
+        cut = find_safe_cut(process, buffer, max(0, checked - _CUT_CONTEXT_CHARS))
+        while cut is None and len(buffer) >= max_buffer:
+            # Абзацного разрыва нет слишком долго: режем буфер по пробелу, чтобы память оставалась ограниченной
+            cut = find_fallback_cut(process, buffer[:max_buffer])
+            yield process(buffer[:cut])
+            buffer = buffer[cut:]
+            cut = find_safe_cut(process, buffer)
+        if cut is None:
+            # Безопасной границы пока нет -- читаем дальше
+            checked = len(buffer)
+            continue
+        yield process(buffer[:cut])
+        buffer = buffer[cut:]
+        checked = 0
+
+    buffer += ''.join(pieces)
+    if buffer:
+        yield process(buffer)
@@ -4,6 +4,8 @@
 import regex
 import logging
 from .config import CHAR_NDASH, STR_TO_SYMBOL_REPLACEMENTS
+from .comutil import RuleTrigger, trigger_key_chars
+from .textmap import EditLog, tracked_sub, tracked_replace
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +23,24 @@ class SymbolsProcessor:
         # Обрабатываем арабские и римские цифры.
         self._range_pattern = regex.compile(pattern=r'(\d)-(\d)|([IVXLCDM]+)-([IVXLCDM]+)', flags=regex.IGNORECASE)
 
+        # Условия применимости: простая замена возможна, только если в тексте есть все символы заменяемой
+        # последовательности; диапазон -- если есть дефис.
+        self._replacements = [(RuleTrigger(*old, min_len=len(old)), old, new)
+                              for old, new in STR_TO_SYMBOL_REPLACEMENTS]
+        self._range_trigger = RuleTrigger('-', min_len=3)
+        # Ключевые символы всех правил: текст без них обработка не изменит (одна проверка вместо двух десятков)
+        self._key_chars = trigger_key_chars([trigger for trigger, _, _ in self._replacements] + [self._range_trigger])
+        # Символы, которые могут появиться в тексте после обработки
+        self.produced_chars = frozenset(''.join(new for _, new in STR_TO_SYMBOL_REPLACEMENTS) + CHAR_NDASH)
+
         logger.debug("SymbolsProcessor `__init__`")
 
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        return {}
+
     def _replace_range(self, match: regex.Match) -> str:
         # Паттерн имеет две группы: (\d)-(\d) ИЛИ ([IVX...])-([IVX...])
         if match.group(1) is not None:  # Арабские цифры
@@ -32,19 +50,54 @@ class SymbolsProcessor:
         return match.group(0)  # На всякий случай
 
 
-    def process(self, text: str) -> str:
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет по набору символов текста, может ли обработка что-то изменить.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если текст точно останется без изменений.
+        """
+        if chars.isdisjoint(self._key_chars):
+            return False
+        return (any(trigger.may_apply(chars, length) for trigger, _, _ in self._replacements)
+                or self._range_trigger.may_apply(chars, length))
+
+    def process(self, text: str, chars: set[str] | None = None, edits: EditLog | None = None) -> str:
+        """
+        Заменяет псевдографику на типографские символы.
+
+        :param text: Текст для обработки.
+        :param chars: Множество символов текста (необязательно). Если не передано, вычисляется по тексту.
+                      Замены, которые не могут сработать на этом тексте, пропускаются, а новые символы
+                      добавляются в это множество.
+        :param edits: Журнал правок (необязательно): замены записываются в него (см. `etpgrf.textmap`).
+        :return: Обработанный текст.
+        """
+        if chars is None:
+            chars = set(text)
+        if chars.isdisjoint(self._key_chars):
+            return text
         # Шаг 1: Выполняем простые замены из списка `STR_TO_SYMBOL_REPLACEMENTS` (см. config.py).
         # Этот шаг должен идти первым, чтобы пользователь мог, например,
         # использовать '---' в диапазоне '1---5', если ему это нужно.
         # В таком случае '---' заменится на '—', и правило для диапазонов
         # с дефисом уже не сработает.
         processed_text = text
-        for old, new in STR_TO_SYMBOL_REPLACEMENTS:
-            processed_text = processed_text.replace(old, new)
+        for trigger, old, new in self._replacements:
+            if trigger.may_apply(chars, len(processed_text)):
+                replaced_text = tracked_replace(processed_text, old, new, edits)
+                if replaced_text is not processed_text:
+                    chars.update(new)
+                    processed_text = replaced_text
 
         # Шаг 2: Обрабатываем диапазоны с помощью регулярного выражения.
         # Эта замена более специфична и требует контекста (цифры вокруг дефиса).
-        processed_text = self._range_pattern.sub(self._replace_range, processed_text)
+        if self._range_trigger.may_apply(chars, len(processed_text)):
+            replaced_text = tracked_sub(self._range_pattern, self._replace_range, processed_text, edits)
+            if replaced_text is not processed_text:
+                chars.add(CHAR_NDASH)
+                processed_text = replaced_text
 
         return processed_text
 
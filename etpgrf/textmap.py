@@ -0,0 +1,315 @@
+# etpgrf/textmap.py
+# Карта правок текста. При обработке HTML правила работают по "супер-строке" -- склейке текстовых узлов документа,
+# чтобы видеть контекст через строчные теги. Замены записываются как правки (позиция, длина старого фрагмента,
+# новый текст), и по ним результат раскладывается обратно по исходным текстовым узлам. Поэтому правилам не нужно
+# сохранять длину текста.
+
+import time
+from bisect import bisect_left, bisect_right
+from etpgrf.budget import current_budget, check_deadline
+
+
+def _split_edit(start: int, old: str, new: str, edits: list) -> None:
+    """
+    Записывает замену `old` -> `new` в позиции `start` как набор минимальных правок: посимвольные замены, если
+    длина не меняется, вставки или удаления, если один фрагмент получается из другого только ими, иначе -- одна
+    правка без общего начала и конца. Мелкие правки реже пересекают границы текстовых узлов.
+    """
+    old_len = len(old)
+    new_len = len(new)
+    if old_len == new_len:
+        run_start = -1
+        for i in range(old_len):
+            if old[i] != new[i]:
+                if run_start < 0:
+                    run_start = i
+            elif run_start >= 0:
+                edits.append((start + run_start, i - run_start, new[run_start:i]))
+                run_start = -1
+        if run_start >= 0:
+            edits.append((start + run_start, old_len - run_start, new[run_start:]))
+        return
+    # Общее начало и конец не меняются
+    prefix = 0
+    limit = min(old_len, new_len)
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old[old_len - 1 - suffix] == new[new_len - 1 - suffix]:
+        suffix += 1
+    old = old[prefix:old_len - suffix]
+    new = new[prefix:new_len - suffix]
+    start += prefix
+    # Короткий фрагмент -- подпоследовательность длинного: правка раскладывается на вставки (удаления)
+    inserting = len(old) < len(new)
+    shorter, longer = (old, new) if inserting else (new, old)
+    kept = []   # Позиции символов короткого фрагмента в длинном
+    j = 0
+    if shorter:
+        for i, char in enumerate(longer):
+            if j < len(shorter) and char == shorter[j]:
+                kept.append(i)
+                j += 1
+        if j < len(shorter):
+            edits.append((start, len(old), new))
+            return
+    offset = 0      # Позиция в старом фрагменте
+    prev = -1
+    for i in kept + [len(longer)]:
+        if i > prev + 1:
+            gap = longer[prev + 1:i]
+            if inserting:
+                edits.append((start + offset, 0, gap))
+            else:
+                edits.append((start + offset, len(gap), ''))
+                offset += len(gap)
+        if i < len(longer):
+            offset += 1
+        prev = i
+
+
+class EditLog:
+    """
+    Журнал правок текста. Правки каждого прохода (вызова `tracked_sub` или `tracked_replace`) сразу накладываются
+    на карту измененных участков: список кортежей (начало, конец участка в текущем тексте, начало, конец
+    в исходном тексте), упорядоченный по позиции. Вне участков текущий текст совпадает с исходным.
+    """
+    __slots__ = ('regions', 'barrier')
+
+    def __init__(self, barrier: str | None = None):
+        """
+        :param barrier: Символ-граница (например, разделитель блоков HTML): замены, которые его захватывают,
+                        не выполняются, то есть правила не работают через границу.
+        """
+        self.regions: list[tuple[int, int, int, int]] = []
+        self.barrier = barrier
+
+    def add_pass(self, edits: list[tuple[int, int, str]]) -> None:
+        """
+        Накладывает правки одного прохода на карту участков.
+
+        :param edits: Правки (позиция, длина старого фрагмента, новый текст) в координатах текста до прохода,
+                      упорядоченные по позиции и не пересекающиеся.
+        """
+        if not edits:
+            return
+        regions = self.regions
+        result = []
+        n_regions = len(regions)
+        n_edits = len(edits)
+        ri = 0
+        ei = 0
+        shift = 0   # Изменение длины текста правками этого прохода левее текущей позиции
+        delta = 0   # Разница длин (текущий - исходный) участков левее текущей позиции
+        while ei < n_edits:
+            start, old_len, new_text = edits[ei]
+            # Участки левее правки переносятся со сдвигом
+            while ri < n_regions and regions[ri][1] <= start:
+                cs, ce, os, oe = regions[ri]
+                result.append((cs + shift, ce + shift, os, oe))
+                delta += (ce - cs) - (oe - os)
+                ri += 1
+            # Группа: правка и все участки и правки, которые с ней пересекаются (в том числе через участки)
+            group_start, group_end = start, start + old_len
+            edits_delta = len(new_text) - old_len
+            first_region = last_region = None
+            regions_delta = 0
+            ei += 1
+            grown = True
+            while grown:
+                grown = False
+                while ri < n_regions and _touches(regions[ri][0], regions[ri][1], group_start, group_end):
+                    region = regions[ri]
+                    if first_region is None:
+                        first_region = region
+                    last_region = region
+                    regions_delta += (region[1] - region[0]) - (region[3] - region[2])
+                    group_start = min(group_start, region[0])
+                    group_end = max(group_end, region[1])
+                    ri += 1
+                    grown = True
+                while ei < n_edits and _touches(edits[ei][0], edits[ei][0] + edits[ei][1], group_start, group_end):
+                    start, old_len, new_text = edits[ei]
+                    edits_delta += len(new_text) - old_len
+                    group_end = max(group_end, start + old_len)
+                    ei += 1
+                    grown = True
+            if first_region is not None and first_region[0] == group_start:
+                orig_start = first_region[2]
+            else:
+                orig_start = group_start - delta
+            if last_region is not None and last_region[1] == group_end:
+                orig_end = last_region[3]
+            else:
+                orig_end = group_end - delta - regions_delta
+            result.append((group_start + shift, group_end + shift + edits_delta, orig_start, orig_end))
+            shift += edits_delta
+            delta += regions_delta
+        for cs, ce, os, oe in regions[ri:]:
+            result.append((cs + shift, ce + shift, os, oe))
+        self.regions = result
+
+
+def _touches(a_start: int, a_end: int, b_start: int, b_end: int) -> bool:
+    """
+    Пересекаются ли фрагменты [a_start, a_end) и [b_start, b_end) по внутренним точкам (фрагменты, которые
+    только соприкасаются границами, не пересекаются; пустой фрагмент -- точка).
+    """
+    return (max(a_start, b_start) < min(a_end, b_end)
+            or a_start < b_start < a_end
+            or b_start < a_start < b_end)
+
+
+def tracked_sub(pattern, repl, text: str, edits: EditLog | None = None) -> str:
+    """
+    То же, что `pattern.sub(repl, text)`, но с записью замен в журнал правок (если он передан). Совпадения,
+    которые захватывают символ-границу журнала, не заменяются: поиск продолжается сразу за границей, как если бы
+    текст по обе стороны от нее обрабатывался отдельно.
+
+    :param pattern: Скомпилированный паттерн.
+    :param repl: Строка замены (шаблон со ссылками на группы) или функция от совпадения.
+    :param text: Текст.
+    :param edits: Журнал правок (None -- не записывать).
+    :return: Текст после замены.
+    :raises TimeoutError: Если задан бюджет времени (см. `etpgrf.budget`) и он исчерпан.
+    """
+    timeout = None
+    deadline = None
+    budget = current_budget()
+    if budget is not None:
+        deadline = budget.deadline
+        check_deadline(deadline)
+        timeout = budget.remaining()
+        if callable(repl):
+            # Время функций замены `timeout` регулярного выражения не учитывает
+            user_repl = repl
+
+            def repl(match):
+                check_deadline(deadline)
+                return user_repl(match)
+
+    if edits is None:
+        return pattern.sub(repl, text, timeout=timeout)
+    pass_edits = []
+    barrier = edits.barrier
+    if barrier is None or barrier not in text:
+        def record(match):
+            matched = match.group(0)
+            replacement = repl(match) if callable(repl) else match.expand(repl)
+            if replacement != matched:
+                _split_edit(match.start(), matched, replacement, pass_edits)
+            return replacement
+
+        result = pattern.sub(record, text, timeout=timeout)
+        edits.add_pass(pass_edits)
+        return result
+
+    pieces = []
+    position = 0    # Конец уже перенесенного в результат текста
+    search_from = 0
+    text_len = len(text)
+    while search_from <= text_len:
+        if deadline is not None:
+            check_deadline(deadline)
+            timeout = deadline - time.monotonic()
+        match = pattern.search(text, search_from, timeout=timeout)
+        if match is None:
+            break
+        start, end = match.span()
+        matched = match.group(0)
+        cut = matched.rfind(barrier)
+        if cut >= 0:
+            search_from = start + cut + 1
+            continue
+        replacement = repl(match) if callable(repl) else match.expand(repl)
+        if replacement != matched:
+            _split_edit(start, matched, replacement, pass_edits)
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        search_from = end if end > start else end + 1
+    if not pass_edits:
+        return text
+    pieces.append(text[position:])
+    edits.add_pass(pass_edits)
+    return ''.join(pieces)
+
+
+def tracked_replace(text: str, old: str, new: str, edits: EditLog | None = None) -> str:
+    """
+    То же, что `text.replace(old, new)`, но с записью замен в журнал правок (если он передан).
+    """
+    if edits is None or old not in text:
+        return text.replace(old, new)
+    if edits.barrier is not None and edits.barrier in old:
+        return text
+    pass_edits = []
+    position = text.find(old)
+    while position >= 0:
+        _split_edit(position, old, new, pass_edits)
+        position = text.find(old, position + len(old))
+    edits.add_pass(pass_edits)
+    return text.replace(old, new)
+
+
+def project_edits(original: str,
+                  result: str,
+                  edits: EditLog,
+                  bounds: list[int],
+                  virtual: frozenset[int] | set[int] = frozenset()) -> list[str]:
+    """
+    Раскладывает результат обработки текста по фрагментам исходного текста (текстовым узлам).
+
+    Каждый измененный участок достается фрагменту, в котором он начинается (вставка на границе -- фрагменту
+    слева). Если участок захватывает несколько фрагментов, остальные теряют захваченный текст. Участки, которые
+    задевают "виртуальные" фрагменты (например, разделители блоков), отбрасываются: в этом месте остается
+    исходный текст.
+
+    :param original: Исходный текст.
+    :param result: Текст после обработки.
+    :param edits: Журнал правок, которыми `original` превращен в `result`.
+    :param bounds: Начала фрагментов в исходном тексте и в конце -- длина текста.
+    :param virtual: Индексы виртуальных фрагментов.
+    :return: Новый текст каждого фрагмента (для неизмененных -- исходная строка).
+    """
+    n_parts = len(bounds) - 1
+    assigned: dict[int, list[tuple[int, int, str]]] = {}
+    for cs, ce, os, oe in edits.regions:
+        if os == oe:
+            # Вставка: фрагменту слева, если граница, а он виртуальный -- фрагменту справа
+            first = bisect_left(bounds, os) - 1
+            if first < 0 or first in virtual:
+                first = bisect_right(bounds, os) - 1
+            last = first
+            if first >= n_parts:
+                continue
+        else:
+            first = bisect_right(bounds, os) - 1
+            last = bisect_left(bounds, oe) - 1
+        if any(part in virtual for part in range(first, last + 1)):
+            continue
+        if first == last:
+            assigned.setdefault(first, []).append((os, oe, result[cs:ce]))
+            continue
+        assigned.setdefault(first, []).append((os, bounds[first + 1], result[cs:ce]))
+        for part in range(first + 1, last):
+            assigned.setdefault(part, []).append((bounds[part], bounds[part + 1], ''))
+        assigned.setdefault(last, []).append((bounds[last], oe, ''))
+
+    parts = []
+    for index in range(n_parts):
+        part_start, part_end = bounds[index], bounds[index + 1]
+        changes = assigned.get(index)
+        if changes is None:
+            parts.append(original[part_start:part_end])
+            continue
+        pieces = []
+        position = part_start
+        for os, oe, new_text in changes:
+            pieces.append(original[position:os])
+            pieces.append(new_text)
+            position = oe
+        pieces.append(original[position:part_end])
+        parts.append(''.join(pieces))
+    return parts
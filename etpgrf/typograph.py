@@ -3,25 +3,57 @@
 # Поддерживает обработку текста внутри HTML-тегов с помощью BeautifulSoup.
 import logging
 import html
-try:
-    from bs4 import BeautifulSoup, NavigableString
-except ImportError:
-    BeautifulSoup = None
-from etpgrf.comutil import parse_and_validate_mode, parse_and_validate_langs
+import importlib.util
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from typing import IO, TYPE_CHECKING, NamedTuple
+from etpgrf import comutil
+from etpgrf.comutil import (parse_and_validate_mode, parse_and_validate_langs, parse_and_validate_html_backend,
+                            collect_text_nodes, replace_text_nodes)
 from etpgrf.hyphenation import Hyphenator
 from etpgrf.unbreakables import Unbreakables
 from etpgrf.quotes import QuotesProcessor
 from etpgrf.layout import LayoutProcessor
 from etpgrf.symbols import SymbolsProcessor
-from etpgrf.sanitizer import SanitizerProcessor
-from etpgrf.hanging import HangingPunctuationProcessor
-from etpgrf.codec import decode_to_unicode, encode_from_unicode
-from etpgrf.config import PROTECTED_HTML_TAGS, SANITIZE_ALL_HTML
+from etpgrf.codec import decode_to_unicode, encode_from_unicode, escape_html_text
+from etpgrf.textmap import EditLog, project_edits
+from etpgrf.budget import current_budget, budget_scope, is_degraded
+from etpgrf.stats import (TypographerStats, StageTimer, STAGE_CACHE, STAGE_PARSE, STAGE_SANITIZE, STAGE_QUOTES,
+                          STAGE_UNBREAKABLES, STAGE_SYMBOLS, STAGE_LAYOUT, STAGE_HYPHENATION, STAGE_HANGING,
+                          STAGE_ENCODE, STAGE_SERIALIZE)
+from etpgrf.config import PROTECTED_HTML_TAGS, BLOCK_HTML_TAGS, SANITIZE_ALL_HTML, HTML_BACKEND_STREAM
+from etpgrf.defaults import etpgrf_settings
 
+if TYPE_CHECKING:
+    import os
+    from etpgrf.cache import ResultCache, SQLiteResultCache
+    from etpgrf.comutil import EncodedString
+    from etpgrf.hanging import HangingPunctuationProcessor
+    from etpgrf.sanitizer import SanitizerProcessor
+    from etpgrf.slowlog import SlowDocumentRecorder
+
+# BeautifulSoup, а также модули пакетной, потоковой, инкрементальной и асинхронной обработки (с `multiprocessing`
+# и `asyncio`) импортируются при первом использовании, а не при импорте типографа: так быстрее холодный старт.
+# Так же -- выключенные по умолчанию санитайзер, висячая пунктуация и кэш (с `hashlib` и `json`). Модули правил,
+# включенных по умолчанию, импортируются сразу: типограф по умолчанию создает их все, а импорт каждого стоит
+# доли миллисекунды (основное время -- `regex`, нужный и `comutil`).
+_HAS_BS4 = importlib.util.find_spec('bs4') is not None
 
 # --- Настройки логирования ---
 logger = logging.getLogger(__name__)
 
+# Разделитель блоков HTML в "супер-строке" документа. Для правил это пробельный символ (PARAGRAPH SEPARATOR),
+# а замены, которые его захватывают, не выполняются (см. `EditLog`).
+_BLOCK_SEPARATOR = '\u2029'
+
+
+class BudgetedResult(NamedTuple):
+    """Результат `Typographer.process_with_budget`."""
+    text: str                   # Результат обработки (при нехватке времени -- без пропущенных этапов)
+    degraded: bool              # Пропущены ли этапы обработки из-за нехватки времени
+    skipped: tuple[str, ...]    # Пропущенные этапы (см. `etpgrf.stats.STAGES`)
+
 
 # --- Основной класс Typographer ---
 class Typographer:
@@ -34,8 +66,13 @@ class Typographer:
                  quotes: QuotesProcessor | bool | None = True,  # Правила для обработки кавычек
                  layout: LayoutProcessor | bool | None = True,  # Правила для тире и спецсимволов
                  symbols: SymbolsProcessor | bool | None = True, # Правила для псевдографики
-                 sanitizer: SanitizerProcessor | str | bool | None = None, # Правила очистки
+                 sanitizer: 'SanitizerProcessor | str | bool | None' = None, # Правила очистки
                  hanging_punctuation: str | bool | list[str] | None = None, # Висячая пунктуация
+                 cache: 'ResultCache | SQLiteResultCache | bool | None' = None,  # Кэш результатов обработки
+                 html_backend: str | None = None,   # Способ разбора HTML: 'soup' (дерево) или 'stream' (поток)
+                 stats: TypographerStats | bool | None = None,  # Статистика этапов обработки
+                 stats_callback: Callable[[dict], None] | None = None,  # Обратный вызов после каждого документа
+                 slow_log: 'SlowDocumentRecorder | str | os.PathLike | None' = None,  # Запись медленных документов
                  # ... другие модули правил ...
                  ):
 
@@ -45,7 +82,9 @@ class Typographer:
         self.mode: str = parse_and_validate_mode(mode)
         # C. --- Настройка режима обработки HTML ---
         self.process_html = process_html
-        if self.process_html and BeautifulSoup is None:
+        self.html_backend: str = parse_and_validate_html_backend(html_backend)
+        # Потоковому бэкенду BeautifulSoup не нужен
+        if self.process_html and not _HAS_BS4 and self.html_backend != HTML_BACKEND_STREAM:
             logger.warning("Параметр 'process_html=True', но библиотека BeautifulSoup не установлена. "
                            "HTML не будет обработан. Установите ее: `pip install beautifulsoup4`")
             self.process_html = False
@@ -93,16 +132,49 @@ class Typographer:
 
         # I. --- Конфигурация санитайзера ---
         self.sanitizer: SanitizerProcessor | None = None
-        if isinstance(sanitizer, SanitizerProcessor):
-            self.sanitizer = sanitizer
-        elif sanitizer: # Если передана строка режима или True
-             self.sanitizer = SanitizerProcessor(mode=sanitizer)
+        if sanitizer:
+            from etpgrf.sanitizer import SanitizerProcessor
+            if isinstance(sanitizer, SanitizerProcessor):
+                self.sanitizer = sanitizer
+            else: # Если передана строка режима или True
+                self.sanitizer = SanitizerProcessor(mode=sanitizer)
+        if self.sanitizer and self.process_html and self.html_backend == HTML_BACKEND_STREAM:
+            raise ValueError("etpgrf: санитайзер работает с деревом HTML и несовместим с html_backend='stream'")
 
         # J. --- Конфигурация висячей пунктуации ---
         self.hanging: HangingPunctuationProcessor | None = None
         if hanging_punctuation:
+            from etpgrf.hanging import HangingPunctuationProcessor
             self.hanging = HangingPunctuationProcessor(mode=hanging_punctuation)
 
+        # K. --- Кэш результатов ---
+        #    Ключ кэша включает отпечаток конфигурации, поэтому один кэш можно передать нескольким
+        #    типографам с разными настройками.
+        self.cache: ResultCache | SQLiteResultCache | None = None
+        self._config_fingerprint: str | None = None
+        if cache is not None and cache is not False:
+            from etpgrf.cache import ResultCache, SQLiteResultCache, config_fingerprint
+            self.cache = cache if isinstance(cache, (ResultCache, SQLiteResultCache)) else ResultCache()
+            self._config_fingerprint = config_fingerprint(self.get_config())
+
+        # L. --- Статистика этапов обработки ---
+        #    Без нее замеры не выполняются вовсе. Общий объект TypographerStats можно передать нескольким типографам.
+        self._stats: TypographerStats | None = None
+        if isinstance(stats, TypographerStats):
+            if stats_callback is not None:
+                raise ValueError("etpgrf: при передаче объекта TypographerStats функцию обратного вызова "
+                                 "нужно передать в него, а не в stats_callback")
+            self._stats = stats
+        elif stats or stats_callback is not None:
+            self._stats = TypographerStats(callback=stats_callback)
+
+        # M. --- Запись медленных документов ---
+        #    Можно передать SlowDocumentRecorder или путь к каталогу (тогда порог и размер каталога по умолчанию).
+        self._slow_log: SlowDocumentRecorder | None = None
+        if slow_log is not None:
+            from etpgrf.slowlog import SlowDocumentRecorder
+            self._slow_log = slow_log if isinstance(slow_log, SlowDocumentRecorder) else SlowDocumentRecorder(slow_log)
+
         # Z. --- Логирование инициализации ---
         logger.debug(f"Typographer `__init__`: langs: {self.langs}, mode: {self.mode}, "
                      f"hyphenation: {self.hyphenation is not None}, "
@@ -112,67 +184,293 @@ class Typographer:
                      f"symbols: {self.symbols is not None}, "
                      f"sanitizer: {self.sanitizer is not None}, "
                      f"hanging: {self.hanging is not None}, "
-                     f"process_html: {self.process_html}")
+                     f"cache: {self.cache is not None}, "
+                     f"stats: {self._stats is not None}, "
+                     f"slow_log: {self._slow_log is not None}, "
+                     f"process_html: {self.process_html}, "
+                     f"html_backend: {self.html_backend}")
 
+    def get_config(self) -> dict:
+        """
+        Возвращает полную конфигурацию типографа: языки, режим и параметры всех модулей правил
+        (None -- модуль отключен). Используется для отпечатка конфигурации в ключе кэша.
+        """
+        processors = {'hyphenation': self.hyphenation,
+                      'unbreakables': self.unbreakables,
+                      'quotes': self.quotes,
+                      'layout': self.layout,
+                      'symbols': self.symbols,
+                      'sanitizer': self.sanitizer,
+                      'hanging_punctuation': self.hanging}
+        config = {'langs': list(self.langs), 'mode': self.mode, 'process_html': self.process_html,
+                  'html_backend': self.html_backend}
+        for name, processor in processors.items():
+            config[name] = processor.get_config() if processor is not None else None
+        return config
 
-    def _process_text_node(self, text: str) -> str:
+    @classmethod
+    def from_config(cls, config: dict, **kwargs) -> 'Typographer':
         """
-        Внутренний конвейер, который работает с чистым текстом.
+        Создает типограф по конфигурации, которую вернул `get_config()` (например, сохраненной в JSON).
+
+        :param config: Конфигурация (см. `get_config()`).
+        :param kwargs: Прочие параметры типографа, не входящие в конфигурацию (`cache`, `stats` и т.п.).
+        :return: Типограф, у которого `get_config()` совпадает с `config`.
         """
-        # Шаг 1: Декодируем весь входящий текст в канонический Unicode
-        # (здесь можно использовать html.unescape, но наш кодек тоже подойдет)
-        processed_text = decode_to_unicode(text)
-        # processed_text = text  # ВРЕМЕННО: используем текст как есть
+        from etpgrf.sanitizer import SanitizerProcessor
+        processor_classes = {'hyphenation': Hyphenator,
+                             'unbreakables': Unbreakables,
+                             'quotes': QuotesProcessor,
+                             'layout': LayoutProcessor,
+                             'symbols': SymbolsProcessor,
+                             'sanitizer': SanitizerProcessor}
+        params = {'langs': config['langs'], 'mode': config['mode'], 'process_html': config['process_html'],
+                  'html_backend': config['html_backend']}
+        for name, processor_class in processor_classes.items():
+            processor_config = config[name]
+            params[name] = processor_class(**processor_config) if processor_config is not None else False
+        hanging = config['hanging_punctuation']
+        params['hanging_punctuation'] = hanging['mode'] if hanging is not None else None
+        params.update(kwargs)
+        return cls(**params)
 
-        # Шаг 2: Применяем правила к чистому Unicode-тексту (только правила на уровне ноды)
+
+    def _rule_stages(self) -> list[tuple[str, Callable]]:
+        """
+        Активные модули правил в порядке применения: (этап, функция обработки текста).
+        """
+        stages = []
+        if self.quotes is not None:
+            stages.append((STAGE_QUOTES, self.quotes.process))
+        if self.unbreakables is not None:
+            stages.append((STAGE_UNBREAKABLES, self.unbreakables.process))
         if self.symbols is not None:
-            processed_text = self.symbols.process(processed_text)
+            stages.append((STAGE_SYMBOLS, self.symbols.process))
         if self.layout is not None:
-            processed_text = self.layout.process(processed_text)
+            stages.append((STAGE_LAYOUT, self.layout.process))
         if self.hyphenation is not None:
-            processed_text = self.hyphenation.hyp_in_text(processed_text)
-        # ... вызовы других активных модулей правил ...
+            stages.append((STAGE_HYPHENATION, self.hyphenation.hyp_in_text))
+        # ... другие активные модули правил ...
+        return stages
 
-        # Финальный шаг: кодируем результат в соответствии с выбранным режимом
-        return encode_from_unicode(processed_text, self.mode)
+    def _apply_rules(self,
+                     text: str,
+                     chars: set[str],
+                     edits: EditLog | None = None,
+                     timer: StageTimer | None = None) -> str:
+        """
+        Применяет активные модули правил по порядку: кавычки, неразрывные пробелы, псевдографика, компоновка, переносы.
+
+        Если задан бюджет времени (см. `process_with_budget`) и он исчерпан, правки прерванного этапа отменяются,
+        а сам этап и все следующие пропускаются. Поэтому первыми пропускаются переносы, затем компоновка и т.д.
 
-    def _walk_tree(self, node):
+        :param text: Текст.
+        :param chars: Множество символов текста (модули правил дополняют его).
+        :param edits: Журнал правок (None -- не записывать).
+        :param timer: Замер этапов обработки (None -- без замера).
+        :return: Обработанный текст.
         """
-        Рекурсивно обходит DOM-дерево, находя и обрабатывая все текстовые узлы.
+        budget = current_budget()
+        expired = False
+        for stage, apply in self._rule_stages():
+            if budget is None:
+                text = apply(text, chars, edits)
+            elif expired or budget.remaining() <= 0:
+                expired = True
+                budget.skip(stage)
+                continue
+            else:
+                saved_regions = edits.regions if edits is not None else None
+                try:
+                    text = apply(text, chars, edits)
+                except TimeoutError:
+                    # Журнал правок заменяется целиком после каждого прохода, поэтому достаточно вернуть прежний
+                    if edits is not None:
+                        edits.regions = saved_regions
+                    expired = True
+                    budget.skip(stage)
+            if timer is not None:
+                timer.lap(stage)
+        return text
+
+    def _process_text_runs(self,
+                           texts: list[str],
+                           blocks: list[int] | None = None,
+                           timer: StageTimer | None = None) -> list[str]:
         """
-        # Список "детей" узла, который мы будем изменять.
-        # Копируем в список, так как будем изменять его во время итерации.
-        for child in list(node.children):
-            if isinstance(child, NavigableString):
-                # Если это текстовый узел, обрабатываем его
-                # Пропускаем пустые или состоящие из пробелов узлы
-                if not child.string.strip():
-                    continue
+        Обрабатывает текст узлов HTML: все правила проходят один раз по "супер-строке" -- склейке текстов узлов,
+        поэтому видят контекст через строчные теги. Правки раскладываются обратно по узлам (см. `etpgrf.textmap`).
+        Между узлами разных блоков, а также в начале и в конце супер-строки стоит разделитель, через который правила
+        не работают. Поэтому край блока обрабатывается одинаково и в документе целиком, и в потоковом бэкенде,
+        который обрабатывает блоки по одному.
 
-                processed_node_text = self._process_text_node(child.string)
-                child.replace_with((processed_node_text))
-            elif child.name not in PROTECTED_HTML_TAGS:
-                # Если это "обычный" html-тег, рекурсивно заходим в него
-                self._walk_tree(child)
+        :param texts: Тексты узлов (уже декодированные парсером HTML в Unicode).
+        :param blocks: Номера блоков узлов (None -- все узлы в одном блоке).
+        :param timer: Замер этапов обработки (None -- без замера).
+        :return: Обработанные тексты узлов, закодированные в соответствии с режимом.
+        """
+        parts = [_BLOCK_SEPARATOR]
+        separators = {0}
+        position = len(_BLOCK_SEPARATOR)
+        bounds = [0, position]
+        previous_block = blocks[0] if blocks else None
+        for index, text in enumerate(texts):
+            if blocks is not None and blocks[index] != previous_block:
+                previous_block = blocks[index]
+                separators.add(len(parts))
+                parts.append(_BLOCK_SEPARATOR)
+                position += len(_BLOCK_SEPARATOR)
+                bounds.append(position)
+            parts.append(text)
+            position += len(text)
+            bounds.append(position)
+        separators.add(len(parts))
+        parts.append(_BLOCK_SEPARATOR)
+        bounds.append(position + len(_BLOCK_SEPARATOR))
+        super_string = ''.join(parts)
+        # Один проход по тексту: набор его символов. По нему правила решают, нужно ли вообще сканировать текст
+        # (обработчики дополняют набор символами, которые добавили сами).
+        chars = set(super_string)
+        edits = EditLog(barrier=_BLOCK_SEPARATOR)
+        if timer is not None:
+            timer.lap(STAGE_PARSE)
+
+        processed_text = self._apply_rules(super_string, chars, edits, timer)
+        if processed_text is not super_string:
+            parts = project_edits(super_string, processed_text, edits, bounds, separators)
+        # Финальный шаг: кодируем результат в соответствии с выбранным режимом
+        result = [encode_from_unicode(text, self.mode, chars)
+                  for index, text in enumerate(parts) if index not in separators]
+        if timer is not None:
+            timer.lap(STAGE_ENCODE)
+        return result
 
     def process(self, text: str) -> str:
         """
         Обрабатывает текст, применяя все активные правила типографики.
         Поддерживает обработку текста внутри HTML-тегов.
+        Если задан кэш (`cache`), повторная обработка того же текста берется из него.
         """
         if not text:
             return ""
+        if self._stats is not None or self._slow_log is not None:
+            return self._process_with_stats(text)
+        if self.cache is None:
+            return self._process(text)
+        from etpgrf.cache import make_cache_key
+        key = make_cache_key(self._config_fingerprint, text)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._process(text)
+            # Результат, обработанный не полностью из-за нехватки времени, в кэш не попадает
+            if not is_degraded():
+                self.cache.put(key, result)
+        return result
+
+    def _process_with_stats(self, text: str) -> str:
+        """
+        То же, что `process()`, но с замером этапов обработки (для статистики и записи медленных документов).
+        """
+        timer = StageTimer()
+        result = None
+        if self.cache is not None:
+            from etpgrf.cache import make_cache_key
+            key = make_cache_key(self._config_fingerprint, text)
+            result = self.cache.get(key)
+            timer.lap(STAGE_CACHE)
+            timer.cached = result is not None
+        if result is None:
+            result = self._process(text, timer)
+            timer.degraded = is_degraded()
+            if self.cache is not None and not timer.degraded:
+                self.cache.put(key, result)
+        timer.chars_in = len(text)
+        timer.chars_out = len(result)
+        timer.stop()
+        if self._stats is not None:
+            self._stats.finish(timer)
+        if self._slow_log is not None:
+            self._slow_log.observe(self, text, result, timer)
+        return result
+
+    def process_with_budget(self,
+                            text: str,
+                            budget: float | None = None,
+                            deadline: float | None = None) -> BudgetedResult:
+        """
+        Обрабатывает текст, как `process()`, но с ограничением времени. Регулярные выражения модулей правил получают
+        остаток времени как `timeout` (модуль `regex`), а время функций замены проверяется при каждом совпадении.
+        Если время исчерпано, правки прерванного этапа отменяются, а он и все следующие модули правил пропускаются
+        (первыми -- переносы, затем компоновка, затем псевдографика и т.д.). Разбор HTML, висячая пунктуация,
+        кодирование и сборка результата выполняются всегда (их время линейно по длине текста), поэтому результат --
+        корректный текст (HTML) с правилами, которые успели отработать.
+
+        :param text: Текст для обработки.
+        :param budget: Бюджет в секундах от начала вызова.
+        :param deadline: Крайний срок по часам `time.monotonic()` (например, общий для всего запроса).
+                         Нужно передать либо `budget`, либо `deadline`.
+        :return: BudgetedResult(text, degraded, skipped): результат, пропущены ли этапы и какие именно.
+                 Результат с пропущенными этапами не попадает в кэш.
+        """
+        if (budget is None) == (deadline is None):
+            raise ValueError("etpgrf: для process_with_budget нужно передать либо budget, либо deadline")
+        if deadline is None:
+            deadline = time.monotonic() + budget
+        with budget_scope(deadline) as scope:
+            result = self.process(text)
+        return BudgetedResult(result, bool(scope.skipped), tuple(scope.skipped))
+
+    def stats(self) -> dict | None:
+        """
+        Возвращает снимок накопленной статистики (см. `TypographerStats.snapshot`): число документов, общее время,
+        объем входа и выхода и по каждому этапу (parse, sanitize, quotes, unbreakables, symbols, layout,
+        hyphenation, hanging, encode, serialize, cache) -- число документов, прошедших этап, и суммарное время.
+        None, если статистика не включена (параметры `stats` и `stats_callback`).
+        """
+        return self._stats.snapshot() if self._stats is not None else None
+
+    def reset_stats(self) -> None:
+        """
+        Обнуляет накопленную статистику.
+        """
+        if self._stats is not None:
+            self._stats.reset()
+
+    def _encoded_string(self, text: str) -> 'EncodedString':
+        """
+        Создает текстовый узел для результата `_process_text_runs` (выводится в HTML без повторного экранирования).
+        """
+        return comutil.EncodedString(escape_html_text(text, self.mode))
+
+    def _process(self, text: str, timer: StageTimer | None = None) -> str:
+        """
+        Обработка текста без кэша.
+
+        :param text: Текст для обработки.
+        :param timer: Замер этапов обработки (None -- без замера).
+        """
+        # Потоковый бэкенд HTML: без построения дерева (см. `etpgrf.htmlstream`)
+        if self.process_html and self.html_backend == HTML_BACKEND_STREAM:
+            from etpgrf.htmlstream import iter_process_html
+            return ''.join(iter_process_html(self, text, timer=timer))
         # Если включена обработка HTML и BeautifulSoup доступен
         if self.process_html:
+            from bs4 import BeautifulSoup
+            if timer is not None:
+                timer.mark()
             # --- ЭТАП 1: Токенизация и "умная склейка" ---
             try:
                 soup = BeautifulSoup(text, 'lxml')
             except Exception:
                 soup = BeautifulSoup(text, 'html.parser')
+            if timer is not None:
+                timer.lap(STAGE_PARSE)
 
             # --- ЭТАП 0: Санитизация (Очистка) ---
             if self.sanitizer:
                 result = self.sanitizer.process(soup)
+                if timer is not None:
+                    timer.lap(STAGE_SANITIZE)
                 # Если режим SANITIZE_ALL_HTML, то результат - это строка (чистый текст)
                 if isinstance(result, str):
                     # Переключаемся на обработку обычного текста
@@ -184,75 +482,182 @@ class Typographer:
                     # Или, еще проще: присвоим text = result и пойдем в блок else? Нет, мы уже внутри if.
                     
                     # Решение: Выполняем логику обработки простого текста прямо здесь
-                    return self._process_plain_text(text)
+                    return self._process_plain_text(text, timer)
                 
                 # Если результат - soup, продолжаем работу с ним
                 soup = result
 
-            # 1.1. Создаем "токен-стрим" из текстовых узлов, которые мы будем обрабатывать.
-            # soup.descendants возвращает все дочерние узлы (теги и текст) в порядке их следования.
-            text_nodes = [node for node in soup.descendants
-                          if isinstance(node, NavigableString)
-                          # and node.strip()
-                          and node.parent.name not in PROTECTED_HTML_TAGS]
-            # 1.2. Создаем "супер-строку" и "карту длин"
-            super_string = ""
-            lengths_map = []
-            for node in text_nodes:
-                super_string += str(node)
-                lengths_map.append(len(str(node)))
-
-            # --- ЭТАП 2: Контекстная обработка (ПОКА ЧТО ПРОПУСКАЕМ) ---
-            processed_super_string = super_string
-            # Применяем правила, которым нужен полный контекст (вся супер-строка контекста, очищенная от html).
-            # Важно, чтобы эти правила не меняли длину строки!!!! Иначе карта длин слетит и восстановление не получится.
-            if self.quotes:
-                processed_super_string = self.quotes.process(processed_super_string)
-            if self.unbreakables:
-                processed_super_string = self.unbreakables.process(processed_super_string)
-
-            # --- ЭТАП 3: "Восстановление" ---
-            current_pos = 0
-            for i, node in enumerate(text_nodes):
-                length = lengths_map[i]
-                new_text_part = processed_super_string[current_pos : current_pos + length]
-                node.replace_with(new_text_part) # Заменяем содержимое узла на месте
-                current_pos += length
-
-            # --- ЭТАП 4: Локальная обработка (второй проход) ---
-            # Теперь, когда структура восстановлена, запускаем наш старый рекурсивный обход,
-            # который применит все остальные правила к каждому текстовому узлу.
-            self._walk_tree(soup)
-
-            # --- ЭТАП 4.5: Висячая пунктуация ---
-            # Применяем после всех текстовых преобразований, но перед финальной сборкой
-            if self.hanging:
-                self.hanging.process(soup)
-
-            # --- ЭТАП 5: Финальная сборка ---
-            processed_html = str(soup)
-            # BeautifulSoup по умолчанию экранирует амперсанды (& -> &amp;), которые мы сгенерировали
-            # в _process_text_node. Возвращаем их обратно.
-            return processed_html.replace('&amp;', '&')
+            # 1.1. Создаем "токен-стрим" из текстовых узлов, которые мы будем обрабатывать: один итеративный обход
+            # дерева в порядке документа. Защищенные теги (PROTECTED_HTML_TAGS) пропускаются вместе со всем
+            # содержимым, на любой глубине; комментарии и прочие служебные узлы текстом не считаются.
+            hanging_tags = (self.hanging.target_tags or None) if self.hanging else None
+            text_nodes = collect_text_nodes(soup, skip_tags=PROTECTED_HTML_TAGS, target_tags=hanging_tags,
+                                            block_tags=BLOCK_HTML_TAGS)
+            texts = [str(node) for node, _, _, _, _ in text_nodes]
+
+            # --- ЭТАП 2: Обработка ---
+            # Все правила проходят один раз по "супер-строке" документа, результат раскладывается по узлам.
+            new_texts = self._process_text_runs(texts, [block for _, _, _, _, block in text_nodes], timer)
+
+            # --- ЭТАП 3: Висячая пунктуация и запись в дерево ---
+            # Узел (если нужно) разбивается на части для висячей пунктуации. Измененные узлы записываются в дерево
+            # один раз.
+            replacements = []
+            for (node, parent, index, in_target, _), text, new_text in zip(text_nodes, texts, new_texts):
+                new_nodes = self.hanging.split_text(new_text, soup, self._encoded_string) \
+                    if self.hanging and in_target else None
+                if new_nodes is not None:
+                    replacements.append((node, parent, index, new_nodes))
+                elif new_text != text:
+                    replacements.append((node, parent, index, [self._encoded_string(new_text)]))
+            replace_text_nodes(replacements)
+            if timer is not None:
+                timer.lap(STAGE_HANGING if self.hanging else STAGE_SERIALIZE)
+
+            # --- ЭТАП 4: Финальная сборка ---
+            # Обработанные узлы (EncodedString) уже содержат мнемоники и выводятся как есть, остальной текст
+            # и атрибуты BeautifulSoup экранирует сам. Сериализация -- один проход, без исправлений после нее.
+            result = str(soup)
+            if timer is not None:
+                timer.lap(STAGE_SERIALIZE)
+            return result
+        else:
+            return self._process_plain_text(text, timer)
+
+    def process_many(self,
+                     texts: Iterable[str],
+                     workers: int | None = None,
+                     chunksize: int | None = None,
+                     ordered: bool = True,
+                     pool: str | None = None) -> Iterator[str]:
+        """
+        Обрабатывает набор документов на пуле процессов или потоков (см. `etpgrf.batch`).
+        Каждый процесс пула получает копию типографа один раз и переиспользует ее для всех документов, потоки пула
+        используют сам типограф. Мелкие документы группируются в пачки, крупные отправляются в пул по одному.
+
+        :param texts: Итерируемый набор документов.
+        :param workers: Число процессов или потоков (None -- по числу ядер, `workers <= 1` -- без пула).
+        :param chunksize: Максимальное число документов в пачке.
+        :param ordered: True -- результаты в порядке входных документов, False -- по мере готовности.
+        :param pool: 'process', 'thread' или 'auto' (по умолчанию: потоки, если интерпретатор работает без GIL,
+                     иначе процессы).
+        :return: Генератор результатов обработки.
+        """
+        from etpgrf.batch import process_many
+        return process_many(self, texts, workers=workers, chunksize=chunksize, ordered=ordered, pool=pool)
+
+    def process_stream(self,
+                       source: str | IO[str] | Iterable[str],
+                       writer: IO[str],
+                       chunk_size: int | None = None) -> int:
+        """
+        Потоковая обработка с ограниченным расходом памяти. Простой текст режется только на абзацных разрывах,
+        через которые не "дотягивается" ни одно правило (см. `etpgrf.streaming`), поэтому результат совпадает
+        с `process()` для всего текста целиком. Если абзацного разрыва нет дольше `MAX_BUFFER_CHUNKS` фрагментов
+        (`etpgrf_settings.stream`), буфер режется по пробелу, чтобы память оставалась ограниченной, и результат
+        на таком стыке может отличаться от `process()`. HTML обрабатывается потоково только
+        с `html_backend='stream'` (см. `etpgrf.htmlstream`).
+
+        :param source: Файлоподобный объект с методом `read()`, итератор фрагментов текста или строка.
+        :param writer: Объект с методом `write()`, куда пишется результат.
+        :param chunk_size: Желаемый размер обрабатываемого фрагмента в символах.
+        :return: Число записанных символов.
+        """
+        if self.process_html and self.html_backend != HTML_BACKEND_STREAM:
+            raise ValueError("etpgrf: потоковая обработка HTML поддерживается только с html_backend='stream' "
+                             "(или для простого текста, process_html=False)")
+        timer = self._stats.start() if self._stats is not None else None
+        if self.process_html:
+            from etpgrf.htmlstream import iter_process_html
+            chunks = iter_process_html(self, source, chunk_size, timer=timer)
         else:
-            return self._process_plain_text(text)
+            from etpgrf.streaming import iter_process_stream, _iter_source
+            process_chunk = self._process_plain_text
+            if timer is not None:
+                # Пробная обработка при поиске безопасной границы фрагмента (см. `find_safe_cut`) тоже входит
+                # во время этапов, а объем входа считается по прочитанному тексту
+                def process_chunk(chunk: str) -> str:
+                    return self._process_plain_text(chunk, timer)
 
-    def _process_plain_text(self, text: str) -> str:
+                def count_source(pieces: Iterator[str]) -> Iterator[str]:
+                    for piece in pieces:
+                        timer.chars_in += len(piece)
+                        yield piece
+                source = count_source(_iter_source(source, chunk_size or etpgrf_settings.stream.CHUNK_SIZE))
+            chunks = iter_process_stream(process_chunk, source, chunk_size)
+        written = 0
+        for processed_chunk in chunks:
+            writer.write(processed_chunk)
+            written += len(processed_chunk)
+        if timer is not None:
+            timer.chars_out = written
+            self._stats.finish(timer)
+        return written
+
+    def process_incremental(self, old_text: str, old_output: str, new_text: str) -> str:
+        """
+        Инкрементальная обработка новой версии документа (см. `etpgrf.incremental`). Заново обрабатываются только
+        измененные блоки (абзацы простого текста или блочные элементы HTML верхнего уровня) и столько соседних,
+        сколько нужно правилам с контекстом. Результат для остальных блоков берется из `old_output` как есть.
+
+        :param old_text: Предыдущая версия документа.
+        :param old_output: Результат обработки `old_text` этим же типографом.
+        :param new_text: Новая версия документа.
+        :return: Результат обработки `new_text` (совпадает с `process(new_text)`).
+        """
+        from etpgrf.incremental import process_incremental
+        return process_incremental(self, old_text, old_output, new_text)
+
+    async def aprocess(self, text: str, executor: Executor | None = None, semaphore=None) -> str:
+        """
+        Асинхронная версия `process()` (см. `etpgrf.aio`). CPU-емкая обработка выносится в `executor`, чтобы
+        не блокировать цикл событий. Короткие тексты обрабатываются сразу, без перехода в пул.
+
+        :param text: Текст для обработки.
+        :param executor: Пул потоков или процессов (None -- пул по умолчанию цикла событий).
+        :param semaphore: asyncio.Semaphore, ограничивающий число документов в пуле.
+        :return: Обработанный текст.
+        """
+        from etpgrf.aio import aprocess
+        return await aprocess(self, text, executor=executor, semaphore=semaphore)
+
+    def aprocess_many(self,
+                      texts: Iterable[str] | AsyncIterable[str],
+                      executor: Executor | None = None,
+                      concurrency: int | None = None,
+                      semaphore=None) -> AsyncIterator[str]:
+        """
+        Асинхронная обработка набора документов с ограничением числа одновременно обрабатываемых
+        (см. `etpgrf.aio`). Результаты отдаются в порядке входных документов.
+
+        :param texts: Обычный или асинхронный итерируемый набор документов.
+        :param executor: Пул потоков или процессов (None -- пул по умолчанию цикла событий).
+        :param concurrency: Максимальное число документов в обработке.
+        :param semaphore: Общий asyncio.Semaphore (например, один на весь сервис).
+        :return: Асинхронный генератор результатов.
+        """
+        from etpgrf.aio import aprocess_many
+        return aprocess_many(self, texts, executor=executor, concurrency=concurrency, semaphore=semaphore)
+
+    def _process_plain_text(self, text: str, timer: StageTimer | None = None) -> str:
         """
         Логика обработки обычного текста (вынесена из process для переиспользования).
+
+        :param text: Текст для обработки.
+        :param timer: Замер этапов обработки (None -- без замера).
         """
+        if timer is not None:
+            timer.mark()
         # Шаг 0: Нормализация
         processed_text = decode_to_unicode(text)
+        # Набор символов текста (один проход): правила, которые не могут сработать, пропускаются без сканирования
+        chars = set(processed_text)
+        if timer is not None:
+            timer.lap(STAGE_PARSE)
         # Шаг 1: Применяем все правила последовательно
-        if self.quotes:
-            processed_text = self.quotes.process(processed_text)
-        if self.unbreakables:
-            processed_text = self.unbreakables.process(processed_text)
-        if self.symbols:
-            processed_text = self.symbols.process(processed_text)
-        if self.layout:
-            processed_text = self.layout.process(processed_text)
-        if self.hyphenation:
-            processed_text = self.hyphenation.hyp_in_text(processed_text)
+        processed_text = self._apply_rules(processed_text, chars, None, timer)
         # Шаг 2: Финальное кодирование
-        return encode_from_unicode(processed_text, self.mode)
+        result = encode_from_unicode(processed_text, self.mode, chars)
+        if timer is not None:
+            timer.lap(STAGE_ENCODE)
+        return result
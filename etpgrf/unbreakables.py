@@ -8,9 +8,10 @@ import regex
 import logging
 import html
 from etpgrf.config import LANG_RU, LANG_RU_OLD, LANG_EN  # , KEY_NBSP, ALL_ENTITIES
-from etpgrf.comutil import parse_and_validate_langs
+from etpgrf.comutil import parse_and_validate_langs, RuleTrigger, WHITESPACE_CHARS
 from etpgrf.config import CHAR_NBSP
 from etpgrf.defaults import etpgrf_settings
+from etpgrf.textmap import EditLog, tracked_sub
 
 # --- Наборы коротких слов для разных языков ---
 # Используем frozenset для скорости и неизменяемости.
@@ -86,39 +87,74 @@ class Unbreakables:
         pre_words -= post_words
 
         # --- 2. Компиляция паттернов с оптимизацией ---
+        # Условия применимости: в тексте должна быть первая буква одного из слов (в любом регистре) и пробел
         self._pre_pattern = None
+        self._pre_trigger = None
         if pre_words:
             # Оптимизация: сортируем слова по длине от большего к меньшему
             sorted_words = sorted(list(pre_words), key=len, reverse=True)
             # Паттерн для слов, ПОСЛЕ которых нужен nbsp. regex.escape для безопасности.
             self._pre_pattern = regex.compile(r"(?i)\b(" + "|".join(map(regex.escape, sorted_words)) + r")\b\s+")
+            self._pre_trigger = RuleTrigger({word[0] for word in pre_words}, WHITESPACE_CHARS,
+                                            min_len=min(map(len, pre_words)) + 1, ignore_case=True)
 
         self._post_pattern = None
+        self._post_trigger = None
         if post_words:
             # Оптимизация: сортируем слова по длине от большего к меньшему
             sorted_particles = sorted(list(post_words), key=len, reverse=True)
             # Паттерн для слов, ПЕРЕД которыми нужен nbsp.
             self._post_pattern = regex.compile(r"(?i)(\s)\b(" + "|".join(map(regex.escape, sorted_particles)) + r")\b")
+            self._post_trigger = RuleTrigger({word[0] for word in post_words}, WHITESPACE_CHARS,
+                                             min_len=min(map(len, post_words)) + 1, ignore_case=True)
+
+        # Символы, которые могут появиться в тексте после обработки
+        self.produced_chars = frozenset((CHAR_NBSP,))
 
         logger.debug(f"Unbreakables `__init__`. Langs: {self.langs}, "
                       f"Pre-words: {len(pre_words)}, Post-words: {len(post_words)}")
 
 
-    def process(self, text: str) -> str:
+    def get_config(self) -> dict:
+        """
+        Возвращает параметры, с которыми создан объект (для отпечатка конфигурации типографа).
+        """
+        return {'langs': list(self.langs)}
+
+    def may_apply(self, chars: set[str] | frozenset[str], length: int) -> bool:
+        """
+        Проверяет по набору символов текста, может ли обработка что-то изменить.
+
+        :param chars: Множество символов текста.
+        :param length: Длина текста.
+        :return: False, если текст точно останется без изменений.
+        """
+        return any(trigger is not None and trigger.may_apply(chars, length)
+                   for trigger in (self._pre_trigger, self._post_trigger))
+
+    def process(self, text: str, chars: set[str] | None = None, edits: EditLog | None = None) -> str:
         """
         Заменяет обычные пробелы вокруг коротких слов на неразрывные.
+
+        :param text: Текст для обработки.
+        :param chars: Множество символов текста (необязательно). Если передано, правила, которые не могут
+                      сработать на этом тексте, пропускаются, а новые символы добавляются в это множество.
+        :param edits: Журнал правок (необязательно): замены записываются в него (см. `etpgrf.textmap`).
+        :return: Обработанный текст.
         """
         if not text:
             return text
         processed_text = text
 
         # 1. Обработка слов, ПОСЛЕ которых нужен неразрывный пробел ("в дом" -> "в&nbsp;дом")
-        if self._pre_pattern:
-            processed_text = self._pre_pattern.sub(r"\g<1>" + CHAR_NBSP, processed_text)
+        if self._pre_pattern and (chars is None or self._pre_trigger.may_apply(chars, len(processed_text))):
+            processed_text = tracked_sub(self._pre_pattern, r"\g<1>" + CHAR_NBSP, processed_text, edits)
 
         # 2. Обработка частиц, ПЕРЕД которыми нужен неразрывный пробел ("сказал бы" -> "сказал&nbsp;бы")
-        if self._post_pattern:
+        if self._post_pattern and (chars is None or self._post_trigger.may_apply(chars, len(processed_text))):
             # \g<1> - это пробел, \g<2> - это частица
-            processed_text = self._post_pattern.sub(CHAR_NBSP + r"\g<2>", processed_text)
+            processed_text = tracked_sub(self._post_pattern, CHAR_NBSP + r"\g<2>", processed_text, edits)
 
+        if chars is not None and processed_text is not text:
+            chars |= self.produced_chars
         return processed_text
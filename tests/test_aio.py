@@ -0,0 +1,82 @@
+# tests/test_aio.py
+# Тестирует асинхронный API (Typographer.aprocess, Typographer.aprocess_many).
+
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from etpgrf import Typographer
+from etpgrf.defaults import etpgrf_settings
+
+AIO_TEXTS = [
+    'Простой текст с "кавычками".',
+    '',
+    'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."',
+    'в доме',
+]
+# Длинный текст заведомо уходит в пул, а не обрабатывается в цикле событий
+AIO_LONG_TEXT = ' '.join(AIO_TEXTS) * (etpgrf_settings.aio.INLINE_MAX_LEN // 50)
+
+
+@pytest.mark.parametrize("text", AIO_TEXTS + [AIO_LONG_TEXT])
+def test_aprocess_matches_process(text):
+    """
+    Результат aprocess совпадает с process и для коротких (в цикле событий), и для длинных (в пуле) текстов.
+    """
+    typo = Typographer(langs='ru', mode='mixed')
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return await typo.aprocess(text, executor=executor, semaphore=asyncio.Semaphore(1))
+
+    assert asyncio.run(run()) == typo.process(text)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_aprocess_many_ordered(concurrency):
+    """
+    aprocess_many отдает результаты в порядке входа; источником может быть асинхронный итератор.
+    """
+    typo = Typographer(langs='ru', mode='mixed')
+    texts = (AIO_TEXTS + [AIO_LONG_TEXT]) * 3
+
+    async def source():
+        for text in texts:
+            yield text
+
+    async def run():
+        return [result async for result in typo.aprocess_many(source(), concurrency=concurrency)]
+
+    assert asyncio.run(run()) == [typo.process(text) for text in texts]
+
+
+def test_aprocess_many_backpressure_and_cancel():
+    """
+    Источник читается не дальше, чем на concurrency документов вперед, а закрытие генератора
+    отменяет еще не завершенные обработки.
+    """
+    typo = Typographer(langs='ru')
+    consumed = []
+
+    def source():
+        for i in range(100):
+            consumed.append(i)
+            yield AIO_LONG_TEXT
+
+    async def run():
+        results = typo.aprocess_many(source(), concurrency=2)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    assert asyncio.run(run()) == typo.process(AIO_LONG_TEXT)
+    assert len(consumed) <= 3
+
+
+def test_aprocess_many_rejects_bad_concurrency():
+    typo = Typographer(langs='ru')
+
+    async def run():
+        return [result async for result in typo.aprocess_many(AIO_TEXTS, concurrency=0)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
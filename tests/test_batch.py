@@ -0,0 +1,120 @@
+# tests/test_batch.py
+# Тестирует пакетную обработку Typographer.process_many и группировку документов в пачки.
+
+import time
+import pytest
+from etpgrf import Typographer
+from etpgrf.batch import iter_batches, resolve_pool, gil_enabled
+
+BATCH_TEXTS = [
+    'Простой текст с "кавычками".',
+    '',
+    'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."',
+    'Электрофоретическое исследование характеризуется квинтэссенциальной значимостью',
+    'в доме',
+] * 5
+
+
+def test_iter_batches_groups_small_and_isolates_large():
+    """
+    Мелкие документы собираются в пачки, крупный документ уходит отдельной пачкой.
+    """
+    texts = ['a' * 10, 'b' * 10, 'c' * 100, 'd' * 10, 'e' * 10, 'f' * 10]
+    batches = list(iter_batches(texts, chunksize=2, chunk_chars=50))
+    assert batches == [
+        [(0, 'a' * 10), (1, 'b' * 10)],
+        [(2, 'c' * 100)],
+        [(3, 'd' * 10), (4, 'e' * 10)],
+        [(5, 'f' * 10)],
+    ]
+
+
+def test_iter_batches_limits_chars():
+    """
+    Пачка закрывается, когда в ней набирается chunk_chars символов.
+    """
+    texts = ['a' * 30, 'b' * 30, 'c' * 30]
+    batches = list(iter_batches(texts, chunksize=100, chunk_chars=50))
+    assert [[idx for idx, _ in batch] for batch in batches] == [[0, 1], [2]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_many_ordered(workers):
+    """
+    Результаты process_many совпадают с последовательной обработкой и идут в порядке входа.
+    """
+    typo = Typographer(langs='ru', mode='mixed')
+    expected = [typo.process(text) for text in BATCH_TEXTS]
+    actual = list(typo.process_many(iter(BATCH_TEXTS), workers=workers, chunksize=3))
+    assert actual == expected
+
+
+def test_process_many_unordered():
+    """
+    При ordered=False возвращаются все результаты (в порядке готовности).
+    """
+    typo = Typographer(langs='ru', mode='mixed', process_html=True)
+    texts = [f'<p>{text}</p>' for text in BATCH_TEXTS]
+    expected = [typo.process(text) for text in texts]
+    actual = list(typo.process_many(texts, workers=2, chunksize=4, ordered=False))
+    assert sorted(actual) == sorted(expected)
+
+
+def test_process_many_rejects_bad_chunksize():
+    typo = Typographer(langs='ru')
+    with pytest.raises(ValueError):
+        list(typo.process_many(BATCH_TEXTS, workers=2, chunksize=0))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_process_many_thread_pool(ordered):
+    """
+    Пул потоков использует сам типограф (без копирования), результаты совпадают с последовательной обработкой.
+    """
+    typo = Typographer(langs='ru', mode='mixed', process_html=True, stats=True)
+    texts = [f'<p>{text}</p>' for text in BATCH_TEXTS]
+    expected = [typo.process(text) for text in texts]
+    typo.reset_stats()
+    actual = list(typo.process_many(texts, workers=4, chunksize=2, ordered=ordered, pool='thread'))
+    assert actual == expected if ordered else sorted(actual) == sorted(expected)
+    # Статистика общая: документы, обработанные в потоках пула, в нее попадают
+    assert typo.stats()['documents'] == len(texts)
+
+
+class _SlowFirstTypographer(Typographer):
+    # Первый документ обрабатывается долго, остальные -- сразу
+    def process(self, text):
+        if text == 'slow':
+            time.sleep(0.5)
+        return text
+
+
+def test_process_many_ordered_buffer_is_bounded():
+    """
+    При ordered=True готовые результаты после медленного документа копятся ограниченно: пока буфер полон,
+    входные документы не читаются.
+    """
+    consumed = 0
+
+    def texts():
+        nonlocal consumed
+        for idx in range(2000):
+            consumed += 1
+            yield 'slow' if idx == 0 else f'text {idx}'
+
+    typo = _SlowFirstTypographer(langs='ru')
+    results = typo.process_many(texts(), workers=2, chunksize=2, pool='thread')
+    assert next(results) == 'slow'
+    # Буфер (workers * 2 * chunksize) + пачки в пуле (workers * 2) + одна собираемая пачка
+    assert consumed <= 8 + 4 * 2 + 2 + 1
+    assert list(results) == [f'text {idx}' for idx in range(1, 2000)]
+
+
+def test_resolve_pool():
+    assert resolve_pool('process') == 'process'
+    assert resolve_pool('THREAD') == 'thread'
+    assert resolve_pool('auto') == ('process' if gil_enabled() else 'thread')
+    with pytest.raises(ValueError):
+        resolve_pool('fork')
+    with pytest.raises(ValueError):
+        list(Typographer().process_many(BATCH_TEXTS, pool='fork'))
@@ -0,0 +1,70 @@
+# tests/test_benchmarks.py
+# Проверяет, что набор бенчмарков (benchmarks/) работает: корпуса детерминированы, результаты сохраняются в JSON
+# и сравниваются. Сами замеры здесь не проверяются.
+
+import json
+from benchmarks import corpora
+from benchmarks.run import build_suite, run_suite, compare, main
+
+
+def test_corpora_are_deterministic():
+    assert corpora.prose('mixed', 3) == corpora.prose('mixed', 3)
+    assert corpora.html_articles('ru', 2, seed=5) == corpora.html_articles('ru', 2, seed=5)
+    assert corpora.prose('ru', 2, seed=1) != corpora.prose('ru', 2, seed=2)
+    assert len(corpora.huge_document('en', 10_000)) >= 10_000
+
+
+def test_suite_covers_typographer_and_modules():
+    names = [benchmark.name for benchmark in build_suite()]
+    assert len(names) == len(set(names))
+    for prefix in ('typographer.plain.', 'typographer.html.', 'hyphenator.hyp_in_word.', 'layout.process.',
+                   'unbreakables.process.', 'codec.encode_from_unicode.'):
+        assert any(name.startswith(prefix) for name in names)
+
+
+def test_run_suite_and_compare(tmp_path):
+    data = run_suite(['typographer.plain.titles', 'codec.*'], scale=0.01, repeat=1, min_time=0)
+    assert set(data['results']) == {'typographer.plain.titles', 'codec.encode_from_unicode.unicode',
+                                    'codec.encode_from_unicode.mnemonic', 'codec.encode_from_unicode.mixed'}
+    result = data['results']['typographer.plain.titles']
+    assert result['docs'] == 50 and result['chars'] > 0 and result['chars_per_sec'] > 0
+
+    old_path = tmp_path / 'old.json'
+    old_path.write_text(json.dumps(data), encoding='utf-8')
+    new_path = tmp_path / 'new.json'
+    assert main(['--filter', 'codec.*', '--scale', '0.01', '--repeat', '1', '--min-time', '0',
+                 '-o', str(new_path), '--compare', str(old_path)]) == 0
+    new_data = json.loads(new_path.read_text(encoding='utf-8'))
+    assert [row[0] for row in compare(data, new_data)] == list(new_data['results'])
+
+
+def test_thread_scaling(tmp_path):
+    from benchmarks.threads import run_scaling, main as threads_main
+    data = run_scaling([1, 2], scale=0.02, repeat=1)
+    assert [result['threads'] for result in data['results']] == [1, 2]
+    assert data['results'][0]['speedup'] == 1.0
+    assert 'gil_enabled' in data['meta']
+    output = tmp_path / 'threads.json'
+    assert threads_main(['--threads', '1,2', '--scale', '0.02', '--repeat', '1', '-o', str(output)]) == 0
+    assert len(json.loads(output.read_text(encoding='utf-8'))['results']) == 2
+
+
+def test_scaling_suite(tmp_path):
+    from benchmarks.scaling import build_cases, fit_exponent, parse_size, run_scaling, main as scaling_main
+    assert abs(fit_exponent([1_000, 10_000, 100_000], [0.001, 0.01, 0.1]) - 1.0) < 1e-9
+    assert abs(fit_exponent([1_000, 10_000, 100_000], [0.001, 0.1, 10.0]) - 2.0) < 1e-9
+    assert parse_size('10K') == 10_000 and parse_size('1.5M') == 1_500_000 and parse_size('300') == 300
+    for name, (shape, _) in build_cases().items():
+        assert len(shape(2_000)) >= 1_000, name
+        assert shape(2_000) == shape(2_000)
+
+    data = run_scaling(['layout.process.*', 'typographer.html.dom_deep'], sizes=[1_000, 4_000], repeat=1,
+                       min_time=0)
+    assert set(data['results']) == {'layout.process.unit_chains', 'typographer.html.dom_deep'}
+    result = data['results']['layout.process.unit_chains']
+    assert len(result['sizes']) == len(result['seconds']) == 2
+    assert 'exponent' in result and 'flagged' in result
+    output = tmp_path / 'scaling.json'
+    assert scaling_main(['--filter', 'quotes.*', '--sizes', '1K,2K', '--repeat', '1', '--max-exponent', '100',
+                         '-o', str(output)]) == 0
+    assert set(json.loads(output.read_text(encoding='utf-8'))['results']) == {'quotes.process.many_quotes'}
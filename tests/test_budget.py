@@ -0,0 +1,104 @@
+# tests/test_budget.py
+# Тестирует обработку с бюджетом времени (Typographer.process_with_budget) и пропуск этапов при его нехватке.
+
+import time
+import pytest
+from etpgrf import Typographer, Hyphenator, ResultCache
+from etpgrf.budget import current_budget, budget_scope, regex_timeout
+
+TEXT = 'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д." Электрофоретический эффект...'
+HTML = f'<p>{TEXT}</p><p><b>"Жирный"</b> текст (c) 2024</p>'
+ALL_RULES = ('quotes', 'unbreakables', 'symbols', 'layout', 'hyphenation')
+
+
+class SlowHyphenator(Hyphenator):
+    """Переносы, которые не укладываются в бюджет: функция замены тратит время на каждом слове."""
+
+    def hyp_in_text(self, text, chars=None, edits=None):
+        time.sleep(0.05)
+        return super().hyp_in_text(text, chars, edits)
+
+
+@pytest.mark.parametrize("kwargs, text", [
+    ({}, TEXT),
+    ({'process_html': True, 'hanging_punctuation': 'both'}, HTML),
+    ({'process_html': True, 'html_backend': 'stream'}, HTML),
+])
+def test_budget_large_enough(kwargs, text):
+    typo = Typographer(langs='ru', **kwargs)
+    result = typo.process_with_budget(text, budget=60)
+    assert result == (typo.process(text), False, ())
+    assert typo.process_with_budget(text, deadline=time.monotonic() + 60).text == result.text
+
+
+@pytest.mark.parametrize("kwargs, text", [
+    ({}, TEXT),
+    ({'process_html': True}, HTML),
+    ({'process_html': True, 'html_backend': 'stream'}, HTML),
+])
+def test_budget_expired(kwargs, text):
+    """
+    Бюджет исчерпан до начала: пропущены все модули правил, но результат -- корректный закодированный текст.
+    """
+    typo = Typographer(langs='ru', **kwargs)
+    result = typo.process_with_budget(text, budget=0)
+    assert result.degraded is True
+    assert result.skipped == ALL_RULES
+    off = dict.fromkeys(ALL_RULES, False)
+    assert result.text == Typographer(langs='ru', **kwargs, **off).process(text)
+
+
+@pytest.mark.parametrize("kwargs, text", [
+    ({}, TEXT),
+    ({'process_html': True}, HTML),
+])
+def test_budget_skips_slow_stage(kwargs, text):
+    """
+    Медленный последний этап (переносы) пропускается, результаты предыдущих этапов сохраняются.
+    """
+    typo = Typographer(langs='ru', hyphenation=SlowHyphenator(langs='ru', max_unhyphenated_len=8), **kwargs)
+    result = typo.process_with_budget(text, budget=0.02)
+    assert result.skipped == ('hyphenation',)
+    assert result.text == Typographer(langs='ru', hyphenation=False, **kwargs).process(text)
+
+
+def test_budget_timeout_inside_stage_reverts_edits():
+    """
+    Этап, прерванный по таймауту посреди замен, не оставляет частичных правок.
+    """
+    typo = Typographer(langs='ru', quotes=False, unbreakables=False, symbols=False, layout=False,
+                       hyphenation=Hyphenator(langs='ru', max_unhyphenated_len=8))
+    text = ' '.join(['Электрофоретический'] * 20000)
+    result = typo.process_with_budget(text, budget=0.001)
+    assert result.skipped == ('hyphenation',)
+    assert result.text == text
+
+
+def test_budget_degraded_results_not_cached():
+    typo = Typographer(langs='ru', cache=ResultCache(), stats=True)
+    assert typo.process_with_budget(TEXT, budget=0).degraded
+    assert len(typo.cache) == 0
+    assert typo.stats()['degraded'] == 1
+    full = typo.process_with_budget(TEXT, budget=60)
+    assert not full.degraded
+    assert len(typo.cache) == 1
+    # Из кэша берется полный результат, даже если бюджет исчерпан
+    assert typo.process_with_budget(TEXT, budget=0) == (full.text, False, ())
+
+
+def test_budget_scope():
+    assert current_budget() is None
+    assert regex_timeout() is None
+    with budget_scope(time.monotonic() + 60) as budget:
+        assert current_budget() is budget
+        assert 0 < regex_timeout() <= 60
+    assert current_budget() is None
+    with budget_scope(time.monotonic() - 1):
+        with pytest.raises(TimeoutError):
+            regex_timeout()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {'budget': 1, 'deadline': time.monotonic() + 1}])
+def test_budget_validation(kwargs):
+    with pytest.raises(ValueError):
+        Typographer().process_with_budget(TEXT, **kwargs)
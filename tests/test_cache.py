@@ -0,0 +1,234 @@
+# tests/test_cache.py
+# Тестирует кэши результатов (ResultCache, SQLiteResultCache) и их использование в Typographer.
+
+import os
+import pickle
+import pytest
+import etpgrf
+from etpgrf import Typographer, ResultCache, SQLiteResultCache, LayoutProcessor, Hyphenator
+from etpgrf.defaults import etpgrf_settings
+
+
+def test_cache_hits_and_misses():
+    """
+    Повторная обработка того же текста берется из кэша, результат не меняется.
+    """
+    cache = ResultCache()
+    typo = Typographer(langs='ru', mode='mixed', cache=cache)
+    text = 'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."'
+    first = typo.process(text)
+    second = typo.process(text)
+    assert first == second == Typographer(langs='ru', mode='mixed').process(text)
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+    assert stats['bytes'] > 0
+
+
+@pytest.mark.parametrize("other_kwargs", [
+    {'langs': 'en'},
+    {'mode': 'unicode'},
+    {'process_html': True},
+    {'hyphenation': False},
+    {'hyphenation': Hyphenator(langs='ru', max_unhyphenated_len=20)},
+    {'layout': LayoutProcessor(langs='ru', process_units=False)},
+    {'hanging_punctuation': 'left'},
+])
+def test_cache_key_depends_on_config(other_kwargs):
+    """
+    Типографы с разной конфигурацией не используют результаты друг друга из общего кэша.
+    """
+    cache = ResultCache()
+    base = Typographer(langs='ru', mode='mixed', cache=cache)
+    other = Typographer(**{'langs': 'ru', 'mode': 'mixed', **other_kwargs, 'cache': cache})
+    assert base.get_config() != other.get_config()
+    text = '"Электрофоретическое" исследование -- в 10 км от дома'
+    base.process(text)
+    other.process(text)
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['entries'] == 2
+
+
+def test_cache_same_config_shares_entries():
+    """
+    Типографы с одинаковой конфигурацией используют общие записи.
+    """
+    cache = ResultCache()
+    Typographer(langs='ru', cache=cache).process('в доме')
+    Typographer(langs='ru', cache=cache).process('в доме')
+    assert cache.stats()['hits'] == 1
+
+
+def test_cache_evicts_by_entries():
+    cache = ResultCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key * 10)
+    assert cache.get('a') is None
+    assert cache.get('c') == 'c' * 10
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = ResultCache(max_bytes=300)
+    cache.put('a', 'a' * 100)
+    cache.put('b', 'b' * 100)
+    cache.get('a')                  # 'a' теперь использовалась недавно
+    cache.put('c', 'c' * 100)
+    assert cache.get('b') is None
+    assert cache.get('a') == 'a' * 100
+    assert cache.stats()['bytes'] <= 300
+    # Результат больше всего кэша не запоминается
+    cache.put('d', 'd' * 1000)
+    assert cache.get('d') is None
+
+
+def test_cache_pickles_without_entries():
+    """
+    Типограф с кэшем передается в другой процесс (pickle) с пустым кэшем тех же размеров.
+    """
+    typo = Typographer(langs='ru', cache=ResultCache(max_entries=5))
+    typo.process('в доме')
+    clone = pickle.loads(pickle.dumps(typo))
+    assert clone.cache.max_entries == 5
+    assert len(clone.cache) == 0
+    assert clone.process('в доме') == typo.process('в доме')
+
+
+@pytest.mark.parametrize("kwargs", [{'max_entries': 0}, {'max_bytes': 0}])
+def test_cache_rejects_bad_limits(kwargs):
+    with pytest.raises(ValueError):
+        ResultCache(**kwargs)
+
+
+# --- Персистентный кэш на SQLite ---
+
+def test_sqlite_cache_survives_restart(tmp_path):
+    """
+    Результаты сохраняются в файле и доступны новому объекту кэша (новому процессу после перезапуска).
+    """
+    path = tmp_path / 'etpgrf.sqlite'
+    text = 'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."'
+    typo = Typographer(langs='ru', mode='mixed', cache=SQLiteResultCache(path))
+    expected = typo.process(text)
+    typo.cache.close()
+
+    warm_cache = SQLiteResultCache(path)
+    warm = Typographer(langs='ru', mode='mixed', cache=warm_cache)
+    assert warm.process(text) == expected
+    assert warm_cache.stats()['hits'] == 1
+    assert warm_cache.stats()['entries'] == 1
+    # Другая конфигурация -- другой ключ
+    Typographer(langs='ru', mode='unicode', cache=warm_cache).process(text)
+    assert warm_cache.stats()['misses'] == 1
+
+
+def test_sqlite_cache_errors_do_not_raise(tmp_path, caplog):
+    """
+    Ошибки SQLite (испорченный файл базы) не выходят из методов кэша: запросы считаются промахами,
+    а ошибки логируются.
+    """
+    path = tmp_path / 'etpgrf.sqlite'
+    cache = SQLiteResultCache(path)
+    cache.put('key', 'value')
+    cache.close()
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(f'{path}{suffix}'):
+            os.remove(f'{path}{suffix}')
+    path.write_bytes(b'this is not a database' * 100)
+    assert cache.get('key') is None
+    cache.put('other', 'value')
+    assert cache.evict() == 0
+    cache.clear()
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['entries'] is None and stats['bytes'] is None
+    assert 'SQLiteResultCache' in caplog.text
+    text = 'Он сказал: "Привет"'
+    assert Typographer(langs='ru', cache=cache).process(text) == Typographer(langs='ru').process(text)
+
+
+def test_sqlite_cache_keeps_other_versions_on_open(tmp_path, monkeypatch):
+    """
+    Процесс другой версии библиотеки не очищает общую базу при открытии (постепенное обновление воркеров),
+    а записи разных версий не пересекаются: версия входит в отпечаток ключа.
+    """
+    path = tmp_path / 'etpgrf.sqlite'
+    text = 'Он сказал: "Привет"'
+    old_cache = SQLiteResultCache(path)
+    Typographer(langs='ru', cache=old_cache).process(text)
+    old_cache.put('key', 'value')
+    monkeypatch.setattr(etpgrf, '__version__', etpgrf.__version__ + '.dev')
+    new_cache = SQLiteResultCache(path)
+    assert new_cache.stats()['entries'] == 2
+    assert old_cache.get('key') == 'value'
+    Typographer(langs='ru', cache=new_cache).process(text)
+    stats = new_cache.stats()
+    assert stats['hits'] == 0 and stats['misses'] == 1
+    assert stats['entries'] == 3
+
+
+def test_sqlite_cache_evicts_other_versions_first(tmp_path, monkeypatch):
+    """
+    При превышении объема сначала вытесняются записи другой версии, даже если они использовались позже.
+    """
+    monkeypatch.setattr(etpgrf_settings.cache, 'SQLITE_EVICT_EVERY', 1)
+    path = tmp_path / 'etpgrf.sqlite'
+    new_cache = SQLiteResultCache(path, max_bytes=250)
+    new_cache.put('new', 'n' * 100)
+    monkeypatch.setattr(etpgrf, '__version__', etpgrf.__version__ + '.old')
+    old_cache = SQLiteResultCache(path, max_bytes=250)
+    old_cache.put('old', 'o' * 100)
+    new_cache.put('newer', 'm' * 100)
+    assert new_cache.stats()['evictions'] == 1
+    assert new_cache.get('old') is None
+    assert new_cache.get('new') == 'n' * 100
+    assert new_cache.get('newer') == 'm' * 100
+
+
+def test_sqlite_cache_migrates_database_without_version_column(tmp_path):
+    """
+    База, созданная без столбца версии, открывается без потери записей; ее записи вытесняются первыми.
+    """
+    import sqlite3
+    path = tmp_path / 'etpgrf.sqlite'
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE results (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                 "size INTEGER NOT NULL, atime REAL NOT NULL)")
+    conn.execute("INSERT INTO results VALUES ('legacy', 'value', 5, 0)")
+    conn.commit()
+    conn.close()
+    cache = SQLiteResultCache(path, max_bytes=5)
+    assert cache.get('legacy') == 'value'
+    cache.put('current', 'fresh')
+    assert cache.evict() == 1
+    assert cache.get('legacy') is None
+    assert cache.get('current') == 'fresh'
+
+
+def test_sqlite_cache_evicts_by_size(tmp_path, monkeypatch):
+    """
+    При превышении объема вытесняются давно не использованные записи.
+    """
+    monkeypatch.setattr(etpgrf_settings.cache, 'SQLITE_EVICT_EVERY', 1)
+    cache = SQLiteResultCache(tmp_path / 'etpgrf.sqlite', max_bytes=250)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key * 100)
+    stats = cache.stats()
+    assert stats['bytes'] <= 250
+    assert stats['evictions'] == 1
+    assert cache.get('a') is None
+    assert cache.get('c') == 'c' * 100
+
+
+def test_sqlite_cache_shared_between_processes(tmp_path):
+    """
+    Кэш, переданный в пул процессов, пишет в общую базу: результаты видны родительскому процессу.
+    """
+    cache = SQLiteResultCache(tmp_path / 'etpgrf.sqlite')
+    typo = Typographer(langs='ru', cache=cache)
+    texts = [f'Текст номер {i} в доме' for i in range(10)]
+    expected = list(typo.process_many(texts, workers=2, chunksize=2))
+    assert cache.stats()['entries'] == len(texts)
+    assert [typo.process(text) for text in texts] == expected
+    assert cache.stats()['hits'] == len(texts)
@@ -660,4 +660,24 @@ def test_html_mnemo_to_utf_back(mnemonic_string, unicode_string):
     # Act (действие) - тестируем
     actual_output = codec.decode_to_unicode(unicode_string)
     # Assert (проверка)
-    assert actual_output == mnemonic_string
\ No newline at end of file
+    assert actual_output == mnemonic_string
+
+def test_encode_skips_text_without_encodable_chars():
+    """Если в наборе символов нет кодируемых, текст возвращается как есть (без прохода по нему)."""
+    text = "Hello world"
+    for mode in ('mnemonic', 'mixed'):
+        assert codec.encode_from_unicode(text, mode, set(text)) is text
+    text = "a\u00A0b"
+    assert codec.encode_from_unicode(text, 'mixed', set(text)) == codec.encode_from_unicode(text, 'mixed')
+
+
+@pytest.mark.parametrize("mode, text, expected", [
+    # В режимах 'mnemonic' и 'mixed' спецсимволы HTML уже заменены кодеком: текст выводится как есть
+    ('mnemonic', 'a &amp; b&nbsp;&lt;c&gt;', 'a &amp; b&nbsp;&lt;c&gt;'),
+    ('mixed', 'a &amp; b\u00A0&lt;c&gt;', 'a &amp; b\u00A0&lt;c&gt;'),
+    # В режиме 'unicode' их нужно экранировать
+    ('unicode', 'a & b\u00A0<c>', 'a &amp; b\u00A0&lt;c&gt;'),
+    ('unicode', 'Без спецсимволов', 'Без спецсимволов'),
+])
+def test_escape_html_text(mode, text, expected):
+    assert codec.escape_html_text(text, mode) == expected
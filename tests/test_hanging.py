@@ -112,3 +112,12 @@ def test_hanging_punctuation_target_tags():
     processor.process(soup)
     
     assert str(soup) == expected_html
+
+
+def test_hanging_punctuation_nested_target_tags():
+    """Текст во вложенных целевых тегах обрабатывается один раз (span не оборачивается повторно)."""
+    processor = HangingPunctuationProcessor(mode=['blockquote', 'p'])
+    soup = make_soup(f'<blockquote><p>{CHAR_RU_QUOT1_OPEN}Цитата.</p></blockquote><!-- (комментарий) -->')
+    processor.process(soup)
+    assert str(soup) == (f'<blockquote><p><span class="etp-laquo">{CHAR_RU_QUOT1_OPEN}</span>Цитата'
+                         f'<span class="etp-r-dot">.</span></p></blockquote><!-- (комментарий) -->')
@@ -0,0 +1,113 @@
+# tests/test_htmlstream.py
+# Тестирует потоковый бэкенд HTML (html_backend='stream').
+
+import io
+import pytest
+from etpgrf import Typographer
+from etpgrf.htmlstream import iter_process_html
+
+# Документы, которые бэкенд BeautifulSoup не нормализует (все теги закрыты, нет текста между блоками), поэтому
+# результаты двух бэкендов должны совпадать посимвольно.
+PARITY_DOCUMENTS = [
+    '<p>Он сказал: "Привет, мир" и ушел.</p><p>Это <b>"жирная" цитата</b> в тексте - да.</p>',
+    '<div><pre>"не трогать" - 1</pre><p>В 1990-х гг. было 5 кг.</p><!-- "комментарий" --></div>',
+    '<ul><li>«Пункт» один</li><li>(Пункт) два</li></ul>',
+    '<p>A &lt;b&gt; x &amp; y &nbsp; z</p><script>if (a<b && "x") {}</script>',
+    '<p>Текст <a href="/x?a=1&amp;b=2">ссылки "в кавычках"</a> и А.С. Пушкин. R&amp;D &amp;nbsp;</p>',
+]
+
+
+@pytest.mark.parametrize("hanging_punctuation", [None, 'both', ['p', 'li']])
+@pytest.mark.parametrize("document", PARITY_DOCUMENTS)
+def test_stream_backend_matches_soup(document, hanging_punctuation):
+    """
+    Потоковый бэкенд дает тот же результат, что и бэкенд BeautifulSoup.
+    """
+    soup_typo = Typographer(langs='ru', process_html=True, hanging_punctuation=hanging_punctuation)
+    stream_typo = Typographer(langs='ru', process_html=True, hanging_punctuation=hanging_punctuation,
+                              html_backend='stream')
+    assert stream_typo.process(document) == soup_typo.process(document)
+
+
+@pytest.mark.parametrize("document", [
+    # Разметка выводится как есть: регистр тегов, атрибуты, пробелы внутри тегов, незакрытые теги
+    '<P CLASS=x>текст</P >',
+    '<!DOCTYPE html><p>текст<br>текст<img src="a.png"/></p>',
+    '<p>незакрытый <b>тег</p>',
+    '<a href="/x?a=1&amp;b=2" title=\'"x"\'>ссылка</a>',
+    # Защищенные теги и комментарии не обрабатываются
+    '<code>"a" - b...</code>',
+    # Мнемоники внутри защищенных тегов -- в исходном виде (с ";" и без)
+    '<code>a&nbsp;b &copy; &#160; &#xA0; &lt;b&gt; R&D &copy 2020</code>',
+    '<pre><code>if (a &lt; b &amp;&amp; c) {}</code></pre>',
+    '<!-- "a" - b... -->',
+    '<style>p > b { content: "--"; }</style>',
+])
+def test_stream_backend_passes_markup_through(document):
+    """
+    Все, кроме обрабатываемого текста, выводится без изменений.
+    """
+    typo = Typographer(langs='ru', mode='unicode', process_html=True, html_backend='stream',
+                       hyphenation=False)
+    assert typo.process(document) == document
+
+
+def test_stream_backend_context_within_block():
+    """
+    Правила с контекстом видят текст соседних строчных элементов внутри блока.
+    """
+    typo = Typographer(langs='ru', mode='unicode', process_html=True, html_backend='stream')
+    assert typo.process('<p>"Цитата <b>внутри</b> абзаца"</p>') == '<p>«Цитата <b>внутри</b> абзаца»</p>'
+    assert typo.process('<p>Дом в <i>лесу</i></p>') == '<p>Дом в\u00a0<i>лесу</i></p>'
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 10_000])
+def test_stream_backend_process_stream(chunk_size):
+    """
+    Потоковая обработка HTML по частям совпадает с обработкой документа целиком.
+    """
+    document = ''.join(PARITY_DOCUMENTS * 3)
+    typo = Typographer(langs='ru', process_html=True, hanging_punctuation='both', html_backend='stream')
+    expected = typo.process(document)
+    writer = io.StringIO()
+    written = typo.process_stream(io.StringIO(document), writer, chunk_size=chunk_size)
+    assert writer.getvalue() == expected
+    assert written == len(expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_stream_backend_charrefs_split_between_chunks(chunk_size):
+    """
+    Мнемоника, разрезанная границей фрагмента, выводится в исходном виде в защищенном теге и декодируется в тексте.
+    """
+    document = '<p>Дом в&nbsp;лесу &copy; 2020</p><code>a&nbsp;b &#8212; c</code>'
+    typo = Typographer(langs='ru', mode='unicode', process_html=True, html_backend='stream', hyphenation=False)
+    result = ''.join(iter_process_html(typo, document, read_size=chunk_size))
+    assert result == typo.process(document)
+    assert result.startswith('<p>Дом в\u00a0лесу ©')
+    assert result.endswith('<code>a&nbsp;b &#8212; c</code>')
+
+
+def test_stream_backend_yields_blocks_incrementally():
+    """
+    Результат отдается по мере завершения блоков, а не одним куском в конце.
+    """
+    typo = Typographer(langs='ru', process_html=True, html_backend='stream')
+    pieces = [f'<p>Абзац номер {i} - текст.</p>' for i in range(5)]
+    chunks = list(iter_process_html(typo, iter(pieces)))
+    assert len(chunks) == len(pieces)
+    assert ''.join(chunks) == typo.process(''.join(pieces))
+
+
+def test_stream_backend_rejects_sanitizer():
+    """
+    Санитайзеру нужно дерево документа: с потоковым бэкендом он не поддерживается.
+    """
+    with pytest.raises(ValueError):
+        Typographer(langs='ru', process_html=True, html_backend='stream', sanitizer='etp')
+
+
+def test_invalid_html_backend():
+    with pytest.raises(ValueError):
+        Typographer(langs='ru', process_html=True, html_backend='dom')
+
@@ -0,0 +1,116 @@
+# tests/test_hyphdict.py
+# Тестирует словарь переносов: построение файла, поиск через mmap и использование в Hyphenator.
+
+import pickle
+import pytest
+from etpgrf import Hyphenator, Typographer
+from etpgrf.hyphdict import HyphenationDictionary, build_dictionary, iter_words, main
+from benchmarks import corpora
+
+WORDS = corpora.word_list(corpora.prose('mixed', 20))
+
+
+@pytest.fixture
+def dictionary_path(tmp_path):
+    path = tmp_path / 'words.hyph'
+    build_dictionary(Hyphenator(langs='ru+en'), WORDS, path)
+    return path
+
+
+def test_dictionary_matches_rules(dictionary_path):
+    rules = Hyphenator(langs='ru+en')
+    with HyphenationDictionary(dictionary_path) as dictionary:
+        long_words = {word for word in WORDS if len(word) > rules.max_unhyphenated_len}
+        assert len(dictionary) == len(long_words) > 0
+        hyphenator = Hyphenator(langs='ru+en', dictionary=dictionary)
+        for word in WORDS:
+            assert hyphenator.hyp_in_word(word) == rules.hyp_in_word(word)
+        assert dictionary.lookup('несуществующееслово') is None
+        assert dictionary.lookup('дом') is None
+
+
+def test_dictionary_lookup_skips_rules(dictionary_path, monkeypatch):
+    """
+    Слова из словаря не проходят через правила, остальные -- проходят.
+    """
+    hyphenator = Hyphenator(langs='ru+en', dictionary=str(dictionary_path), cache_size=100)
+    expected = Hyphenator(langs='ru+en').hyp_in_word('электрофоретический')
+    calls = []
+    original = hyphenator._break_points
+    monkeypatch.setattr(hyphenator, '_break_points', lambda word: calls.append(word) or original(word))
+    assert hyphenator.hyp_in_word('электрофоретический') == expected
+    assert hyphenator.hyp_in_word('Суперэлектрофоретический') != 'Суперэлектрофоретический'
+    assert calls == ['Суперэлектрофоретический']
+    assert len(hyphenator.cache) == 2
+
+
+def test_dictionary_in_typographer_and_pickle(dictionary_path):
+    text = ' '.join(WORDS[:300])
+    typo = Typographer(langs='ru+en', hyphenation=Hyphenator(langs='ru+en', dictionary=dictionary_path))
+    assert typo.process(text) == Typographer(langs='ru+en').process(text)
+    copy = pickle.loads(pickle.dumps(typo))
+    assert copy.hyphenation.dictionary is not typo.hyphenation.dictionary
+    assert copy.process(text) == typo.process(text)
+
+
+def test_dictionary_is_deterministic(tmp_path, dictionary_path):
+    other = tmp_path / 'other.hyph'
+    build_dictionary(Hyphenator(langs='en+ru'), reversed(WORDS), other)
+    assert other.read_bytes() == dictionary_path.read_bytes()
+    empty = tmp_path / 'empty.hyph'
+    assert build_dictionary(Hyphenator(langs='ru'), [], empty) == 0
+    assert HyphenationDictionary(empty).lookup('электрофоретический') is None
+
+
+def test_dictionary_errors(tmp_path, dictionary_path):
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru+en', max_unhyphenated_len=8, dictionary=dictionary_path)
+    for content in (b'', b'not a dictionary at all'):
+        bad = tmp_path / 'bad.hyph'
+        bad.write_bytes(content)
+        with pytest.raises(ValueError):
+            HyphenationDictionary(bad)
+    with pytest.raises(ValueError):
+        build_dictionary(Hyphenator(langs='ru'), WORDS, tmp_path / 'x.hyph', max_word_len=1000)
+
+
+def test_cli(tmp_path, capsys):
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('\n'.join(corpora.prose('ru', 5)), encoding='utf-8')
+    output = tmp_path / 'ru.hyph'
+    assert main([str(output), str(corpus), '--langs', 'ru', '--min-count', '2']) == 0
+    assert 'Слов в словаре' in capsys.readouterr().out
+    with HyphenationDictionary(output) as dictionary:
+        assert dictionary.config['langs'] == ['ru']
+        assert 0 < len(dictionary) < len(set(iter_words([corpus.read_text(encoding='utf-8')])))
+    halving = tmp_path / 'halving.hyph'
+    assert main([str(halving), str(corpus), '--langs', 'ru', '--breakpoints', 'halving']) == 0
+    Hyphenator(langs='ru', breakpoints='halving', dictionary=halving)
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru', dictionary=halving)      # Построен для другого способа выбора точек переноса
+    with pytest.raises(SystemExit):
+        main([str(halving), str(corpus), '--patterns', 'ru'])
+
+
+def test_cli_patterns_engine(tmp_path):
+    """
+    Словарь, построенный по шаблонам, проверяется по содержимому файла шаблонов, а не по пути.
+    """
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('\n'.join(corpora.prose('ru', 5)), encoding='utf-8')
+    patterns = tmp_path / 'hyph-ru.pat.txt'
+    patterns.write_text('\n'.join(f'{v}1{c}' for v in 'аеиоуыэюя' for c in 'бвгдклмнпрстфхц'), encoding='utf-8')
+    output = tmp_path / 'ru.hyph'
+    assert main([str(output), str(corpus), '--langs', 'ru', '--engine', 'patterns',
+                 '--patterns', f'ru={patterns}']) == 0
+    with HyphenationDictionary(output) as dictionary:
+        assert dictionary.config['engine'] == 'patterns'
+    Hyphenator(langs='ru', engine='patterns', patterns={'ru': patterns}, dictionary=output)
+    moved = tmp_path / 'moved.pat.txt'
+    moved.write_bytes(patterns.read_bytes())
+    Hyphenator(langs='ru', engine='patterns', patterns={'ru': moved}, dictionary=output)
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru', dictionary=output)       # Построен для другого способа расстановки переносов
+    patterns.write_text(patterns.read_text(encoding='utf-8') + '\nо1л', encoding='utf-8')
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru', engine='patterns', patterns={'ru': patterns}, dictionary=output)
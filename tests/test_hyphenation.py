@@ -1,4 +1,5 @@
 # tests/test_hyphenation.py
+import pickle
 import pytest
 from etpgrf import Hyphenator
 from etpgrf.config import CHAR_SHY
@@ -36,10 +37,10 @@ RUSSIAN_HYPHENATION_CASES = [
 @pytest.mark.parametrize("input_word, expected_output", RUSSIAN_HYPHENATION_CASES)
 def test_russian_word_hyphenation(input_word, expected_output):
     """
-    Проверяет ПОВЕДЕНИЕ: правильная расстановка переносов в отдельных русских словах.
+    Проверяет ПОВЕДЕНИЕ: правильная расстановка переносов в отдельных русских словах (половинным делением).
     """
     # Arrange (подготовка)
-    hyphenator_ru = Hyphenator(langs='ru', max_unhyphenated_len=5, min_tail_len=3)
+    hyphenator_ru = Hyphenator(langs='ru', max_unhyphenated_len=5, min_tail_len=3, breakpoints='halving')
     # Act (действие) - тестируем самый "атомарный" метод
     actual_output = hyphenator_ru.hyp_in_word(input_word)
     # Assert (проверка)
@@ -65,12 +66,211 @@ ENGLISH_HYPHENATION_CASES = [
 @pytest.mark.parametrize("input_word, expected_output", ENGLISH_HYPHENATION_CASES)
 def test_english_word_hyphenation(input_word, expected_output):
     """
-    Проверяет ПОВЕДЕНИЕ: правильная расстановка переносов в отдельных английских словах.
+    Проверяет ПОВЕДЕНИЕ: правильная расстановка переносов в отдельных английских словах (половинным делением).
     """
     # Arrange (подготовка)
-    hyphenator_en = Hyphenator(langs='en', max_unhyphenated_len=5, min_tail_len=3)
+    hyphenator_en = Hyphenator(langs='en', max_unhyphenated_len=5, min_tail_len=3, breakpoints='halving')
     # Act (действие) - тестируем самый "атомарный" метод
     actual_output = hyphenator_en.hyp_in_word(input_word)
     # Assert (проверка)
     assert actual_output == expected_output
 
+
+
+def test_hyp_in_text_with_chars():
+    """
+    С переданным набором символов переносы расставляются так же; текст без длинных слов с гласными
+    не сканируется вовсе, а символ переноса попадает в набор.
+    """
+    hyphenator = Hyphenator(langs='ru', max_unhyphenated_len=5, min_tail_len=3)
+    text = "Электрофоретический анализ"
+    chars = set(text)
+    assert hyphenator.hyp_in_text(text, chars) == hyphenator.hyp_in_text(text)
+    assert CHAR_SHY in chars
+    assert not hyphenator.may_apply(set("ВЛКСМ"), 5)
+    assert not hyphenator.may_apply(set("дом"), 3)
+
+
+@pytest.mark.parametrize("word_segment, split_index, unbreakable_set, expected", [
+    ("teacher", 4, frozenset(["CH", "TCH"]), True),        # tea|cher: разрыв внутри "CH"
+    ("teacher", 3, frozenset(["CH", "TCH"]), False),       # tea|cher: граница сегмента -- можно
+    ("Watch", 4, ["ch", "tch"], True),                      # список и нижний регистр
+    ("eighteen", 2, {"EIGH"}, True),
+    ("eighteen", 4, {"EIGH"}, False),
+    ("eighteen", 0, {"EIGH"}, False),                       # позиция вне сегмента
+    ("eighteen", 3, {"E", ""}, False),                      # сегменты короче 2 символов не учитываются
+    ("x" * 10_000 + "th" + "x" * 10_000, 10_001, frozenset(["TH"]), True),
+])
+def test_is_inside_unbreakable_segment(word_segment, split_index, unbreakable_set, expected):
+    from etpgrf.comutil import is_inside_unbreakable_segment
+    assert is_inside_unbreakable_segment(word_segment, split_index, unbreakable_set) is expected
+
+
+@pytest.mark.parametrize("langs, words", [
+    ('ru', [word for word, _ in RUSSIAN_HYPHENATION_CASES]),
+    ('en', [word for word, _ in ENGLISH_HYPHENATION_CASES]),
+])
+def test_hyp_in_word_cache(langs, words):
+    """
+    С кэшем переносы те же, повторные слова берутся из кэша, регистр букв сохраняется.
+    """
+    plain = Hyphenator(langs=langs, max_unhyphenated_len=5, min_tail_len=3)
+    cached = Hyphenator(langs=langs, max_unhyphenated_len=5, min_tail_len=3, cache_size=1000)
+    variants = words + [word.upper() for word in words] + [word.capitalize() for word in words]
+    for _ in range(2):
+        for word in variants:
+            assert cached.hyp_in_word(word) == plain.hyp_in_word(word)
+    stats = cached.cache.stats()
+    long_words = [word for word in variants if 5 < len(word) <= cached.cache.max_word_len]
+    assert stats['misses'] == len(set(long_words))
+    assert stats['hits'] == 2 * len(long_words) - len(set(long_words))
+    assert 0 < stats['hit_rate'] < 1
+
+
+def test_hyphenation_cache_limits():
+    hyphenator = Hyphenator(langs='ru', max_unhyphenated_len=5, min_tail_len=3, cache_size=2)
+    for word in ("электрофоретический", "достопримечательность", "высокопревосходительство"):
+        hyphenator.hyp_in_word(word)
+    assert len(hyphenator.cache) == 2
+    assert hyphenator.cache.stats()['evictions'] == 1
+    hyphenator.hyp_in_word("дом")                   # Короткие слова в кэш не попадают
+    hyphenator.hyp_in_word("электро" * 20)          # Слишком длинные тоже
+    assert len(hyphenator.cache) == 2
+    hyphenator.cache.clear()
+    assert len(hyphenator.cache) == 0
+    assert hyphenator.cache.stats()['misses'] == 3
+
+    copy = pickle.loads(pickle.dumps(hyphenator))
+    assert len(copy.cache) == 0 and copy.cache.max_entries == 2
+    assert Hyphenator(langs='ru').cache is None
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru', cache_size=-1)
+
+
+@pytest.mark.parametrize("word, hyphenated", [
+    ("слово", "слово"),
+    ("элек-тро-фо-ре-ти-чес-кий".replace('-', CHAR_SHY), None),
+    (f"уже{CHAR_SHY}есть", f"уже{CHAR_SHY}{CHAR_SHY}есть"),
+])
+def test_break_mask_roundtrip(word, hyphenated):
+    from etpgrf.hyphenation import _break_mask, _apply_break_mask
+    if hyphenated is None:
+        hyphenated, word = word, word.replace(CHAR_SHY, '')
+    assert _apply_break_mask(word, _break_mask(word, hyphenated)) == hyphenated
+
+
+@pytest.mark.parametrize("langs, word, expected", [
+    ('ru', "Подъезд", "cvcsvcc"),
+    ('ru', "ЧАЙКА", "cvjcv"),
+    ('ru', "мать-и-мачеха", "cvcs-v-cvcvcv"),
+    ('ruold', "вѣра", "cvcv"),
+    ('ru', "word", "WORD"),                     # буквы другого языка не классифицируются
+    ('en', "Straße", "cccv?v"),                 # "ß".upper() == "SS"
+    ('ru+en', "Yes-да", "cvc-cv"),
+])
+def test_char_classes(langs, word, expected):
+    """
+    Классы символов: 'v' -- гласная, 'c' -- согласная, 'j' -- Й, 's' -- Ь/Ъ, прочие символы -- другие (по одному
+    на каждый символ слова, даже если верхний регистр символа длиннее).
+    """
+    classes = Hyphenator(langs=langs)._char_classes(word)
+    assert len(classes) == len(word)
+    assert classes == expected
+
+
+def _shy_positions(hyphenated: str) -> list[int]:
+    # Индексы символов исходного текста, перед которыми вставлен символ переноса
+    return [i - n for n, i in enumerate(i for i, char in enumerate(hyphenated) if char == CHAR_SHY)]
+
+
+@pytest.mark.parametrize("cache_size", [0, 100])
+@pytest.mark.parametrize("langs, words", [
+    ('ru', [word for word, _ in RUSSIAN_HYPHENATION_CASES]),
+    ('en', [word for word, _ in ENGLISH_HYPHENATION_CASES]),
+])
+def test_hyphenation_points(langs, words, cache_size):
+    """
+    Позиции переносов совпадают с местами, куда `hyp_in_word` и `hyp_in_text` вставляют символ переноса.
+    """
+    hyphenator = Hyphenator(langs=langs, max_unhyphenated_len=5, min_tail_len=3, cache_size=cache_size)
+    for word in words + [word.upper() for word in words]:
+        points = hyphenator.hyphenation_points_word(word)
+        assert points.typecode == 'I'
+        assert list(points) == _shy_positions(hyphenator.hyp_in_word(word))
+
+    text = f"«{'», — «'.join(words)}»: 12345 дом"
+    points = hyphenator.hyphenation_points(text)
+    assert points.typecode == 'I'
+    assert list(points) == _shy_positions(hyphenator.hyp_in_text(text))
+    assert len(Hyphenator(langs=langs).hyphenation_points("Короткие слова, short words")) == 0
+
+
+@pytest.mark.parametrize("langs, word, expected", [
+    ('ru', "автомобиль", f"авто{CHAR_SHY}мобиль"),                           # точки в пределах 5 символов нет
+    ('ru', "многообразие", f"много{CHAR_SHY}обра{CHAR_SHY}зие"),
+    ('ru', "информационный", f"инфо{CHAR_SHY}рмаци{CHAR_SHY}онный"),        # на один перенос меньше
+    ('ru', "фотоаппаратура", f"фотоа{CHAR_SHY}ппара{CHAR_SHY}тура"),        # все части не длиннее 5 символов
+    ('en', "thoughtful", f"though{CHAR_SHY}tful"),
+    ('en', "misunderstanding", f"misun{CHAR_SHY}der{CHAR_SHY}stan{CHAR_SHY}ding"),
+    ('en', "unbreakable", f"unb{CHAR_SHY}reak{CHAR_SHY}able"),               # перенос перед суффиксом слова
+])
+def test_optimal_breakpoints(langs, word, expected):
+    """
+    Точки переноса выбираются сразу для всего слова (по умолчанию): меньше всего символов сверх
+    `max_unhyphenated_len`, потом меньше всего переносов, потом лучшие по оценке точки.
+    """
+    hyphenator = Hyphenator(langs=langs, max_unhyphenated_len=5, min_tail_len=3)
+    assert hyphenator.breakpoints == 'optimal'
+    assert hyphenator.hyp_in_word(word) == expected
+
+
+def _breaks_cost(length, points, scores, max_len, min_part):
+    # Стоимость набора переносов в порядке важности (см. `Hyphenator._optimal_break_points`)
+    bounds = [0, *points, length]
+    parts = [end - start for start, end in zip(bounds, bounds[1:])]
+    if min(parts) < min_part:
+        return None
+    return (sum(max(0, part - max_len) for part in parts), len(points), -sum(scores[point] for point in points),
+            sum(part * part for part in parts if part <= max_len))
+
+
+@pytest.mark.parametrize("max_len, min_part", [(5, 3), (6, 2), (8, 3), (12, 5)])
+def test_optimal_breakpoints_are_optimal(max_len, min_part):
+    """
+    Выбранный набор переносов не хуже любого другого набора допустимых точек (полный перебор) и половинного деления.
+    """
+    import itertools
+    import random
+    rng = random.Random(max_len * 100 + min_part)
+    hyphenator = Hyphenator(langs='ru', max_unhyphenated_len=max_len, min_tail_len=min_part)
+    halving = Hyphenator(langs='ru', max_unhyphenated_len=max_len, min_tail_len=min_part, breakpoints='halving')
+    words = [word for word, _ in RUSSIAN_HYPHENATION_CASES]
+    words += [''.join(rng.choice("абвгдеёжзийклмнопрстуфхцчшщъыьэюя") for _ in range(rng.randint(max_len + 1, 24)))
+              for _ in range(200)]
+    for word in words:
+        scores = hyphenator._ru_split_scores(word, hyphenator._char_classes(word))
+        candidates = [i for i in range(min_part, len(word) - min_part + 1) if scores[i]]
+        if len(word) <= max_len or len(candidates) > 12:
+            continue
+        best = min(cost for count in range(len(candidates) + 1)
+                   for points in itertools.combinations(candidates, count)
+                   if (cost := _breaks_cost(len(word), points, scores, max_len, min_part)) is not None)
+        cost = _breaks_cost(len(word), hyphenator._optimal_break_points(len(word), scores), scores, max_len, min_part)
+        assert cost == best
+        assert cost <= _breaks_cost(len(word), halving._ru_break_points(word), scores, max_len, min_part)
+
+
+def test_breakpoints_config():
+    hyphenator = Hyphenator(langs='ru', breakpoints='halving')
+    assert hyphenator.get_config()['breakpoints'] == 'halving'
+    assert Hyphenator(**hyphenator.get_config()).breakpoints == 'halving'
+    with pytest.raises(ValueError):
+        Hyphenator(langs='ru', breakpoints='greedy')
+
+
+def test_unbreakable_split_positions():
+    from etpgrf.comutil import is_inside_unbreakable_segment, unbreakable_split_positions
+    units = frozenset(["SH", "CH", "TH", "TCH", "EIGH", "OUGH"])
+    for word in ("watchthrough", "Eighteenth", "fish", "Straße", "", "x" * 50 + "tch"):
+        assert list(unbreakable_split_positions(word, units)) == [
+            int(is_inside_unbreakable_segment(word, i, units)) for i in range(len(word))]
@@ -0,0 +1,169 @@
+# tests/test_hyphpatterns.py
+# Тестирует переносы по шаблонам Кнута -- Ляна: разбор файлов шаблонов, префиксное дерево и Hyphenator(engine='patterns').
+
+import pickle
+import pytest
+from etpgrf import Hyphenator, Typographer
+from etpgrf.config import CHAR_SHY
+from etpgrf.hyphpatterns import PatternTrie, parse_pattern_file, load_patterns
+
+# Шаблоны из приложения H книги "The TeXbook" (слово "hyphenation")
+EN_PATTERNS = """% Шаблоны для теста
+\\patterns{ % комментарий
+hy3ph he2n hena4 hen5at 1na n2at 1tio 2io o2n
+.ta4 1b 1c 1d 1g 1l 1m 1n 1p 1r 1s 1t 1v
+}
+\\hyphenation{ta-ble pro-ject}
+"""
+# Упрощенные русские шаблоны: перенос перед согласной между гласными и между двумя согласными
+RU_PATTERNS = ' '.join([f'{v}1{c}' for v in 'аеиоуыэюя' for c in 'бвгдклмнпрстфхцчшщ']
+                       + [f'{a}1{b}' for a in 'нрст' for b in 'кнстр'])
+
+
+@pytest.fixture
+def pattern_files(tmp_path):
+    en = tmp_path / 'hyph-en.tex'
+    en.write_text(EN_PATTERNS, encoding='utf-8')
+    ru = tmp_path / 'hyph-ru.pat.txt'
+    ru.write_text(RU_PATTERNS.replace(' ', '\n'), encoding='utf-8')
+    return {'en': str(en), 'ru': str(ru)}
+
+
+def test_parse_pattern_file():
+    patterns, exceptions = parse_pattern_file(EN_PATTERNS)
+    assert patterns[:3] == ['hy3ph', 'he2n', 'hena4']
+    assert exceptions == ['ta-ble', 'pro-ject']
+    assert parse_pattern_file('a1b\n.c2d % comment\n') == (['a1b', '.c2d'], [])
+    with pytest.raises(ValueError):
+        parse_pattern_file('\\patterns{ a1b')
+
+
+@pytest.mark.parametrize("word, expected", [
+    ('hyphenation', [2, 6]),            # hy-phen-ation
+    ('Hyphenation', [2, 6]),            # Регистр не важен
+    ('table', [2]),                      # Исключение: ta-ble
+    ('PROJECT', [3]),
+    ('xyz', []),
+])
+def test_trie_break_points(word, expected):
+    patterns, exceptions = parse_pattern_file(EN_PATTERNS)
+    trie = PatternTrie(patterns, exceptions)
+    assert trie.break_points(word) == expected
+
+
+def test_trie_matches_naive_algorithm():
+    """
+    Дерево на массивах дает те же точки, что и прямой перебор шаблонов.
+    """
+    patterns = RU_PATTERNS.split() + ['.ро4', 'ер3к', '2ст', 'нн5о']
+    trie = PatternTrie(patterns)
+    parsed = []
+    for pattern in patterns:
+        letters = ''.join(c for c in pattern if not c.isdigit())
+        digits = [0] * (len(letters) + 1)
+        position = 0
+        for char in pattern:
+            if char.isdigit():
+                digits[position] = int(char)
+            else:
+                position += 1
+        parsed.append((letters, digits))
+    for word in ('электрофоретический', 'сосредоточенность', 'роспись', 'переосмысление', 'ванна'):
+        text = f'.{word}.'
+        points = [0] * (len(text) + 1)
+        for letters, digits in parsed:
+            start = text.find(letters)
+            while start >= 0:
+                for k, value in enumerate(digits):
+                    points[start + k] = max(points[start + k], value)
+                start = text.find(letters, start + 1)
+        assert trie.break_points(word) == [p for p in range(1, len(word)) if points[p + 1] % 2]
+
+
+def test_hyphenator_patterns_engine(pattern_files):
+    hyphenator = Hyphenator(langs='en', engine='patterns', patterns=pattern_files, max_unhyphenated_len=5,
+                            min_tail_len=2)
+    assert hyphenator.hyp_in_word('hyphenation') == f'hy{CHAR_SHY}phen{CHAR_SHY}ation'
+    assert hyphenator.hyp_in_word('Hyphenation') == f'Hy{CHAR_SHY}phen{CHAR_SHY}ation'
+    assert hyphenator.hyp_in_word('table') == 'table'       # Короткие слова не переносятся
+    # min_tail_len: "hy" короче трех символов, остается перенос "hyphen-ation"
+    hyphenator = Hyphenator(langs='en', engine='patterns', patterns=pattern_files, max_unhyphenated_len=5,
+                            min_tail_len=3)
+    assert hyphenator.hyp_in_word('hyphenation') == f'hyphen{CHAR_SHY}ation'
+
+
+@pytest.mark.parametrize("max_len, min_tail", [(6, 2), (8, 3), (12, 5)])
+def test_patterns_respect_limits(pattern_files, max_len, min_tail):
+    """
+    Переносы ставятся только в допустимых точках, части не короче `min_tail_len`, а часть длиннее
+    `max_unhyphenated_len` остается, только если в ней нет подходящей точки.
+    """
+    hyphenator = Hyphenator(langs='ru', engine='patterns', patterns=pattern_files, max_unhyphenated_len=max_len,
+                            min_tail_len=min_tail)
+    trie = load_patterns(pattern_files['ru'])
+    for word in ('электрофоретический', 'высокопревосходительство', 'достопримечательность', 'интернационализация'):
+        points = set(trie.break_points(word))
+        parts = hyphenator.hyp_in_word(word).split(CHAR_SHY)
+        assert ''.join(parts) == word
+        start = 0
+        for part in parts:
+            end = start + len(part)
+            if start:
+                assert start in points
+            if len(parts) > 1:
+                assert len(part) >= min_tail
+            if len(part) > max_len:
+                assert not [p for p in points if start + min_tail <= p <= end - min_tail]
+            start = end
+
+
+def test_patterns_fallback_and_typographer(pattern_files):
+    """
+    Слова языка без шаблонов переносятся по правилам; шаблоны работают через Typographer и pickle.
+    """
+    only_en = {'en': pattern_files['en']}
+    hyphenator = Hyphenator(langs='ru+en', engine='patterns', patterns=only_en)
+    rules = Hyphenator(langs='ru+en')
+    assert hyphenator.hyp_in_word('электрофоретический') == rules.hyp_in_word('электрофоретический')
+    typo = Typographer(langs='ru+en', hyphenation=Hyphenator(langs='ru+en', engine='patterns',
+                                                             patterns=pattern_files))
+    text = 'Электрофоретический эффект и internationalization.'
+    result = typo.process(text)
+    assert pickle.loads(pickle.dumps(typo)).process(text) == result
+    assert Typographer.from_config(typo.get_config()).process(text) == result
+    assert load_patterns(pattern_files['ru']) is load_patterns(pattern_files['ru'])
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'engine': 'tex'},
+    {'engine': 'patterns'},
+    {'engine': 'patterns', 'patterns': {'de': 'hyph-de.tex'}},
+    {'engine': 'patterns', 'patterns': {'ru': '/nonexistent/hyph-ru.tex'}},
+])
+def test_patterns_errors(kwargs):
+    with pytest.raises((ValueError, FileNotFoundError)):
+        Hyphenator(langs='ru', **kwargs)
+
+
+def test_patterns_config_tracks_file_content(pattern_files, tmp_path, monkeypatch, caplog):
+    """
+    Конфигурация содержит абсолютный путь и хэш содержимого файла шаблонов: правка файла по тому же пути меняет
+    отпечаток типографа (ключ кэша результатов).
+    """
+    from etpgrf.cache import config_fingerprint
+    monkeypatch.chdir(tmp_path)
+    kwargs = {'langs': 'ru', 'engine': 'patterns', 'patterns': {'ru': 'hyph-ru.pat.txt'}}
+    config = Hyphenator(**kwargs).get_config()
+    assert config['patterns'] == {'ru': pattern_files['ru']}
+    assert set(config['patterns_digest']) == {'ru'}
+    fingerprint = config_fingerprint(Typographer(langs='ru', hyphenation=Hyphenator(**kwargs)).get_config())
+
+    with open(pattern_files['ru'], 'a', encoding='utf-8') as file:
+        file.write('\nо1л')
+    changed = Hyphenator(**kwargs)
+    assert changed.get_config()['patterns_digest'] != config['patterns_digest']
+    assert config_fingerprint(Typographer(langs='ru', hyphenation=changed).get_config()) != fingerprint
+    # Восстановление по сохраненной конфигурации с измененными файлами -- с предупреждением
+    with caplog.at_level('WARNING', logger='etpgrf.hyphenation'):
+        Hyphenator(**config)
+    assert 'файлы шаблонов переносов изменились' in caplog.text
@@ -0,0 +1,87 @@
+# tests/test_import_time.py
+# Тестирует время холодного старта: что импортируется при `import etpgrf` и сколько это стоит
+# (по данным `python -X importtime` в отдельном процессе).
+
+import os
+import subprocess
+import sys
+import pytest
+
+# Бюджет времени импорта (микросекунды, суммарно по импортам верхнего уровня, начиная с etpgrf). Время зависит
+# от машины и ее загрузки, поэтому проверка бюджета включается явно: `ETPGRF_IMPORT_TIME_BUDGET=1 pytest ...`.
+# От возврата "тяжелых" импортов всегда защищают проверки состава модулей ниже. До ленивых импортов оба сценария
+# занимали ~190 мс, после -- ~35 и ~80 мс.
+IMPORT_TIME_BUDGET_US = {
+    'import etpgrf': 100_000,
+    'from etpgrf import Typographer; Typographer()': 160_000,
+}
+
+# Модули, которые не нужны, пока не используются обработка HTML, кэш на диске, пакетная и асинхронная обработка
+HEAVY_MODULES = ('bs4', 'lxml', 'asyncio', 'multiprocessing', 'concurrent.futures.process', 'sqlite3')
+# Модули etpgrf, которые не нужны типографу с настройками по умолчанию
+OPTIONAL_MODULES = ('etpgrf.cache', 'etpgrf.sanitizer', 'etpgrf.hanging', 'hashlib')
+
+
+def _run(code: str) -> tuple[set[str], int]:
+    """
+    Выполняет код в новом интерпретаторе с `-X importtime`.
+
+    :return: Импортированные модули и суммарное время импортов, начиная с первого модуля etpgrf (мкс).
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+                               capture_output=True, text=True, check=True)
+    total = 0
+    started = False
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Строки без отступа -- импорты верхнего уровня, их время включает время вложенных импортов
+        if name.startswith('  '):
+            continue
+        started = started or name.strip().split('.')[0] == 'etpgrf'
+        if started:
+            total += int(cumulative)
+    return set(completed.stdout.split()), total
+
+
+def test_import_does_not_load_rules_or_html():
+    """`import etpgrf` не импортирует модули правил, `regex` и BeautifulSoup."""
+    modules, _ = _run('import etpgrf')
+    assert 'etpgrf.typograph' not in modules
+    assert 'regex' not in modules
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_plain_typographer_does_not_load_heavy_modules():
+    """Типограф для простого текста не импортирует BeautifulSoup, asyncio, multiprocessing, sqlite3 и кэш."""
+    modules, _ = _run("from etpgrf import Typographer; Typographer(process_html=False).process('Текст')")
+    assert 'etpgrf.typograph' in modules
+    assert not modules.intersection(HEAVY_MODULES)
+    assert not modules.intersection(OPTIONAL_MODULES)
+
+
+def test_lazy_exports():
+    import etpgrf
+    from etpgrf.typograph import Typographer
+    assert etpgrf.Typographer is Typographer
+    assert 'Typographer' in dir(etpgrf)
+    with pytest.raises(AttributeError):
+        etpgrf.NoSuchProcessor
+
+
+@pytest.mark.skipif(not os.environ.get('ETPGRF_IMPORT_TIME_BUDGET'),
+                    reason="замер времени импорта включается переменной окружения ETPGRF_IMPORT_TIME_BUDGET=1")
+@pytest.mark.parametrize("code", list(IMPORT_TIME_BUDGET_US))
+def test_import_time_budget(code):
+    # Лучший из нескольких запусков: первый может включать компиляцию .pyc и холодный дисковый кэш
+    best = min(_run(code)[1] for _ in range(3))
+    assert best <= IMPORT_TIME_BUDGET_US[code]
+
+
+def test_precomputed_encode_map_is_up_to_date():
+    """Заранее построенная карта кодирования совпадает с картой, построенной по правилам из config."""
+    from etpgrf import config, encode_map
+    assert encode_map.ENCODE_MAP_VERSION == config.ENCODE_MAP_VERSION
+    assert encode_map.ENCODE_MAP == config._build_translation_maps()
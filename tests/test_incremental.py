@@ -0,0 +1,104 @@
+# tests/test_incremental.py
+# Тестирует инкрементальную обработку (Typographer.process_incremental).
+
+import pytest
+from etpgrf import Typographer
+from etpgrf.incremental import split_plain_text, split_html
+
+# Абзацы с правилами, которые "дотягиваются" до соседних абзацев (предлог в конце, тире и отрицательное число
+# в начале абзаца, единицы измерения)
+INCREMENTAL_PARAGRAPHS = [
+    'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."',
+    'Текст заканчивается предлогом в',
+    'доме, который построил Джек.',
+    '— Что-то среднее между коконом и пламенем, — прошептала девушка.',
+    'Температура упала до',
+    '-5 градусов, а потом...',
+    'Расстояние 100',
+    'км и еще "немного" (c) 2025',
+]
+
+
+def _render(paragraphs: list[str], process_html: bool) -> str:
+    if process_html:
+        return '\n'.join(f'<p>{paragraph}</p>' for paragraph in paragraphs)
+    return '\n\n'.join(paragraphs)
+
+
+# Правки: (индекс абзаца, новый абзац или None -- удалить абзац)
+EDITS = [
+    (0, 'Совсем "новый" первый абзац'),
+    (1, 'Текст теперь заканчивается предлогом на'),     # Предлог в конце абзаца "дотягивается" до следующего
+    (4, '— Диалог начинается с тире'),
+    (5, None),
+    (len(INCREMENTAL_PARAGRAPHS) - 1, 'Последний абзац (c) 2026'),
+]
+
+
+@pytest.mark.parametrize("process_html", [False, True])
+@pytest.mark.parametrize("index, new_paragraph", EDITS)
+def test_incremental_matches_full(process_html, index, new_paragraph):
+    """
+    Результат инкрементальной обработки совпадает с полной обработкой новой версии.
+    """
+    typo = Typographer(langs='ru', mode='mixed', process_html=process_html)
+    paragraphs = INCREMENTAL_PARAGRAPHS * 2
+    old_text = _render(paragraphs, process_html)
+    old_output = typo.process(old_text)
+    new_paragraphs = list(paragraphs)
+    if new_paragraph is None:
+        del new_paragraphs[index]
+    else:
+        new_paragraphs[index] = new_paragraph
+    new_text = _render(new_paragraphs, process_html)
+    assert typo.process_incremental(old_text, old_output, new_text) == typo.process(new_text)
+
+
+@pytest.mark.parametrize("process_html", [False, True])
+def test_incremental_reprocesses_only_changed_block(process_html, monkeypatch):
+    """
+    Неизмененные блоки не обрабатываются заново: типограф получает только измененный блок
+    (и соседей для проверки границ), а не весь документ.
+    """
+    typo = Typographer(langs='ru', process_html=process_html)
+    paragraphs = [f'Абзац номер {i} о "разном".' for i in range(30)]
+    old_text = _render(paragraphs, process_html)
+    old_output = typo.process(old_text)
+    paragraphs[15] = 'Измененный абзац.'
+    new_text = _render(paragraphs, process_html)
+    expected = typo.process(new_text)
+
+    processed = []
+    original_process = typo.process
+    monkeypatch.setattr(typo, 'process', lambda text: processed.append(text) or original_process(text))
+    assert typo.process_incremental(old_text, old_output, new_text) == expected
+    assert max(len(text) for text in processed) < len(new_text) // 4
+
+
+def test_incremental_trivial_cases():
+    typo = Typographer(langs='ru')
+    assert typo.process_incremental('в доме', 'в&nbsp;доме', 'в доме') == 'в&nbsp;доме'
+    assert typo.process_incremental('', '', 'в доме') == typo.process('в доме')
+    assert typo.process_incremental('в доме', 'в&nbsp;доме', '') == ''
+
+
+def test_incremental_falls_back_on_mismatched_output():
+    """
+    Если старый результат не сопоставляется со старым входом, делается полная обработка.
+    """
+    typo = Typographer(langs='ru')
+    new_text = 'Первый абзац в доме.\n\nВторой абзац.'
+    assert typo.process_incremental('Что-то\n\nсовсем другое', 'Не тот результат', new_text) == \
+        typo.process(new_text)
+
+
+def test_split_blocks_concatenate_back():
+    text = '  Первый\n\nВторой\n \n\nТретий\n'
+    blocks, signatures = split_plain_text(text)
+    assert ''.join(blocks) == text
+    assert signatures == ['\n\n', '\n \n\n', '']
+
+    html = '<h1>Заголовок</h1>\n<p>Абзац <b>жирный</b></p>\nтекст<hr>\n<ul><li>пункт</li></ul>'
+    blocks, signatures = split_html(html)
+    assert ''.join(blocks) == html
+    assert signatures == ['h1', 'p', '', 'hr', 'ul']
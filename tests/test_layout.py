@@ -1,7 +1,9 @@
 # tests/test _layout.py
 # Тестирует модуль LayoutProcessor. Проверяет обработку тире и специальных символов в тексте.
 
+import random
 import pytest
+import regex
 from etpgrf.layout import LayoutProcessor, CHAR_THIN_SP
 from etpgrf.config import CHAR_NBSP, CHAR_HELLIP, CHAR_THIN_SP, CHAR_UNIT_SEPARATOR
 
@@ -221,4 +223,69 @@ def test_layout_processor_with_options(lang, input_string, expected_output, opti
     """Проверяет работу LayoutProcessor с кастомными настройками."""
     processor = LayoutProcessor(langs=lang, **options)
     actual_output = processor.process(input_string)
-    assert actual_output == expected_output
\ No newline at end of file
+    assert actual_output == expected_output
+
+def test_layout_processor_many_compound_units():
+    """
+    Составные единицы склеиваются за один проход: в длинном тексте с множеством единиц каждая фраза обработана
+    так же, как по отдельности.
+    """
+    processor = LayoutProcessor(langs='ru')
+    phrase = "Площадь 150 тыс. кв. км., А.С. Пушкин и т. д."
+    expected = processor.process(phrase)
+    assert expected == (f"Площадь 150{CHAR_NBSP}тыс.{CHAR_THIN_SP}кв.{CHAR_THIN_SP}км., "
+                        f"А.{CHAR_THIN_SP}С.{CHAR_NBSP}Пушкин и{CHAR_NBSP}т.{CHAR_THIN_SP}д.")
+    assert processor.process('\n'.join([phrase] * 1000)) == '\n'.join([expected] * 1000)
+
+
+@pytest.mark.parametrize("lang, input_string, expected_output", LAYOUT_TEST_CASES)
+def test_layout_processor_with_chars(lang, input_string, expected_output):
+    """
+    С переданным набором символов текста (правила, которые не могут сработать, пропускаются) результат
+    тот же, а набор пополняется символами, появившимися в тексте.
+    """
+    processor = LayoutProcessor(langs=lang)
+    chars = set(input_string)
+    actual_output = processor.process(input_string, chars)
+    assert actual_output == expected_output
+    assert set(actual_output) <= chars
+
+
+def test_layout_processor_may_apply():
+    """Текст без символов-"триггеров" правил компоновки обработка не меняет, и это видно без сканирования."""
+    processor = LayoutProcessor(langs='ru')
+    assert not processor.may_apply(set('OK'), 2)
+    assert processor.may_apply(set(f'а {CHAR_HELLIP} б'), 5)
+    # Сокращения ищутся без учета регистра, в т.ч. через "экзотические" формы букв (ᲄ -- это вариант `т`)
+    text = "и ᲄ. д."
+    assert processor.may_apply(set(text), len(text))
+    assert processor.process(text, set(text)) == processor.process(text)
+
+
+# Правила инициалов отдельными проходами, как до их объединения (эталон для сравнения)
+SEQUENTIAL_INITIALS_PASSES = [
+    (regex.compile(r'(\p{Lu}\.)(?=\p{Lu}\.)'), f'\\1{CHAR_THIN_SP}'),
+    (regex.compile(r'(\p{Lu}\.)(?=\p{Lu}\p{L}{1,})'), f'\\1{CHAR_THIN_SP}'),
+    (regex.compile(r'(\p{Lu}\.) +(?=\p{Lu}\.)'), f'\\1{CHAR_NBSP}'),
+    (regex.compile(r'(\p{Lu}\.) +(?=\p{Lu}\p{L}{1,})'), f'\\1{CHAR_NBSP}'),
+    (regex.compile(r'(\p{Lu}\p{L}{2,}) +(?=\p{Lu}\.)'), f'\\1{CHAR_NBSP}'),
+]
+
+
+@pytest.mark.parametrize("lang", ['ru', 'en'])
+def test_layout_processor_initials_match_sequential_passes(lang):
+    """
+    Объединенные правила инициалов дают посимвольно тот же результат, что и пять отдельных проходов по очереди
+    (на случайных строках из инициалов, фамилий, пробелов, точек, тире и сокращений).
+    """
+    rnd = random.Random(7)
+    fragments = ['А', 'Б', 'Ив', 'ов', 'a', 'B', 'I', '.', '. ', ' ', '  ', CHAR_THIN_SP, CHAR_NBSP, '\n',
+                 '—', '-', CHAR_HELLIP, '5', 'т', 'д', 'г', 'и']
+    processor = LayoutProcessor(langs=lang, process_units=False)
+    without_initials = LayoutProcessor(langs=lang, process_units=False, process_initials_and_acronyms=False)
+    for _ in range(3000):
+        text = ''.join(rnd.choice(fragments) for _ in range(rnd.randint(1, 30)))
+        expected = without_initials.process(text)
+        for pattern, replacement in SEQUENTIAL_INITIALS_PASSES:
+            expected = pattern.sub(replacement, expected)
+        assert processor.process(text) == expected, text
@@ -0,0 +1,98 @@
+# tests/test_slowlog.py
+# Тестирует запись медленных документов (SlowDocumentRecorder), их повторную обработку и Typographer.from_config.
+
+import os
+import json
+import pickle
+import pytest
+from etpgrf import Typographer, Hyphenator, LayoutProcessor, ResultCache
+from etpgrf.slowlog import SlowDocumentRecorder, list_records, load_record, replay, main
+
+TEXTS = ['Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."',
+         '<p>Электрофоретический "эффект" -- 5 кг...</p>',
+         'Mr. Smith said: "It\'s 100 km (c) 2024".']
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {'langs': 'ru+en', 'mode': 'unicode', 'process_html': True, 'hanging_punctuation': 'left', 'sanitizer': 'etp'},
+    {'langs': 'en', 'process_html': True, 'html_backend': 'stream', 'hanging_punctuation': ['p', 'blockquote']},
+    {'hyphenation': Hyphenator(langs='ru', max_unhyphenated_len=20, min_tail_len=3),
+     'layout': LayoutProcessor(langs='ru', process_initials_and_acronyms=False, process_units=['кг', 'км'])},
+    {'quotes': False, 'unbreakables': False, 'symbols': False, 'layout': False, 'hyphenation': False},
+])
+def test_from_config_roundtrip(kwargs):
+    typo = Typographer(**kwargs)
+    config = json.loads(json.dumps(typo.get_config()))
+    copy = Typographer.from_config(config)
+    assert copy.get_config() == typo.get_config()
+    for text in TEXTS:
+        assert copy.process(text) == typo.process(text)
+
+
+def test_recorder_records_slow_documents(tmp_path):
+    typo = Typographer(langs='ru', process_html=True, slow_log=SlowDocumentRecorder(tmp_path, threshold=0))
+    result = typo.process(TEXTS[1])
+    paths = list_records(tmp_path)
+    assert len(paths) == 1
+    record = load_record(paths[0])
+    assert record['text'] == TEXTS[1]
+    assert record['config'] == typo.get_config()
+    assert record['chars_in'] == len(TEXTS[1])
+    assert record['chars_out'] == len(result)
+    assert record['seconds'] >= sum(record['stages'].values())
+    assert {'parse', 'quotes', 'serialize'} <= set(record['stages'])
+    # Тот же документ -- та же запись
+    typo.process(TEXTS[1])
+    assert list_records(tmp_path) == paths
+
+
+def test_recorder_threshold_and_limits(tmp_path):
+    Typographer(slow_log=SlowDocumentRecorder(tmp_path, threshold=60)).process(TEXTS[0])
+    assert list_records(tmp_path) == []
+    Typographer(slow_log=SlowDocumentRecorder(tmp_path, threshold=0, max_document_chars=10)).process(TEXTS[0])
+    assert list_records(tmp_path) == []
+    # Результат из кэша не записывается
+    typo = Typographer(cache=ResultCache(), slow_log=SlowDocumentRecorder(tmp_path, threshold=0))
+    typo.process(TEXTS[0])
+    for path in list_records(tmp_path):
+        os.remove(path)
+    typo.process(TEXTS[0])
+    assert list_records(tmp_path) == []
+
+
+def test_recorder_ring(tmp_path):
+    typo = Typographer(langs='ru+en', slow_log=SlowDocumentRecorder(tmp_path, threshold=0, max_documents=2))
+    for text in TEXTS:
+        typo.process(text)
+    assert [load_record(path)['text'] for path in list_records(tmp_path)] == TEXTS[1:]
+
+
+def test_recorder_write_errors_do_not_break_processing(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    typo = Typographer(slow_log=SlowDocumentRecorder(blocker / 'slow', threshold=0))
+    assert typo.process(TEXTS[0]) == Typographer().process(TEXTS[0])
+
+
+def test_recorder_pickle(tmp_path):
+    typo = Typographer(slow_log=str(tmp_path))
+    copy = pickle.loads(pickle.dumps(typo))
+    assert copy.process(TEXTS[0]) == typo.process(TEXTS[0])
+
+
+def test_replay(tmp_path, capsys):
+    recorder = SlowDocumentRecorder(tmp_path / 'slow', threshold=0)
+    Typographer(langs='ru', slow_log=recorder).process(TEXTS[0])
+    Typographer(langs='en', process_html=True, html_backend='stream', slow_log=recorder).process(TEXTS[1])
+    results = replay(tmp_path / 'slow', repeat=2)
+    assert len(results) == 2
+    for result in results.values():
+        assert result['output_changed'] is False
+        assert result['seconds'] > 0
+        assert 'quotes' in result['stages']
+
+    output = tmp_path / 'replay.json'
+    assert main([str(tmp_path / 'slow'), '--repeat', '1', '-o', str(output)]) == 0
+    assert set(json.loads(output.read_text(encoding='utf-8'))) == set(results)
+    assert 'Документов: 2' in capsys.readouterr().out
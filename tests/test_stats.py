@@ -0,0 +1,128 @@
+# tests/test_stats.py
+# Тестирует статистику этапов обработки (TypographerStats) и ее использование в Typographer.
+
+import io
+import pickle
+import pytest
+from etpgrf import Typographer, TypographerStats, ResultCache
+from etpgrf.stats import STAGES
+
+TEXT = 'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д." Электрофоретический эффект.'
+HTML = f'<p>{TEXT}</p><p><b>"Жирный"</b> текст...</p>'
+
+
+def test_stats_disabled_by_default():
+    typo = Typographer(langs='ru')
+    typo.process(TEXT)
+    assert typo.stats() is None
+    typo.reset_stats()
+
+
+@pytest.mark.parametrize("kwargs, text, expected_stages", [
+    ({'process_html': False}, TEXT,
+     {'parse', 'quotes', 'unbreakables', 'symbols', 'layout', 'hyphenation', 'encode'}),
+    ({'process_html': True, 'hanging_punctuation': 'both', 'sanitizer': 'etp'}, HTML,
+     {'parse', 'sanitize', 'quotes', 'unbreakables', 'symbols', 'layout', 'hyphenation', 'encode', 'hanging',
+      'serialize'}),
+    ({'process_html': True, 'html_backend': 'stream', 'hanging_punctuation': 'both'}, HTML,
+     {'parse', 'quotes', 'unbreakables', 'symbols', 'layout', 'hyphenation', 'encode', 'hanging', 'serialize'}),
+    ({'process_html': False, 'quotes': False, 'hyphenation': False}, TEXT,
+     {'parse', 'unbreakables', 'symbols', 'layout', 'encode'}),
+])
+def test_stats_stages(kwargs, text, expected_stages):
+    """
+    Статистика содержит время и число вызовов каждого включенного этапа и объем входа и выхода.
+    """
+    typo = Typographer(langs='ru', stats=True, **kwargs)
+    result = typo.process(text)
+    assert result == Typographer(langs='ru', **kwargs).process(text)
+    typo.process(text)
+    snapshot = typo.stats()
+    assert snapshot['documents'] == 2
+    assert snapshot['cache_hits'] == 0
+    assert snapshot['chars_in'] == 2 * len(text)
+    assert snapshot['chars_out'] == 2 * len(result)
+    assert set(snapshot['stages']) == expected_stages
+    assert list(snapshot['stages']) == [stage for stage in STAGES if stage in expected_stages]
+    for stage in snapshot['stages'].values():
+        assert stage['calls'] == 2
+        assert stage['seconds'] >= 0
+    assert snapshot['seconds'] >= sum(stage['seconds'] for stage in snapshot['stages'].values())
+
+
+def test_stats_cache_hits():
+    typo = Typographer(langs='ru', cache=ResultCache(), stats=True)
+    typo.process(TEXT)
+    typo.process(TEXT)
+    snapshot = typo.stats()
+    assert snapshot['documents'] == 2
+    assert snapshot['cache_hits'] == 1
+    assert snapshot['stages']['cache']['calls'] == 2
+    assert snapshot['stages']['quotes']['calls'] == 1
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'process_html': False},
+    {'process_html': True, 'html_backend': 'stream'},
+])
+def test_stats_process_stream(kwargs):
+    """
+    Потоковая обработка записывается в статистику как один документ.
+    """
+    text = '\n\n'.join([TEXT] * 20)
+    if kwargs['process_html']:
+        text = f'<p>{text}</p>'
+    typo = Typographer(langs='ru', stats=True, **kwargs)
+    output = io.StringIO()
+    written = typo.process_stream(io.StringIO(text), output, chunk_size=100)
+    snapshot = typo.stats()
+    assert snapshot['documents'] == 1
+    assert snapshot['chars_in'] == len(text)
+    assert snapshot['chars_out'] == written == len(output.getvalue())
+    assert snapshot['stages']['quotes']['calls'] == 1
+
+
+def test_stats_callback():
+    """
+    Функция обратного вызова получает замер каждого документа, ее исключения не прерывают обработку.
+    """
+    records = []
+    typo = Typographer(langs='ru', stats_callback=records.append)
+    result = typo.process(TEXT)
+    assert len(records) == 1
+    assert records[0]['chars_in'] == len(TEXT)
+    assert records[0]['chars_out'] == len(result)
+    assert records[0]['cached'] is False
+    assert 'quotes' in records[0]['stages']
+    assert typo.stats()['documents'] == 1
+
+    def broken(record):
+        raise RuntimeError("metrics backend is down")
+
+    typo = Typographer(langs='ru', stats_callback=broken)
+    assert typo.process(TEXT) == result
+    assert typo.stats()['documents'] == 1
+
+
+def test_stats_shared_and_reset():
+    stats = TypographerStats()
+    Typographer(langs='ru', stats=stats).process(TEXT)
+    Typographer(langs='en', stats=stats).process(TEXT)
+    assert stats.snapshot()['documents'] == 2
+    stats.reset()
+    assert stats.snapshot() == {'documents': 0, 'cache_hits': 0, 'degraded': 0, 'seconds': 0.0, 'chars_in': 0,
+                                'chars_out': 0, 'stages': {}}
+    with pytest.raises(ValueError):
+        Typographer(stats=stats, stats_callback=print)
+
+
+def test_stats_pickle():
+    """
+    Статистика не передается через pickle: в другом процессе она начинается с нуля.
+    """
+    typo = Typographer(langs='ru', stats_callback=lambda record: None)
+    typo.process(TEXT)
+    copy = pickle.loads(pickle.dumps(typo))
+    assert copy.stats()['documents'] == 0
+    assert copy.process(TEXT) == typo.process(TEXT)
+    assert copy.stats()['documents'] == 1
@@ -0,0 +1,102 @@
+# tests/test_streaming.py
+# Тестирует потоковую обработку простого текста (Typographer.process_stream).
+
+import io
+import pytest
+from etpgrf import Typographer
+from etpgrf.streaming import iter_process_stream, is_safe_cut
+
+# Абзацы подобраны так, чтобы на стыках срабатывали правила, "дотягивающиеся" через разрыв:
+# предлог в конце абзаца, тире и отрицательное число в начале абзаца, многоточие, единицы измерения.
+STREAM_PARAGRAPHS = [
+    'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д."',
+    'Текст заканчивается предлогом в',
+    'доме, который построил Джек.',
+    '— Что-то среднее между коконом и пламенем, — прошептала девушка.',
+    'Температура упала до',
+    '-5 градусов, а потом...',
+    'Электрофоретическое исследование характеризуется квинтэссенциальной значимостью',
+    'Расстояние 100',
+    'км и еще "немного" (c) 2025',
+]
+STREAM_TEXT = '\n\n'.join(STREAM_PARAGRAPHS * 4) + '\n'
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 10_000])
+def test_stream_matches_one_shot(chunk_size):
+    """
+    Результат потоковой обработки совпадает с обработкой всего текста за один вызов.
+    """
+    typo = Typographer(langs='ru', mode='mixed')
+    expected = typo.process(STREAM_TEXT)
+    writer = io.StringIO()
+    written = typo.process_stream(io.StringIO(STREAM_TEXT), writer, chunk_size=chunk_size)
+    assert writer.getvalue() == expected
+    assert written == len(expected)
+
+
+def test_stream_accepts_iterator_of_chunks():
+    """
+    Источником может быть итератор произвольно нарезанных фрагментов.
+    """
+    typo = Typographer(langs='ru+en', mode='unicode')
+    pieces = (STREAM_TEXT[i:i + 7] for i in range(0, len(STREAM_TEXT), 7))
+    result = ''.join(iter_process_stream(typo._process_plain_text, pieces, chunk_size=50))
+    assert result == typo.process(STREAM_TEXT)
+
+
+def test_stream_cuts_into_several_chunks():
+    """
+    Текст действительно режется на несколько фрагментов (память не растет до размера всего текста).
+    """
+    typo = Typographer(langs='ru')
+    chunks = list(iter_process_stream(typo._process_plain_text, STREAM_TEXT, chunk_size=200))
+    assert len(chunks) > 1
+
+
+def test_unsafe_cuts_are_detected():
+    """
+    Разрыв, через который "дотягивается" правило (частица, тире), резать нельзя.
+    """
+    typo = Typographer(langs='ru')
+    # Частица "бы" приклеивается к слову предыдущего абзаца
+    assert not is_safe_cut(typo._process_plain_text, 'Сказал\n\nбы', 6, 8)
+    # Тире в начале абзаца "съедает" разрыв
+    assert not is_safe_cut(typo._process_plain_text, 'Слово\n\n— текст', 5, 7)
+    # Обычный абзацный разрыв резать можно
+    assert is_safe_cut(typo._process_plain_text, 'Текст дом.\n\nДругой', 10, 12)
+
+
+def test_stream_rejects_html_mode():
+    typo = Typographer(langs='ru', process_html=True)
+    with pytest.raises(ValueError):
+        typo.process_stream('<p>текст</p>', io.StringIO())
+
+
+def test_stream_buffer_is_bounded_without_paragraph_breaks():
+    """
+    В тексте без абзацных разрывов буфер не растет до размера всего текста: он режется по безопасному пробелу,
+    а если текст режется вовсе без пробелов -- по длине.
+    """
+    typo = Typographer(langs='ru')
+    text = ' '.join(STREAM_PARAGRAPHS * 60)
+    pieces = (text[i:i + 50] for i in range(0, len(text), 50))
+    chunks = list(iter_process_stream(typo._process_plain_text, pieces, chunk_size=100, max_buffer=1000))
+    assert len(chunks) > 10
+    assert ''.join(chunks) == typo.process(text)
+    chunks = list(iter_process_stream(typo._process_plain_text, 'x' * 5000, chunk_size=100, max_buffer=1000))
+    assert ''.join(chunks) == 'x' * 5000
+    assert max(map(len, chunks)) <= 1000
+
+
+def test_fallback_cut_prefers_safe_spaces_outside_quotes():
+    from etpgrf.streaming import find_fallback_cut
+    typo = Typographer(langs='ru')
+    text = 'слово ' * 100
+    cut = find_fallback_cut(typo._process_plain_text, text)
+    assert text[cut - 1] == ' ' and is_safe_cut(typo._process_plain_text, text, cut - 1, cut)
+    # Обработка, при которой безопасных разрезов нет: режем по последнему пробелу вне кавычек
+    text = 'а б "в г д ' + 'е' * 200
+    assert find_fallback_cut(lambda chunk: chunk[:1], text) == len('а б ')
+    text = 'а «б в» г ' + 'е' * 200
+    assert find_fallback_cut(lambda chunk: chunk[:1], text) == len('а «б в» г ')
@@ -76,4 +76,21 @@ SYMBOLS_TEST_CASES = [
 def test_symbols_processor(input_string, expected_output):
     processor = SymbolsProcessor()
     actual_output = processor.process(input_string)
-    assert actual_output == expected_output
\ No newline at end of file
+    assert actual_output == expected_output
+
+@pytest.mark.parametrize("input_string, expected_output", SYMBOLS_TEST_CASES)
+def test_symbols_processor_with_chars(input_string, expected_output):
+    """С переданным набором символов результат тот же, а набор пополняется новыми символами."""
+    processor = SymbolsProcessor()
+    chars = set(input_string)
+    actual_output = processor.process(input_string, chars)
+    assert actual_output == expected_output
+    assert set(actual_output) <= chars
+
+
+def test_symbols_processor_skips_text_without_triggers():
+    """Текст без символов псевдографики возвращается тем же объектом."""
+    processor = SymbolsProcessor()
+    text = "Пункт 1 OK"
+    assert not processor.may_apply(set(text), len(text))
+    assert processor.process(text) is text
@@ -0,0 +1,56 @@
+# tests/test_textmap.py
+# Тестирует карту правок текста: запись замен и раскладку результата по исходным фрагментам.
+
+import regex
+import pytest
+from etpgrf.config import CHAR_NBSP
+from etpgrf.textmap import EditLog, tracked_sub, tracked_replace, project_edits
+
+
+@pytest.mark.parametrize("pattern, repl, text", [
+    (r'\s+', ' ', 'a  b\t\tc   d'),           # Укорачивание
+    (r'(\d)', r'<\1>', 'x1y22z'),               # Удлинение
+    (r'--', '–', 'a -- b--c'),             # Замена другой длины
+    (r'b', 'b', 'abcabc'),                       # Замена без изменений
+    (r'q', 'Q', 'abc'),                          # Нет совпадений
+])
+def test_tracked_sub_matches_sub(pattern, repl, text):
+    """Результат `tracked_sub` совпадает с `sub`, а правки восстанавливают текст по фрагментам."""
+    compiled = regex.compile(pattern)
+    edits = EditLog()
+    result = tracked_sub(compiled, repl, text, edits)
+    assert result == compiled.sub(repl, text)
+    parts = project_edits(text, result, edits, [0, len(text)])
+    assert parts == [result]
+
+
+def test_edit_log_composes_passes():
+    """Правки нескольких проходов, меняющих длину текста, раскладываются по исходным фрагментам."""
+    original = 'Дом в лесу -- это "дача"'
+    bounds = [0, 4, 11, 18, len(original)]     # 'Дом ', 'в лесу ', '-- это ', '"дача"'
+    edits = EditLog()
+    text = tracked_replace(original, '--', '—', edits)
+    text = tracked_sub(regex.compile(r'"([^"]*)"'), '«\\1»', text, edits)
+    text = tracked_sub(regex.compile(r'(?<=\bв) '), CHAR_NBSP, text, edits)
+    text = tracked_sub(regex.compile(r' (?=—)'), CHAR_NBSP, text, edits)
+    assert text == f'Дом в{CHAR_NBSP}лесу{CHAR_NBSP}— это «дача»'
+    assert project_edits(original, text, edits, bounds) == ['Дом ', f'в{CHAR_NBSP}лесу{CHAR_NBSP}', '— это ', '«дача»']
+    assert ''.join(project_edits(original, text, edits, bounds)) == text
+
+
+def test_edit_crossing_fragments_goes_to_first():
+    """Замена, которая захватывает несколько фрагментов, достается первому из них."""
+    original = 'ab-cd'
+    bounds = [0, 2, 5]
+    edits = EditLog()
+    text = tracked_replace(original, 'b-c', 'X', edits)
+    assert project_edits(original, text, edits, bounds) == ['aX', 'd']
+
+
+def test_barrier_blocks_matches():
+    """Совпадения через символ-границу не заменяются, а поиск продолжается сразу за ней."""
+    pattern = regex.compile(r'(?<!\d)\s+-(\d+)')
+    edits = EditLog(barrier='|')
+    text = tracked_sub(pattern, '_-\\1', 'x -1 |-2 | -3', edits)
+    assert text == 'x_-1 |-2 |_-3'
+    assert tracked_replace(text, ' |', '', edits) == text
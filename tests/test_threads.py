@@ -0,0 +1,81 @@
+# tests/test_threads.py
+# Стресс-тест: один Typographer одновременно используется из многих потоков. Обработка не меняет состояния
+# типографа и модулей правил, поэтому результаты должны совпадать с последовательной обработкой.
+
+import random
+import sys
+import threading
+import pytest
+from etpgrf import Typographer, ResultCache
+
+THREADS = 8
+DOCUMENTS = [
+    'Он сказал: "В 1941-1945 гг. -- было 100 тыс. руб. и т. д." (c) А. С. Пушкин',
+    '<p>Электрофоретический "эффект" -- 5 кг... <b>"Жирный"</b> текст</p><p>Mr. Smith said: "It\'s 100 km".</p>',
+    'Высокопревосходительство и достопримечательность, interinternationalization и floccinaucinihilipilification.',
+    '<ul><li>"Первый" пункт -- 10 %</li><li>Второй пункт: т. е. 1/2 и 3/4</li></ul>',
+    '',
+    '<pre>"не трогать" -- код</pre><p>"Трогать" -- текст...</p>',
+] * 5
+
+
+@pytest.fixture
+def fast_switching():
+    # Частое переключение потоков увеличивает число чередований при обработке
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_concurrently(process, documents: list[str]) -> list[dict[int, str]]:
+    """Обрабатывает документы в THREADS потоках одновременно, в каждом потоке в своем порядке."""
+    barrier = threading.Barrier(THREADS)
+    results = [{} for _ in range(THREADS)]
+    errors = []
+
+    def worker(number: int) -> None:
+        order = list(range(len(documents)))
+        random.Random(number).shuffle(order)
+        barrier.wait()
+        try:
+            for _ in range(3):
+                for index in order:
+                    results[number][index] = process(documents[index])
+        except Exception as e:      # Ошибка в потоке должна провалить тест, а не потеряться
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'langs': 'ru+en', 'process_html': False},
+    {'langs': 'ru+en', 'process_html': True, 'hanging_punctuation': 'both'},
+    {'langs': 'ru', 'process_html': True, 'html_backend': 'stream', 'hanging_punctuation': ['p', 'li']},
+    {'langs': 'en', 'mode': 'mnemonic', 'process_html': True, 'sanitizer': 'etp'},
+])
+def test_shared_typographer(kwargs, fast_switching):
+    expected = [Typographer(**kwargs).process(doc) for doc in DOCUMENTS]
+    typo = Typographer(stats=True, **kwargs)
+    for results in run_concurrently(typo.process, DOCUMENTS):
+        assert [results[index] for index in range(len(DOCUMENTS))] == expected
+    snapshot = typo.stats()
+    assert snapshot['documents'] == THREADS * 3 * len([doc for doc in DOCUMENTS if doc])
+    assert snapshot['chars_out'] == THREADS * 3 * sum(len(result) for result in expected)
+
+
+def test_shared_typographer_with_cache(fast_switching):
+    expected = [Typographer(process_html=True).process(doc) for doc in DOCUMENTS]
+    cache = ResultCache(max_entries=3)     # Маленький кэш: записи постоянно вытесняются
+    typo = Typographer(process_html=True, cache=cache)
+    for results in run_concurrently(typo.process, DOCUMENTS):
+        assert [results[index] for index in range(len(DOCUMENTS))] == expected
+    stats = cache.stats()
+    assert stats['entries'] <= 3
+    assert stats['hits'] + stats['misses'] == THREADS * 3 * len([doc for doc in DOCUMENTS if doc])
@@ -49,6 +49,12 @@ TYPOGRAPHER_HTML_TEST_CASES = [
               '<p>Текст «до».</p><samp>Sample "text"</samp>'),
     ('mixed', '<p>Текст "до".</p><math><mi>x</mi><mo>=</mo><mn>5</mn></math>',
               '<p>Текст «до».</p><math><mi>x</mi><mo>=</mo><mn>5</mn></math>'),
+    # Защищенный тег на любой глубине: его содержимое не участвует и в контекстной обработке
+    ('mixed', '<pre><b>"не трогать" -- 1-2</b></pre><p>"a"</p>',
+              '<pre><b>"не трогать" -- 1-2</b></pre><p>«a»</p>'),
+    # Комментарии не обрабатываются и не превращаются в текст
+    ('mixed', '<p>Текст <!-- "комментарий" --> и "кавычки".</p>',
+              '<p>Текст <!-- "комментарий" --> и&nbsp;«кавычки».</p>'),
 
     # --- Проверка тегов с атрибутами ---
     ('mixed', '<a href="/a-b" title="Текст в кавычках \'внутри\' атрибута">Текст "снаружи"</a>',
@@ -103,6 +109,23 @@ TYPOGRAPHER_HTML_TEST_CASES = [
                 f'<p>Текст с{CHAR_NBSP}картинкой <img alt="image" src="image.jpg"/> и{CHAR_NBSP}текстом.</p>'),
     ('unicode', '<p>Текст с <code>&lt;br&gt;</code><br>А это новая строка.</p>',
                 f'<p>Текст с{CHAR_NBSP}<code>&lt;br&gt;</code><br/>А{CHAR_NBSP}это новая строка.</p>'),
+    # --- Амперсанды из исходника не теряются: ни в тексте, ни в защищенных тегах, ни в атрибутах ---
+    ('mixed', '<p>R&amp;D <a href="/?a=1&amp;b=2">ссылка</a></p>',
+              '<p>R&amp;D <a href="/?a=1&amp;b=2">ссылка</a></p>'),
+    ('unicode', '<p>R&amp;D <a href="/?a=1&amp;b=2">ссылка</a></p>',
+                '<p>R&amp;D <a href="/?a=1&amp;b=2">ссылка</a></p>'),
+    ('mixed', '<p>Код: <code>a &amp;&amp; b</code></p>', '<p>Код: <code>a &amp;&amp; b</code></p>'),
+    # Экранированная в исходнике мнемоника остается текстом, а не превращается в символ
+    ('mixed', '<p>Мнемоника &amp;nbsp; в тексте</p>', '<p>Мнемоника &amp;nbsp; в&nbsp;тексте</p>'),
+    ('unicode', '<p>Тег &lt;b&gt; в тексте</p>', f'<p>Тег &lt;b&gt; в{CHAR_NBSP}тексте</p>'),
+    # --- Контекст через строчные теги: правила видят текст блока целиком, разметка не сдвигается ---
+    ('unicode', '<p>Пробег 10 <b>км</b> за день.</p>', f'<p>Пробег 10{CHAR_NBSP}<b>км</b> за{CHAR_NBSP}день.</p>'),
+    ('unicode', '<p>Он сказал: "<i>да</i>"</p>', f'<p>Он{CHAR_NBSP}сказал: «<i>да</i>»</p>'),
+    ('unicode', '<p>Это <b>т. д.</b> и т. п.</p>',
+                f'<p>Это{CHAR_NBSP}<b>т.{CHAR_THIN_SP}д.</b> и{CHAR_NBSP}т.{CHAR_THIN_SP}п.</p>'),
+    # --- Правила не работают через границы блоков ---
+    ('unicode', '<p>Конец --</p><p>- начало</p>', f'<p>Конец {CHAR_NDASH}</p><p>- начало</p>'),
+    ('unicode', '<p>"Один</p><p>два"</p>', '<p>«Один</p><p>два»</p>'),
 ]
 
 
@@ -149,3 +172,23 @@ def test_typographer_sanitizer_all_html_integration():
     typo = Typographer(langs='ru', process_html=True, sanitizer=SANITIZE_ALL_HTML, mode='mixed')
     actual_text = typo.process(input_html)
     assert actual_text == expected_text
+
+
+def test_typographer_deeply_nested_html():
+    """Глубоко вложенная разметка обрабатывается без RecursionError (обход дерева итеративный)."""
+    depth = 3000
+    typo = Typographer(langs='ru', mode='unicode', process_html=True, hyphenation=False)
+    html = '<div>' * depth + 'Текст "в кавычках"' + '</div>' * depth
+    result = typo.process(html)
+    assert result == '<div>' * depth + f'Текст «в{CHAR_NBSP}кавычках»' + '</div>' * depth
+
+
+@pytest.mark.parametrize('extract_accepts_index', [True, False])
+def test_typographer_wide_parent_rebuild(monkeypatch, extract_accepts_index):
+    """Пересборка "широкого" родителя дает один результат и с позиционным extract, и с публичным clear()."""
+    from etpgrf import comutil
+    monkeypatch.setattr(comutil, '_extract_accepts_index', lambda: extract_accepts_index)
+    typo = Typographer(langs='ru', mode='unicode', process_html=True, hyphenation=False)
+    html = '<p>' + '<br>Текст в доме' * 50 + '</p>'
+    result = typo.process(html)
+    assert result == '<p>' + f'<br/>Текст в{CHAR_NBSP}доме' * 50 + '</p>'